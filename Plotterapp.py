@@ -1,16 +1,21 @@
 import tkinter as tk
 from tkinter import ttk
 import math
-from plotter import FunctionPlotter
-from scroll_frame import ScrollFrame
+import tkinter.messagebox
+from plot_tk_v2 import FunctionPlotter, PlotterRegistry
+from scrollframe import ScrollFrame
 
 class PlotterApplication:
     def __init__(self, root):
         self.root = root
         self.root.title("Function Plotter Application")
         self.selected_plotter = None
-        # Initialize config_widgets attribute
-        self.config_widgets = []
+        
+        # Plotters by id; the config panel follows selection changes in batches
+        self.registry = PlotterRegistry(root)
+        self.registry.subscribe("selected", lambda plotters: self.update_config_panel())
+        # Plotter id -> (container, select button)
+        self.containers = {}
         
         # Create the main panedwindow to divide left and right sections
         self.main_paned = ttk.PanedWindow(root, orient=tk.HORIZONTAL)
@@ -25,7 +30,7 @@ class PlotterApplication:
         self.main_paned.add(self.right_frame, weight=1)
         
         # Set up the right panel with toolbar and scroll frame for configuration first
-        # This ensures config_widgets is properly initialized before add_new_plotter calls update_config_panel
+        # This ensures the config form exists before add_new_plotter calls update_config_panel
         self.setup_right_panel()
         
         # Set up the left panel with toolbar and scroll frame for plotters
@@ -47,9 +52,6 @@ class PlotterApplication:
         self.plotters_scroll_frame = ScrollFrame(self.left_frame)
         self.plotters_scroll_frame.pack(fill=tk.BOTH, expand=True)
         
-        # List to keep track of all plotters
-        self.plotters = []
-        
         # Add initial plotter
         self.add_new_plotter()
         
@@ -73,10 +75,36 @@ class PlotterApplication:
         self.no_selection_label = ttk.Label(self.config_scroll_frame.viewPort, text="No plotter selected")
         self.no_selection_label.pack(pady=20)
         
-        # Initialize configuration widgets list
-        self.config_widgets = []
-        # Initialize current_config dictionary
-        self.current_config = {}
+        # The configuration form is built once and rebound to whichever plotter is selected
+        self.create_config_form()
+    
+    def create_config_form(self):
+        self.config_form = ttk.Frame(self.config_scroll_frame.viewPort)
+        
+        self.title_var = tk.StringVar()
+        self.x_min_var = tk.StringVar()
+        self.x_max_var = tk.StringVar()
+        self.y_min_var = tk.StringVar()
+        self.y_max_var = tk.StringVar()
+        self.grid_var = tk.StringVar()
+        
+        ttk.Label(self.config_form, text="Plot Title:").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        ttk.Entry(self.config_form, textvariable=self.title_var).pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        ttk.Label(self.config_form, text="X Range (min, max):").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        x_range_frame = ttk.Frame(self.config_form)
+        x_range_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Entry(x_range_frame, textvariable=self.x_min_var, width=10).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(x_range_frame, textvariable=self.x_max_var, width=10).pack(side=tk.LEFT)
+        
+        ttk.Label(self.config_form, text="Y Range (min, max):").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        y_range_frame = ttk.Frame(self.config_form)
+        y_range_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Entry(y_range_frame, textvariable=self.y_min_var, width=10).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(y_range_frame, textvariable=self.y_max_var, width=10).pack(side=tk.LEFT)
+        
+        ttk.Label(self.config_form, text="Grid Spacing:").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        ttk.Entry(self.config_form, textvariable=self.grid_var, width=10).pack(anchor=tk.W, padx=10, pady=(0, 10))
     
     def add_new_plotter(self):
         # Create a frame to hold the plotter and its selection button
@@ -84,153 +112,101 @@ class PlotterApplication:
         plotter_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Add a selection button
-        select_btn = ttk.Button(plotter_container, text="Select", 
-                               command=lambda p=plotter_container: self.select_plotter(p))
+        select_btn = ttk.Button(plotter_container, text="Select")
         select_btn.pack(fill=tk.X, pady=(0, 5))
         
         # Create the function plotter
         plotter = FunctionPlotter(plotter_container, height=300, x_range=(-10, 10), y_range=(-10, 10), 
-                                 title=f"Function Plot {len(self.plotters) + 1}")
+                                 title=f"Function Plot {len(self.registry) + 1}")
         plotter.pack(fill=tk.BOTH, expand=True)
+        select_btn.configure(command=lambda p=plotter: self.select_plotter(p))
         
         # Add a default function
-        if len(self.plotters) % 2 == 0:
+        if len(self.registry) % 2 == 0:
             plotter.add_function(lambda x: math.sin(x), "sin(x)", "blue")
         else:
             plotter.add_function(lambda x: math.cos(x), "cos(x)", "red")
         
-        # Store the plotter along with its container
-        self.plotters.append((plotter_container, plotter, select_btn))
+        # Register the plotter and remember its container
+        self.registry.add(plotter)
+        self.containers[plotter.id] = (plotter_container, select_btn)
         
         # Select the newly added plotter
-        self.select_plotter(plotter_container)
+        self.select_plotter(plotter)
     
-    def select_plotter(self, plotter_container):
-        # Update the selected plotter
-        for container, plotter, button in self.plotters:
-            if container == plotter_container:
-                self.selected_plotter = plotter
-                button.configure(text="⭐ Selected")
-            else:
-                button.configure(text="Select")
-        
-        # Update the configuration panel
-        self.update_config_panel()
+    def select_plotter(self, plotter):
+        # Only the buttons of the old and new selection change
+        replaced = self.registry.select(plotter)
+        if replaced is not None and replaced is not plotter:
+            self.containers[replaced.id][1].configure(text="Select")
+        if plotter is not None:
+            self.containers[plotter.id][1].configure(text="⭐ Selected")
+        self.selected_plotter = plotter
     
     def remove_selected_plotter(self):
-        if not self.selected_plotter or not self.plotters:
+        if not self.selected_plotter:
             return
         
-        # Find and remove the selected plotter
-        for i, (container, plotter, _) in enumerate(self.plotters):
-            if plotter == self.selected_plotter:
-                # Destroy the container which includes the plotter
-                container.destroy()
-                # Remove from our list
-                self.plotters.pop(i)
-                break
-        
-        # Update selected plotter
-        self.selected_plotter = None if not self.plotters else self.plotters[0][1]
-        
-        # Update selection UI
-        if self.plotters:
-            self.select_plotter(self.plotters[0][0])
-        else:
-            self.update_config_panel()
+        # Destroy the container which includes the plotter
+        plotter = self.selected_plotter
+        container, _ = self.containers.pop(plotter.id)
+        self.registry.remove(plotter)
+        container.destroy()
+        
+        # Fall back to the previous selection, or any remaining plotter
+        fallback = self.registry.previous or next(iter(self.registry.plotters.values()), None)
+        self.selected_plotter = None
+        self.select_plotter(fallback)
     
     def update_config_panel(self):
-        # Clear existing configuration widgets
-        for widget in self.config_widgets:
-            widget.destroy()
-        self.config_widgets = []
-        
         # If no plotter is selected, show the placeholder message
         if not self.selected_plotter:
+            self.config_form.pack_forget()
             self.no_selection_label.pack(pady=20)
             return
         
-        # Hide the placeholder message
-        self.no_selection_label.pack_forget()
-        
-        # Create configuration options for the selected plotter
-        title_label = ttk.Label(self.config_scroll_frame.viewPort, text="Plot Title:")
-        title_label.pack(anchor=tk.W, padx=10, pady=(10, 0))
-        
-        title_entry = ttk.Entry(self.config_scroll_frame.viewPort)
-        title_entry.insert(0, self.selected_plotter.title if hasattr(self.selected_plotter, 'title') else "Function Plot")
-        title_entry.pack(fill=tk.X, padx=10, pady=(0, 10))
-        
-        x_range_label = ttk.Label(self.config_scroll_frame.viewPort, text="X Range (min, max):")
-        x_range_label.pack(anchor=tk.W, padx=10, pady=(10, 0))
-        
-        x_range_frame = ttk.Frame(self.config_scroll_frame.viewPort)
-        x_range_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
-        
-        x_min_entry = ttk.Entry(x_range_frame, width=10)
-        x_min_entry.insert(0, "-10")
-        x_min_entry.pack(side=tk.LEFT, padx=(0, 5))
-        
-        x_max_entry = ttk.Entry(x_range_frame, width=10)
-        x_max_entry.insert(0, "10")
-        x_max_entry.pack(side=tk.LEFT)
-        
-        y_range_label = ttk.Label(self.config_scroll_frame.viewPort, text="Y Range (min, max):")
-        y_range_label.pack(anchor=tk.W, padx=10, pady=(10, 0))
-        
-        y_range_frame = ttk.Frame(self.config_scroll_frame.viewPort)
-        y_range_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
-        
-        y_min_entry = ttk.Entry(y_range_frame, width=10)
-        y_min_entry.insert(0, "-10")
-        y_min_entry.pack(side=tk.LEFT, padx=(0, 5))
-        
-        y_max_entry = ttk.Entry(y_range_frame, width=10)
-        y_max_entry.insert(0, "10")
-        y_max_entry.pack(side=tk.LEFT)
-        
-        # Add more configuration options as needed
-        
-        # Store the configuration widgets for later access
-        self.config_widgets = [title_label, title_entry, x_range_label, x_range_frame, 
-                             y_range_label, y_range_frame]
-        
-        # Store entry widgets for apply_configuration method
-        self.current_config = {
-            'title_entry': title_entry,
-            'x_min_entry': x_min_entry,
-            'x_max_entry': x_max_entry,
-            'y_min_entry': y_min_entry,
-            'y_max_entry': y_max_entry
-        }
+        # Show the form instead of the placeholder message
+        if not self.config_form.winfo_manager():
+            self.no_selection_label.pack_forget()
+            self.config_form.pack(fill=tk.X)
+        
+        # Load the selected plotter's current values into the form
+        plotter = self.selected_plotter
+        self.title_var.set(plotter.title)
+        self.x_min_var.set(plotter.x_range[0])
+        self.x_max_var.set(plotter.x_range[1])
+        self.y_min_var.set(plotter.y_range[0])
+        self.y_max_var.set(plotter.y_range[1])
+        self.grid_var.set(plotter.grid_spacing)
     
     def apply_configuration(self):
-        if not self.selected_plotter or not hasattr(self, 'current_config'):
+        if not self.selected_plotter:
             return
         
-        # Example of applying configuration - adapt to your FunctionPlotter implementation
-        new_title = self.current_config['title_entry'].get()
         try:
-            x_min = float(self.current_config['x_min_entry'].get())
-            x_max = float(self.current_config['x_max_entry'].get())
-            y_min = float(self.current_config['y_min_entry'].get())
-            y_max = float(self.current_config['y_max_entry'].get())
-            
-            # Update the plotter with new configuration
-            # Note: These methods will depend on your FunctionPlotter implementation
-            if hasattr(self.selected_plotter, 'set_title'):
-                self.selected_plotter.set_title(new_title)
+            x_min = float(self.x_min_var.get())
+            x_max = float(self.x_max_var.get())
+            y_min = float(self.y_min_var.get())
+            y_max = float(self.y_max_var.get())
+            grid_spacing = float(self.grid_var.get())
             
-            if hasattr(self.selected_plotter, 'set_ranges'):
-                self.selected_plotter.set_ranges(x_min, x_max, y_min, y_max)
-            
-            # Redraw the plot
-            if hasattr(self.selected_plotter, 'redraw'):
-                self.selected_plotter.redraw()
-            
-        except ValueError:
-            # Handle invalid input
-            pass
+            # Validate ranges
+            if x_min >= x_max:
+                raise ValueError("X minimum must be less than X maximum")
+            if y_min >= y_max:
+                raise ValueError("Y minimum must be less than Y maximum")
+            if grid_spacing <= 0:
+                raise ValueError("Grid spacing must be positive")
+        except ValueError as e:
+            tk.messagebox.showerror("Invalid Input", str(e))
+            return
+        
+        self.selected_plotter.set_title(self.title_var.get())
+        self.selected_plotter.set_ranges(
+            x_range=(x_min, x_max),
+            y_range=(y_min, y_max),
+            grid_spacing=grid_spacing
+        )
     
     def reset_configuration(self):
         # Reset to default configuration
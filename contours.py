@@ -0,0 +1,142 @@
+import numpy as np
+
+# Marching squares table: for each corner sign pattern, the pairs of cell edges
+# the contour crosses. Corners are numbered 0 (x, y), 1 (x+1, y), 2 (x+1, y+1),
+# 3 (x, y+1) and bit k of the case is set when corner k is positive. Edges are
+# 0 (corner 0-1), 1 (1-2), 2 (3-2) and 3 (0-3). Saddles (5 and 10) list the
+# pairing for a centre with the same sign as corner 0 first, then the other one.
+SEGMENTS = {
+    1: [(3, 0)], 2: [(0, 1)], 3: [(3, 1)], 4: [(1, 2)], 6: [(0, 2)], 7: [(3, 2)],
+    8: [(2, 3)], 9: [(2, 0)], 11: [(2, 1)], 12: [(1, 3)], 13: [(1, 0)], 14: [(0, 3)],
+}
+SADDLES = {
+    5: ([(3, 2), (1, 0)], [(3, 0), (1, 2)]),
+    10: ([(0, 3), (2, 1)], [(0, 1), (2, 3)]),
+}
+CORNERS = np.array([(0, 0), (1, 0), (1, 1), (0, 1)])
+EDGE_CORNERS = np.array([(0, 1), (1, 2), (3, 2), (0, 3)])
+
+
+class VertexGrid:
+    """Function values on the finest pixel grid, evaluated only where they are asked for"""
+
+    def __init__(self, func, x_of, y_of, columns, rows):
+        self.func = func
+        self.x_of = x_of
+        self.y_of = y_of
+        self.columns = columns
+        self.values = np.full(columns * rows, np.nan)
+        self.known = np.zeros(columns * rows, dtype=bool)
+
+    def ids(self, ix, iy):
+        return iy * self.columns + ix
+
+    def lookup(self, ix, iy):
+        """Values at integer pixel positions, evaluating the function in bulk for new ones"""
+        ids = self.ids(ix, iy)
+        new = np.unique(ids[~self.known[ids]])
+        if new.size:
+            xs = self.x_of(new % self.columns)
+            ys = self.y_of(new // self.columns)
+            self.values[new] = self.func(xs, ys)
+            self.known[new] = True
+        return self.values[ids]
+
+
+def implicit_polylines(func, width, height, x_of, y_of, cell_size=8):
+    """Trace f(x, y) = 0 over the canvas, refining only cells the contour may cross, into NaN-separated polylines"""
+    columns, rows = -(-width // cell_size), -(-height // cell_size)
+    grid = VertexGrid(func, x_of, y_of, columns * cell_size + 1, rows * cell_size + 1)
+
+    # Cells are (x, y) of their top left corner in pixels, all of the current size
+    cx, cy = np.meshgrid(np.arange(columns) * cell_size, np.arange(rows) * cell_size)
+    cx, cy = cx.ravel(), cy.ravel()
+    size = cell_size
+    while True:
+        corners = grid.lookup(cx[:, None] + CORNERS[:, 0] * size, cy[:, None] + CORNERS[:, 1] * size)
+        if size == 1:
+            positive = corners > 0
+            crossed = positive.any(axis=1) & ~positive.all(axis=1) & np.isfinite(corners).all(axis=1)
+            cx, cy, corners = cx[crossed], cy[crossed], corners[crossed]
+            break
+
+        # A contour smaller than the cell can miss every corner, so the centre is checked too, and
+        # cells where f is within its own variation across the cell of zero are split as well
+        values = np.column_stack((corners, grid.lookup(cx + size // 2, cy + size // 2)))
+        positive = values > 0
+        crossed = positive.any(axis=1) & ~positive.all(axis=1)
+        near = np.abs(values).min(axis=1) <= values.max(axis=1) - values.min(axis=1)
+        keep = (crossed | near) & np.isfinite(values).all(axis=1)
+        cx, cy = cx[keep], cy[keep]
+        if not cx.size:
+            break
+
+        # Quadtree step: each crossed cell becomes four of half the size
+        size //= 2
+        cx = (cx[:, None] + np.array([0, size, 0, size])).ravel()
+        cy = (cy[:, None] + np.array([0, 0, size, size])).ravel()
+
+    if not cx.size:
+        return np.empty(0), np.empty(0)
+    return join_segments(grid, cx, cy, corners)
+
+
+def join_segments(grid, cx, cy, corners):
+    """Run marching squares on one-pixel cells and chain their segments into polylines"""
+    cases = (corners > 0).astype(int) @ (1 << np.arange(4))
+    centre_positive = corners.mean(axis=1) > 0
+
+    # Edges are keyed by the pixel grid so that neighbouring cells share crossing points
+    edge_keys = np.stack([
+        2 * grid.ids(cx, cy), 2 * grid.ids(cx + 1, cy) + 1,
+        2 * grid.ids(cx, cy + 1), 2 * grid.ids(cx, cy) + 1,
+    ], axis=1)
+
+    # Where each edge is crossed, by linear interpolation between its corners
+    start, end = EDGE_CORNERS[:, 0], EDGE_CORNERS[:, 1]
+    value_start, value_end = corners[:, start], corners[:, end]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip(value_start / (value_start - value_end), 0.0, 1.0)
+    px = cx[:, None] + CORNERS[start, 0] + (CORNERS[end, 0] - CORNERS[start, 0]) * t
+    py = cy[:, None] + CORNERS[start, 1] + (CORNERS[end, 1] - CORNERS[start, 1]) * t
+
+    points = {}
+    neighbours = {}
+    for i, case in enumerate(cases.tolist()):
+        pairs = SEGMENTS.get(case)
+        if pairs is None:
+            pairs = SADDLES[case][0 if centre_positive[i] == bool(case & 1) else 1]
+        for a, b in pairs:
+            key_a, key_b = int(edge_keys[i, a]), int(edge_keys[i, b])
+            points[key_a] = (px[i, a], py[i, a])
+            points[key_b] = (px[i, b], py[i, b])
+            neighbours.setdefault(key_a, []).append(key_b)
+            neighbours.setdefault(key_b, []).append(key_a)
+
+    # Walk open chains from their ends first, then whatever closed loops remain
+    chains = []
+    visited = set()
+    starts = [key for key, links in neighbours.items() if len(links) == 1] + list(neighbours)
+    for first in starts:
+        if first in visited:
+            continue
+        chain = [first]
+        visited.add(first)
+        current = first
+        while True:
+            following = [key for key in neighbours[current] if key not in visited]
+            if not following:
+                if first in neighbours[current] and len(chain) > 2:
+                    chain.append(first)  # Close the loop
+                break
+            current = following[0]
+            chain.append(current)
+            visited.add(current)
+        chains.append(chain)
+
+    xs, ys = [], []
+    for chain in chains:
+        pixels = np.array([points[key] for key in chain])
+        xs.extend((grid.x_of(pixels[:, 0]), [np.nan]))
+        ys.extend((grid.y_of(pixels[:, 1]), [np.nan]))
+    return np.concatenate(xs), np.concatenate(ys)
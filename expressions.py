@@ -0,0 +1,205 @@
+import ast
+import builtins
+import hashlib
+import math
+import numpy as np
+
+
+def _log(x, base=None):
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+
+class ArrayMath:
+    """Stands in for the math module so expressions like math.sin(x) work on whole arrays"""
+
+    sin, cos, tan = np.sin, np.cos, np.tan
+    asin, acos, atan, atan2 = np.arcsin, np.arccos, np.arctan, np.arctan2
+    sinh, cosh, tanh = np.sinh, np.cosh, np.tanh
+    asinh, acosh, atanh = np.arcsinh, np.arccosh, np.arctanh
+    exp, expm1, log1p, log10, log2 = np.exp, np.expm1, np.log1p, np.log10, np.log2
+    log = staticmethod(_log)
+    sqrt, fabs, floor, ceil, trunc = np.sqrt, np.fabs, np.floor, np.ceil, np.trunc
+    hypot, pow, fmod, copysign = np.hypot, np.power, np.fmod, np.copysign
+    degrees, radians = np.degrees, np.radians
+    isnan, isinf, isfinite = np.isnan, np.isinf, np.isfinite
+    pi, e, tau, inf, nan = math.pi, math.e, math.tau, math.inf, math.nan
+
+
+ARRAY_MATH = ArrayMath()
+
+
+class SubexpressionMemo:
+    """Values of expression subtrees keyed by subtree and input contents, evicting least recently used past a cap"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.values = {}  # (subtree dump, input tokens) -> value, least recently used first
+        self.total_bytes = 0
+
+    def get(self, key):
+        value = self.values.pop(key, None)
+        if value is not None:
+            self.values[key] = value
+        return value
+
+    def put(self, key, value):
+        size = np.asarray(value).nbytes
+        if size > self.max_bytes:
+            return
+        self.values[key] = value
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            oldest = next(iter(self.values))
+            self.total_bytes -= np.asarray(self.values.pop(oldest)).nbytes
+
+    def clear(self):
+        self.values = {}
+        self.total_bytes = 0
+
+
+# Expressions are evaluated in the watchdog worker, so the memo lives there and is lost whenever the worker is killed
+MEMO = SubexpressionMemo()
+
+# Node types a subtree may contain to be evaluated on its own and cached
+_PURE_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Constant, ast.Attribute,
+               ast.Load, ast.operator, ast.unaryop, ast.cmpop)
+
+
+def _is_pure(tree):
+    """Whether an expression is built only from arithmetic, comparisons and math functions"""
+    for node in ast.walk(tree):
+        if not isinstance(node, _PURE_NODES):
+            return False
+        if isinstance(node, ast.Attribute) and not (isinstance(node.value, ast.Name) and node.value.id == "math"):
+            return False
+        if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Attribute)):
+            return False
+    return True
+
+
+def _split(node, steps):
+    """Replace every non-leaf subtree of node, innermost first, by a name bound to its value, appending one step each"""
+    if isinstance(node, (ast.Name, ast.Constant, ast.Attribute)):
+        return node
+    key = ast.dump(node)
+    names = tuple(sorted({child.id for child in ast.walk(node) if isinstance(child, ast.Name) and child.id != "math"}))
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, ast.expr):
+            setattr(node, field, _split(value, steps))
+        elif isinstance(value, list):
+            setattr(node, field, [_split(item, steps) if isinstance(item, ast.expr) else item for item in value])
+    code = compile(ast.fix_missing_locations(ast.Expression(body=node)), "<subexpression>", "eval")
+    bound = f"_subexpression{len(steps)}"
+    steps.append((key, names, code, bound))
+    return ast.Name(id=bound, ctx=ast.Load())
+
+
+def _token(array):
+    """Identify an input by its contents"""
+    array = np.ascontiguousarray(array)
+    return array.dtype.str, array.shape, hashlib.blake2b(array.tobytes(), digest_size=16).digest()
+
+
+class Expression:
+    """A compiled user expression that can be evaluated on scalars or on whole arrays"""
+
+    def __init__(self, text, variables=("x",)):
+        self.text = text
+        self.variables = variables
+        self.code = compile(text, "<string>", "eval")
+
+        # Arithmetic expressions are also split into subtrees that are cached in MEMO
+        self.steps = None
+        tree = ast.parse(text.strip(), mode="eval")
+        if _is_pure(tree):
+            self.steps = []
+            _split(tree.body, self.steps)
+            self.names = {name for step in self.steps for name in step[1]}
+
+    def __call__(self, *values):
+        namespace = {"math": math}
+        namespace.update(zip(self.variables, values))
+        return eval(self.code, namespace)
+
+    def evaluate_array(self, **arrays):
+        """Evaluate over NumPy arrays in one vectorized pass, falling back to a per-element loop"""
+        shape = np.broadcast_shapes(*(np.shape(array) for array in arrays.values()))
+        try:
+            with np.errstate(all="ignore"):
+                if self.steps and self.names <= arrays.keys():
+                    result = self.evaluate_steps(arrays)
+                else:
+                    result = eval(self.code, {"math": ARRAY_MATH, **arrays})
+            return np.array(np.broadcast_to(np.asarray(result, dtype=float), shape))
+        except Exception:
+            return self.evaluate_loop(**arrays)
+
+    def evaluate_steps(self, arrays):
+        """Evaluate subtree by subtree, reusing values any expression already computed on the same inputs"""
+        tokens = {name: _token(arrays[name]) for name in self.names}
+        namespace = {"math": ARRAY_MATH, **arrays}
+        for key, names, code, bound in self.steps:
+            memo_key = (key, tuple(tokens[name] for name in names))
+            value = MEMO.get(memo_key)
+            if value is None:
+                value = eval(code, namespace)
+                MEMO.put(memo_key, value)
+            namespace[bound] = value
+        return namespace[self.steps[-1][3]]
+
+    def evaluate_loop(self, **arrays):
+        names = list(arrays)
+        broadcast = np.broadcast_arrays(*arrays.values())
+        columns = [np.ravel(array) for array in broadcast]
+        values = np.empty(len(columns[0]))
+        for i, point in enumerate(zip(*columns)):
+            namespace = {"math": math}
+            namespace.update(zip(names, point))
+            try:
+                values[i] = eval(self.code, namespace)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                values[i] = math.nan
+        return values.reshape(broadcast[0].shape)
+
+
+def compile_expression(expression, variables=("x",)):
+    """Compile an expression typed by the user; the result is callable like a function of x"""
+    return Expression(expression, variables)
+
+
+def normalize(expression):
+    """Canonical form of an expression's text, so that spacing and redundant parentheses do not matter"""
+    return ast.dump(ast.parse(expression.strip(), mode="eval"))
+
+
+def free_names(expression, variables=("x",)):
+    """Names an expression reads besides its variables, math, builtins and called names, in order of appearance"""
+    tree = ast.parse(expression.strip(), mode="eval")
+    nodes = [node for node in ast.walk(tree) if isinstance(node, ast.Name)]
+    # A called name is a function, possibly a misspelled one, never a parameter
+    called = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    # Comprehension and lambda variables are bound inside the expression itself
+    bound = {node.id for node in nodes if isinstance(node.ctx, ast.Store)}
+    bound.update(arg.arg for node in ast.walk(tree) if isinstance(node, ast.Lambda) for arg in node.args.args)
+    names = []
+    for node in sorted(nodes, key=lambda node: node.col_offset):
+        name = node.id
+        if (isinstance(node.ctx, ast.Load) and name not in variables and name != "math" and name not in bound
+                and not hasattr(builtins, name) and id(node) not in called and name not in names):
+            names.append(name)
+    return names
+
+
+def check_functions(expression):
+    """Raise ValueError if an expression calls a function that is neither a builtin nor in math"""
+    tree = ast.parse(expression.strip(), mode="eval")
+    bound = {arg.arg for node in ast.walk(tree) if isinstance(node, ast.Lambda) for arg in node.args.args}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        if isinstance(func, ast.Name) and not hasattr(builtins, func.id) and func.id not in bound:
+            raise ValueError(f"unknown function '{func.id}'")
+        if (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "math"
+                and not hasattr(math, func.attr)):
+            raise ValueError(f"unknown function 'math.{func.attr}'")
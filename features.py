@@ -0,0 +1,181 @@
+import bisect
+import math
+import numpy as np
+
+
+def brent(func, a, b, fa=None, fb=None, xtol=1e-12, max_iterations=100):
+    """Root of func in [a, b] by Brent's method, or None without a sign change or where func is undefined"""
+    fa = func(a) if fa is None else fa
+    fb = func(b) if fb is None else fb
+    if not (math.isfinite(fa) and math.isfinite(fb)) or fa * fb > 0:
+        return None
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(max_iterations):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tolerance = 2 * 2.2e-16 * abs(b) + xtol / 2
+        middle = (c - b) / 2
+        if abs(middle) <= tolerance or fb == 0:
+            return b
+
+        if abs(e) >= tolerance and abs(fa) > abs(fb):
+            # Inverse quadratic interpolation, or the secant step when only two points differ
+            s = fb / fa
+            if a == c:
+                p, q = 2 * middle * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * middle * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * middle * q - abs(tolerance * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = middle
+        else:
+            d = e = middle
+
+        a, fa = b, fb
+        b += d if abs(d) > tolerance else math.copysign(tolerance, middle)
+        fb = func(b)
+        if not math.isfinite(fb):
+            return None
+    return b
+
+
+def sign_changes(values, exact_zeros=True):
+    """Indices i where values change sign between i and i + 1, skipping gaps; exact zeros count too with exact_zeros"""
+    with np.errstate(invalid="ignore"):
+        changes = values[:-1] * values[1:] < 0
+        if exact_zeros:
+            changes |= (values[:-1] == 0) & (values[1:] != 0) & np.isfinite(values[1:])
+    return np.flatnonzero(changes)
+
+
+def roots_and_extrema(xs, ys, func, low, high):
+    """Roots, minima and maxima of a sampled function in [low, high] as (x, y, kind), refined on func"""
+    inside = (xs >= low) & (xs <= high)
+    xs, ys = xs[inside], ys[inside]
+    found = []
+    if len(xs) < 3:
+        return found
+
+    for i in sign_changes(ys):
+        x = brent(func, xs[i], xs[i + 1], ys[i], ys[i + 1])
+        if x is not None:
+            found.append((float(x), 0.0, "root"))
+
+    # An extremum is where the slope changes sign; it is refined as a zero of the slope
+    slopes = np.diff(ys)
+    width = (xs[-1] - xs[0]) / len(xs)
+    step = width * 1e-3
+
+    def slope(x):
+        return (func(x + step) - func(x - step)) / (2 * step)
+
+    for i in sign_changes(slopes, exact_zeros=False):
+        kind = "max" if slopes[i] > 0 else "min"
+        x = brent(slope, xs[i], xs[i + 2])
+        if x is None:
+            x = xs[i + 1]  # The slope was not bracketed, keep the sampled peak
+        y = func(x)
+        if math.isfinite(y):
+            found.append((float(x), float(y), kind))
+    return found
+
+
+def intersections(curve_a, curve_b, func_a, func_b, low, high):
+    """Points within [low, high] where two sampled functions cross, refined with Brent's method"""
+    xs, ys = curve_a
+    other_xs, other_ys = curve_b
+    low = max(low, xs[0], other_xs[0])
+    high = min(high, xs[-1], other_xs[-1])
+    inside = (xs >= low) & (xs <= high)
+    xs, ys = xs[inside], ys[inside]
+    if len(xs) < 2:
+        return []
+
+    # Compare both curves on the first one's grid
+    differences = ys - np.interp(xs, other_xs, other_ys)
+    found = []
+    for i in sign_changes(differences):
+        x = brent(lambda x: func_a(x) - func_b(x), xs[i], xs[i + 1])
+        if x is not None:
+            y = func_a(x)
+            if math.isfinite(y):
+                found.append((float(x), float(y), "intersection"))
+    return found
+
+
+class FeatureIndex:
+    """Features found so far, per curve or pair of curves, with the x ranges searched at each sample step"""
+
+    def __init__(self):
+        self.searched = {}  # Key -> {sample step: sorted, disjoint list of [low, high] ranges}
+        self.positions = {}  # Key -> sorted feature xs
+        self.features = {}  # Key -> features in the same order as positions
+
+    def missing(self, key, low, high, step):
+        """Parts of [low, high] not yet searched for key at step or finer"""
+        ranges = sorted(span for searched_step, spans in self.searched.get(key, {}).items()
+                        if searched_step <= step * (1 + 1e-9) for span in spans)
+        gaps = []
+        for start, end in ranges:
+            if end < low:
+                continue
+            if start > high:
+                break
+            if start > low:
+                gaps.append((low, start))
+            low = max(low, end)
+        if low < high:
+            gaps.append((low, high))
+        return gaps
+
+    def add(self, key, low, high, step, found):
+        """Record that [low, high] was searched for key at step and what was found there"""
+        ranges = self.searched.setdefault(key, {}).setdefault(step, [])
+        ranges.append([low, high])
+        ranges.sort()
+        merged = [ranges[0]]
+        for start, end in ranges[1:]:
+            if start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.searched[key][step] = merged
+
+        positions = self.positions.setdefault(key, [])
+        features = self.features.setdefault(key, [])
+        for feature in found:
+            # Gaps share their ends with searched ranges and finer steps search again, so points repeat
+            i = bisect.bisect_left(positions, feature[0])
+            if any(abs(positions[j] - feature[0]) <= 1e-9 * max(1.0, abs(feature[0]))
+                   and features[j][2] == feature[2] for j in (i - 1, i) if 0 <= j < len(positions)):
+                continue
+            positions.insert(i, feature[0])
+            features.insert(i, feature)
+
+    def query(self, key, low, high):
+        positions = self.positions.get(key, [])
+        return self.features.get(key, [])[bisect.bisect_left(positions, low):bisect.bisect_right(positions, high)]
+
+    def forget(self, curve_key):
+        """Drop everything found for a curve, including its intersections"""
+        for key in [key for key in self.searched if curve_key in key]:
+            del self.searched[key]
+            self.positions.pop(key, None)
+            self.features.pop(key, None)
@@ -0,0 +1,25 @@
+import numpy as np
+
+
+class IntervalIndex:
+    """Closed intervals sorted by start with a running maximum of ends, for fast overlap queries"""
+
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.reach = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlapping(self, low, high):
+        """Return the original positions of intervals that intersect [low, high], ordered by start"""
+        first = np.searchsorted(self.reach, low, side="left")
+        last = np.searchsorted(self.starts, high, side="right")
+        if first >= last:
+            return np.empty(0, dtype=np.intp)
+        hits = np.flatnonzero(self.ends[first:last] >= low) + first
+        return self.order[hits]
@@ -1,10 +1,796 @@
+import time
+_module_started = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk
+import argparse
+import importlib
 import math
 import tkinter.messagebox
+import tkinter.filedialog
 import uuid
+import ticks
+
+
+class StartupTimer:
+    """Collects how long each startup phase took, for the startup timing report"""
+
+    def __init__(self, started):
+        self.started = started
+        self.phases = []  # (name, seconds)
+        self.verbose = False  # Print phases recorded after the report, like lazy imports
+    
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+        if self.verbose:
+            print(f"{name:<28}{seconds * 1000:8.1f} ms")
+    
+    def report(self):
+        """Print every phase so far and the total time since the module started loading"""
+        print("Startup timing")
+        for name, seconds in self.phases:
+            print(f"  {name:<26}{seconds * 1000:8.1f} ms")
+        print(f"  {'total':<26}{(time.perf_counter() - self.started) * 1000:8.1f} ms")
+        self.verbose = True
+
+
+startup_timer = StartupTimer(_module_started)
+
+
+class LazyModule:
+    """Stand-in for a heavy module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def load(self):
+        if self._module is None:
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            startup_timer.record(f"lazy import {self._name}", time.perf_counter() - started)
+        return self._module
+    
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+# NumPy and the modules built on it are only needed once something is plotted
+np = LazyModule("numpy")
+raster = LazyModule("raster")
+workspace = LazyModule("workspace")
+scales = LazyModule("scales")
+expressions = LazyModule("expressions")
+contours = LazyModule("contours")
+intervals = LazyModule("intervals")
+watchdog = LazyModule("watchdog")
+samplecache = LazyModule("samplecache")
+features = LazyModule("features")
+spatial = LazyModule("spatial")
+
+
+def evaluate_array(func, **arrays):
+    """Evaluate a compiled expression over arrays in the watchdog worker, under its time budget"""
+    return watchdog.shared().evaluate(func, **arrays)
+
+
+class Curve:
+    """A function on a plotter together with its display settings and domain restriction"""
+
+    kind = "function"
+    single_valued = True  # Samples are one y per increasing x, so they can be bisected and derived
+    traced_in_view = False  # Samples only cover what the y range shows, so autoscale cannot fit to them
+    slow_stride = 8  # Once too slow, sample only every this many pixels
+    persist_seconds = 0.05  # Only samples that took longer than this to evaluate are kept on disk
+
+    def __init__(self, func, name, color, start_time=None, end_time=None, start_value=None, end_value=None,
+                 expression=None, parameters=None, cache_key=None):
+        self.func = func
+        self.expression = expression  # Source text of func, if it was typed in as an expression
+        self.cache_key = cache_key  # JSON-able identity of a plain Python func, so its samples can be cached on disk
+        self.parameters = dict(parameters or {})  # Free names of the expression -> current value
+        self.name = name
+        self.color = color
+        self.start_time = start_time
+        self.end_time = end_time
+        self.start_value = start_value
+        self.end_value = end_value
+        
+        # Stable key used to match list rows and caches to this curve
+        self.key = str(uuid.uuid4())[:8]
+        
+        # Cached (xs, ys) sample arrays and the key of the grid they were taken on
+        self.samples = None
+        self.sample_key = None
+        
+        # Set when an evaluation ran over the watchdog's time budget, first once and then twice
+        self.too_slow = False
+        self.skipped = False
+        self.error = None  # Message of an evaluation error; the curve is skipped while it is set
+        self.slow_recalled = False  # Whether the on-disk cache was asked if an earlier session found it too slow
+    
+    @property
+    def stride(self):
+        return self.slow_stride if self.too_slow else 1
+    
+    def status(self):
+        """Short note for the function list about how the curve is being rendered"""
+        if self.error is not None:
+            return f"error: {self.error}"
+        if self.skipped:
+            return "too slow, skipped"
+        if self.too_slow:
+            return "too slow"
+        return ""
+    
+    def cache_identity(self):
+        """What the curve computes, independent of how it is shown, or None if that cannot be described"""
+        state = self.state()
+        if state is None:
+            if self.cache_key is None:
+                return None
+            state = {"kind": self.kind, "cache_key": self.cache_key, "start_time": self.start_time,
+                     "end_time": self.end_time, "start_value": self.start_value, "end_value": self.end_value,
+                     "parameters": dict(self.parameters)}
+        identity = {name: value for name, value in state.items() if name not in ("name", "color")}
+        for name in ("expression", "x_expression", "y_expression", "r_expression"):
+            if name in identity:
+                identity[name] = expressions.normalize(identity[name])
+        return identity
+    
+    def disk_address(self, key):
+        identity = self.cache_identity()
+        if identity is None:
+            return None
+        return samplecache.address(identity, (*key, self.stride))
+    
+    def load_samples(self, key):
+        """Look up samples for a grid key in the on-disk cache"""
+        address = self.disk_address(key)
+        return None if address is None else samplecache.shared().get(address)
+    
+    def store_samples(self, key, samples, started):
+        """Keep samples evaluated since started in the on-disk cache, if they were slow to compute"""
+        # Anything that once ran over the watchdog's budget is slow, however quick its thinned-out grid was
+        if time.perf_counter() - started < self.persist_seconds and not self.too_slow:
+            return
+        address = self.disk_address(key)
+        if address is not None:
+            samplecache.shared().put(address, samples)
+    
+    def slow_address(self):
+        identity = self.cache_identity()
+        return None if identity is None else samplecache.address(identity, ("too slow",))
+    
+    def remember_slow(self):
+        """Note in the on-disk cache that the curve ran over budget, so it is thinned out from the start next time"""
+        address = self.slow_address()
+        if address is not None:
+            samplecache.shared().put(address, (np.empty(0), np.empty(0)))
+    
+    def recall_slow(self):
+        """Start at the slow stride if an earlier session found the curve too slow, instead of timing out again"""
+        if self.slow_recalled:
+            return
+        self.slow_recalled = True
+        address = self.slow_address()
+        if address is not None and samplecache.shared().get(address) is not None:
+            self.too_slow = True
+    
+    def state(self):
+        """Settings needed to rebuild this curve from a workspace, or None for plain Python functions"""
+        if self.expression is None:
+            return None
+        return {
+            "kind": self.kind,
+            "expression": self.expression,
+            "name": self.name,
+            "color": self.color,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "start_value": self.start_value,
+            "end_value": self.end_value,
+            "parameters": dict(self.parameters),
+        }
+    
+    def sample_for(self, plotter):
+        """Sample over the visible domain at one point per pixel, or None if it is offscreen"""
+        x_min, x_max = plotter.x_range
+        
+        # Apply time range constraints if provided
+        x_start = self.start_time if self.start_time is not None else x_min
+        x_end = self.end_time if self.end_time is not None else x_max
+        
+        # Ensure we're within the visible range
+        x_start = max(x_start, x_min)
+        x_end = min(x_end, x_max)
+        if x_end <= x_start:
+            return None
+        
+        # Number of points to plot, one per pixel of the domain on screen
+        canvas_start, canvas_end = plotter.to_canvas_x([x_start, x_end])
+        num_points = int((canvas_end - canvas_start) / self.stride)
+        num_points = max(num_points, 2)  # Ensure at least 2 points
+        
+        return self.sample(x_start, x_end, num_points, plotter.x_scale_type, plotter.link)
+    
+    def evaluate(self, x):
+        try:
+            return float(self.func(x, *self.parameters.values()))
+        except (ValueError, ZeroDivisionError, OverflowError):
+            # Discontinuities become gaps in the curve
+            return math.nan
+    
+    def scalar_function(self):
+        """The function of x alone, which can run in the watchdog worker if it was typed as an expression"""
+        if isinstance(self.func, expressions.Expression):
+            return watchdog.ScalarFunction(self.func, self.parameters.values())
+        return self.evaluate
+    
+    def sample(self, x_start, x_end, num_points, scale_type="linear", link=None):
+        """Return (xs, ys) over the grid, evaluating only if the grid, parameters or linked samples changed"""
+        key = (x_start, x_end, num_points, scale_type, *self.parameters.values())
+        if self.samples is None or self.sample_key != key:
+            self.samples = link.find(self, key) if link is not None else None
+            if self.samples is None:
+                self.samples = self.load_samples(key)
+            if self.samples is None:
+                # Points are evenly spaced on screen, so log-spaced on a log axis
+                started = time.perf_counter()
+                if link is not None:
+                    xs = link.grid(scale_type, x_start, x_end, num_points)
+                else:
+                    xs = scales.get_scale(scale_type).grid(x_start, x_end, num_points)
+                ys = self.evaluate_grid(xs)
+                
+                # Handle start and end point values if specified
+                if self.start_value is not None:
+                    ys[0] = self.start_value
+                if self.end_value is not None:
+                    ys[-1] = self.end_value
+                
+                self.samples = (xs, ys)
+                self.store_samples(key, self.samples, started)
+            if link is not None:
+                link.keep(self, key, self.samples)
+            self.sample_key = key
+        return self.samples
+    
+    def evaluate_grid(self, xs):
+        """Evaluate the function on an array of xs, leaving the sample cache alone"""
+        if hasattr(self.func, "evaluate_array"):
+            return evaluate_array(self.func, x=xs, **self.parameters)
+        return np.fromiter((self.evaluate(x) for x in xs), dtype=float, count=len(xs))
+    
+    def reevaluate(self):
+        """Re-evaluate the cached x grid in one vectorized call after a parameter changed"""
+        xs = self.samples[0]
+        ys = evaluate_array(self.func, x=xs, **self.parameters)
+        if self.start_value is not None:
+            ys[0] = self.start_value
+        if self.end_value is not None:
+            ys[-1] = self.end_value
+        self.samples = (xs, ys)
+        self.sample_key = (*self.sample_key[:4], *self.parameters.values())
+    
+    def follow_y_range(self, plotter):
+        """Keep the samples autoscale just fitted to after it moved the y range; only keys holding it need this"""
+    
+    def cache_bytes(self):
+        if self.samples is None:
+            return 0
+        return sum(array.nbytes for array in self.samples)
+    
+    def drop_samples(self):
+        self.samples = None
+        self.sample_key = None
+
+
+class ParametricCurve(Curve):
+    """A curve (x(t), y(t)) over a range of t, sampled evenly along its length on screen"""
+
+    kind = "parametric"
+    single_valued = False
+    initial_points = 256  # Points of the first, uniform-in-t pass
+    max_points = 20000
+
+    def __init__(self, x_expression, y_expression, name, color, t_range=(0, 2 * math.pi)):
+        super().__init__(None, name, color)
+        self.x_expression = x_expression
+        self.y_expression = y_expression
+        self.x_func = expressions.compile_expression(x_expression, ("t",))
+        self.y_func = expressions.compile_expression(y_expression, ("t",))
+        self.t_range = tuple(t_range)
+    
+    def state(self):
+        return {
+            "kind": self.kind,
+            "x_expression": self.x_expression,
+            "y_expression": self.y_expression,
+            "name": self.name,
+            "color": self.color,
+            "t_range": list(self.t_range),
+        }
+    
+    def evaluate_points(self, ts):
+        return evaluate_array(self.x_func, t=ts), evaluate_array(self.y_func, t=ts)
+    
+    def view_key(self, plotter):
+        width, height = plotter.canvas_size()
+        return (*self.t_range, *plotter.x_range, *plotter.y_range, width, height,
+                plotter.x_scale_type, plotter.y_scale_type)
+    
+    def follow_y_range(self, plotter):
+        # The points are still on the curve; only their spacing was planned for the old y range
+        if self.samples is not None:
+            self.sample_key = self.view_key(plotter)
+    
+    def sample_for(self, plotter):
+        width, height = plotter.canvas_size()
+        key = self.view_key(plotter)
+        if self.samples is not None and self.sample_key == key:
+            return self.samples
+        self.samples = self.load_samples(key)
+        if self.samples is not None:
+            self.sample_key = key
+            return self.samples
+        
+        # First pass evenly spaced in t, to measure where the curve moves fast on screen
+        started = time.perf_counter()
+        initial_points = max(self.initial_points // self.stride, 16)
+        ts = np.linspace(self.t_range[0], self.t_range[1], initial_points)
+        xs, ys = self.evaluate_points(ts)
+        steps = np.hypot(np.diff(plotter.to_canvas_x(xs)), np.diff(plotter.to_canvas_y(ys)))
+        # Gaps and far offscreen excursions should not soak up all the points
+        steps = np.minimum(np.nan_to_num(steps, nan=0.0, posinf=0.0), width + height)
+        length = steps.sum()
+        
+        # Second pass evenly spaced in on-screen arc length, about one point per two pixels
+        num_points = int(min(max(length / (2 * self.stride), initial_points), self.max_points // self.stride))
+        if length > 0:
+            arc = np.concatenate(([0.0], np.cumsum(steps)))
+            ts = np.interp(np.linspace(0, length, num_points), arc, ts)
+            xs, ys = self.evaluate_points(ts)
+        
+        self.samples = (xs, ys)
+        self.sample_key = key
+        self.store_samples(key, self.samples, started)
+        return self.samples
+
+
+class PolarCurve(ParametricCurve):
+    """A curve r(θ) in polar coordinates; the expression may use t or theta for the angle"""
+
+    kind = "polar"
+
+    def __init__(self, r_expression, name, color, t_range=(0, 2 * math.pi)):
+        Curve.__init__(self, None, name, color)
+        self.r_expression = r_expression
+        self.r_func = expressions.compile_expression(r_expression, ("t", "theta"))
+        self.t_range = tuple(t_range)
+    
+    def state(self):
+        return {
+            "kind": self.kind,
+            "r_expression": self.r_expression,
+            "name": self.name,
+            "color": self.color,
+            "t_range": list(self.t_range),
+        }
+    
+    def evaluate_points(self, ts):
+        r = evaluate_array(self.r_func, t=ts, theta=ts)
+        return r * np.cos(ts), r * np.sin(ts)
+
+
+class ImplicitCurve(Curve):
+    """The level set f(x, y) = 0, traced over a grid sized to the canvas"""
+
+    kind = "implicit"
+    single_valued = False
+    traced_in_view = True
+
+    def __init__(self, expression, name, color):
+        super().__init__(expressions.compile_expression(expression, ("x", "y")), name, color,
+                         expression=expression)
+    
+    def state(self):
+        return {"kind": self.kind, "expression": self.expression, "name": self.name, "color": self.color}
+    
+    def sample_for(self, plotter):
+        width, height = plotter.canvas_size()
+        key = (*plotter.x_range, *plotter.y_range, width, height, plotter.x_scale_type, plotter.y_scale_type)
+        if self.samples is None or self.sample_key != key:
+            self.samples = self.load_samples(key)
+            if self.samples is None:
+                # When too slow the contour is traced on a grid of stride by stride pixel blocks
+                stride = self.stride
+                started = time.perf_counter()
+                self.samples = contours.implicit_polylines(
+                    lambda xs, ys: evaluate_array(self.func, x=xs, y=ys),
+                    -(-width // stride), -(-height // stride),
+                    lambda pixels: plotter.from_canvas_x(np.asarray(pixels) * stride),
+                    lambda pixels: plotter.from_canvas_y(np.asarray(pixels) * stride))
+                self.store_samples(key, self.samples, started)
+            self.sample_key = key
+        return self.samples
+
+
+class HeatmapCurve(Curve):
+    """A scalar field f(x, y) shown as a colormapped image, optionally in flat contour bands"""
+
+    kind = "heatmap"
+    single_valued = False
+
+    def __init__(self, expression, name, color, colormap="viridis", levels=None):
+        super().__init__(expressions.compile_expression(expression, ("x", "y")), name, color,
+                         expression=expression)
+        self.colormap = colormap
+        self.levels = levels
+        
+        # The field is cached per view; the colored raster and its image follow from it
+        self.field = None
+        self.field_key = None
+        self.rgb = None
+        self.image = None
+    
+    def state(self):
+        return {"kind": self.kind, "expression": self.expression, "name": self.name, "color": self.color,
+                "colormap": self.colormap, "levels": self.levels}
+    
+    def sample_for(self, plotter):
+        # Heatmaps have no line samples, so they take no part in autoscale
+        return None
+    
+    def image_for(self, plotter):
+        """Return a PhotoImage of the field at one value per canvas pixel"""
+        width, height = plotter.canvas_size()
+        key = (*plotter.x_range, *plotter.y_range, width, height, plotter.x_scale_type, plotter.y_scale_type)
+        if self.field is None or self.field_key != key:
+            # Pixel centres as a row of xs and a column of ys, broadcast into the full grid
+            stride = self.stride
+            xs = plotter.from_canvas_x(np.arange(0, width, stride) + stride / 2)
+            ys = plotter.from_canvas_y(np.arange(0, height, stride) + stride / 2)
+            self.field = evaluate_array(self.func, x=xs[np.newaxis, :], y=ys[:, np.newaxis])
+            self.field_key = key
+            self.rgb = raster.apply_colormap(self.field, raster.colormap_lut(self.colormap), levels=self.levels)
+            if stride > 1:
+                self.rgb = self.rgb.repeat(stride, axis=0).repeat(stride, axis=1)[:height, :width]
+            self.image = raster.photo_image(self.rgb, master=plotter.canvas)
+        return self.image
+    
+    def cache_bytes(self):
+        if self.field is None:
+            return 0
+        return self.field.nbytes + self.rgb.nbytes
+    
+    def drop_samples(self):
+        super().drop_samples()
+        self.field = None
+        self.field_key = None
+        self.rgb = None
+        self.image = None
+
+
+class PiecewiseCurve(Curve):
+    """A curve made of many (start, end, expression) pieces, kept in an interval index"""
+
+    kind = "piecewise"
+    single_valued = False
+
+    def __init__(self, pieces, name, color):
+        super().__init__(None, name, color)
+        self.pieces = [(float(start), float(end), expression) for start, end, expression in pieces]
+        self.starts = np.array([piece[0] for piece in self.pieces])
+        self.ends = np.array([piece[1] for piece in self.pieces])
+        self.index = intervals.IntervalIndex(self.starts, self.ends)
+        
+        # Pieces often repeat an expression (step profiles), so each text is compiled once
+        texts = {}
+        self.expression_ids = np.array([texts.setdefault(expression, len(texts)) for _, _, expression in self.pieces],
+                                       dtype=np.intp)
+        self.funcs = [expressions.compile_expression(text) for text in texts]
+    
+    def state(self):
+        return {"kind": self.kind, "pieces": [list(piece) for piece in self.pieces],
+                "name": self.name, "color": self.color}
+    
+    def cache_identity(self):
+        return {"kind": self.kind,
+                "pieces": [[start, end, expressions.normalize(text)] for start, end, text in self.pieces]}
+    
+    def sample_for(self, plotter):
+        """Sample only the pieces in view, each at one point per pixel, with NaN between pieces"""
+        x_min, x_max = plotter.x_range
+        width, _ = plotter.canvas_size()
+        key = (x_min, x_max, width, plotter.x_scale_type)
+        if self.sample_key == key:
+            return self.samples
+        
+        visible = self.index.overlapping(x_min, x_max)
+        if not visible.size:
+            self.samples = None
+            self.sample_key = key
+            return None
+        self.samples = self.load_samples(key)
+        if self.samples is not None:
+            self.sample_key = key
+            return self.samples
+        
+        # Clamp the pieces to the view and give each one point per pixel, plus a NaN separator
+        started = time.perf_counter()
+        scale = scales.get_scale(plotter.x_scale_type)
+        low = scale.forward(np.maximum(self.starts[visible], x_min))
+        high = scale.forward(np.minimum(self.ends[visible], x_max))
+        pixels = np.abs(plotter.to_canvas_x(scale.inverse(high)) - plotter.to_canvas_x(scale.inverse(low)))
+        counts = np.maximum(np.nan_to_num(pixels / self.stride).astype(int), 2)
+        
+        piece = np.repeat(np.arange(len(visible)), counts + 1)
+        position = np.arange(len(piece)) - np.repeat(np.cumsum(counts + 1) - (counts + 1), counts + 1)
+        separator = position == counts[piece]
+        t = np.minimum(position / (counts[piece] - 1), 1.0)
+        xs = scale.inverse(low[piece] + (high[piece] - low[piece]) * t)
+        
+        # Evaluate all points that share an expression in one vectorized call
+        ys = np.empty_like(xs)
+        expression_ids = self.expression_ids[visible][piece]
+        for expression_id in np.unique(expression_ids):
+            mask = expression_ids == expression_id
+            ys[mask] = evaluate_array(self.funcs[expression_id], x=xs[mask])
+        xs[separator] = np.nan
+        ys[separator] = np.nan
+        
+        self.samples = (xs, ys)
+        self.sample_key = key
+        self.store_samples(key, self.samples, started)
+        return self.samples
+
+
+def parse_pieces(text):
+    """Parse "start..end: expression; ..." into a list of (start, end, expression) pieces"""
+    pieces = []
+    for part in text.split(";"):
+        if not part.strip():
+            continue
+        domain, separator, expression = part.partition(":")
+        start, dots, end = domain.partition("..")
+        if not separator or not dots or not expression.strip():
+            raise ValueError(f"expected 'start..end: expression', got '{part.strip()}'")
+        start, end = float(start), float(end)
+        if end <= start:
+            raise ValueError(f"piece '{part.strip()}' ends before it starts")
+        pieces.append((start, end, expression.strip()))
+    if not pieces:
+        raise ValueError("no pieces given")
+    return pieces
+
+
+class FamilyCurve(Curve):
+    """f(x, a) for many values of a parameter, drawn as lines, a decimated subset or a density image"""
+
+    kind = "family"
+    single_valued = False
+    max_lines = 50  # Above this many members "auto" switches to density rendering
+
+    def __init__(self, expression, name, color, parameter="a", values=(0.0, 1.0), count=100, colormap="viridis",
+                 mode="auto"):
+        super().__init__(expressions.compile_expression(expression, ("x", parameter)), name, color,
+                         expression=expression)
+        self.parameter = parameter
+        self.values = tuple(values)
+        self.count = count
+        self.colormap = colormap
+        self.mode = mode  # "auto", "lines", "decimated" or "density"
+        self.rgb = None
+        self.image = None
+        self.image_key = None
+    
+    def state(self):
+        return {"kind": self.kind, "expression": self.expression, "name": self.name, "color": self.color,
+                "parameter": self.parameter, "values": list(self.values), "count": self.count,
+                "colormap": self.colormap, "mode": self.mode}
+    
+    def render_mode(self):
+        if self.mode == "auto":
+            return "lines" if self.count <= self.max_lines else "density"
+        return self.mode
+    
+    def members(self):
+        """Indices of the members drawn as lines"""
+        if self.render_mode() == "decimated" and self.count > self.max_lines:
+            return np.unique(np.linspace(0, self.count - 1, self.max_lines).round().astype(int))
+        return np.arange(self.count)
+    
+    def member_colors(self):
+        lut = raster.colormap_lut(self.colormap, max(self.count, 2))
+        return ["#%02x%02x%02x" % tuple(rgb) for rgb in lut[:self.count].tolist()]
+    
+    def sample_for(self, plotter):
+        """Sample every member at one point per pixel in one broadcast call, members back to back with NaN between"""
+        x_min, x_max = plotter.x_range
+        width, _ = plotter.canvas_size()
+        num_points = max(int(width / self.stride), 2)
+        key = (x_min, x_max, num_points, plotter.x_scale_type)
+        if self.samples is None or self.sample_key != key:
+            self.samples = self.load_samples(key)
+            if self.samples is None:
+                started = time.perf_counter()
+                xs = scales.get_scale(plotter.x_scale_type).grid(x_min, x_max, num_points)
+                parameter_values = np.linspace(self.values[0], self.values[1], self.count)
+                ys = evaluate_array(self.func, x=xs[np.newaxis, :], **{self.parameter: parameter_values[:, np.newaxis]})
+                gap = np.full((self.count, 1), np.nan)
+                self.samples = (np.hstack((np.tile(xs, (self.count, 1)), gap)).ravel(), np.hstack((ys, gap)).ravel())
+                self.store_samples(key, self.samples, started)
+            self.sample_key = key
+        return self.samples
+    
+    def rows(self):
+        """Cached samples as (xs, ys rows), one row per member"""
+        xs, ys = self.samples
+        ys = ys.reshape(self.count, -1)[:, :-1]
+        return xs[:ys.shape[1]], ys
+    
+    def image_for(self, plotter):
+        """Density image: per pixel, how many members pass through it, on a log color scale"""
+        width, height = plotter.canvas_size()
+        key = (self.sample_key, *plotter.y_range, width, height, plotter.y_scale_type)
+        if self.image is not None and self.image_key == key:
+            return self.image
+        
+        xs, ys = self.rows()
+        columns = np.rint(plotter.to_canvas_x(xs)).astype(int)
+        canvas_y = plotter.to_canvas_y(ys)
+        
+        # Each member covers a vertical span in each column, from its y there to its y in the next column
+        low = np.fmin(canvas_y[:, :-1], canvas_y[:, 1:])
+        high = np.fmax(canvas_y[:, :-1], canvas_y[:, 1:])
+        with np.errstate(invalid="ignore"):
+            shown = np.isfinite(low) & np.isfinite(high) & (high >= 0) & (low < height)
+        column = np.broadcast_to(columns[:-1], low.shape)[shown]
+        inside = (column >= 0) & (column < width)
+        column = column[inside]
+        low = np.clip(np.floor(low[shown][inside]), 0, height - 1).astype(int)
+        high = np.clip(np.ceil(high[shown][inside]), 0, height - 1).astype(int)
+        
+        # Count spans with a difference array: +1 where a span starts, -1 just past its end
+        counts = np.zeros((height + 1, width))
+        np.add.at(counts, (low, column), 1)
+        np.add.at(counts, (high + 1, column), -1)
+        counts = np.cumsum(counts, axis=0)[:height]
+        
+        density = np.where(counts > 0, np.log1p(counts), np.nan)
+        self.rgb = raster.apply_colormap(density, raster.colormap_lut(self.colormap))
+        self.image = raster.photo_image(self.rgb, master=plotter.canvas)
+        self.image_key = key
+        return self.image
+    
+    def cache_bytes(self):
+        return super().cache_bytes() + (self.rgb.nbytes if self.rgb is not None else 0)
+    
+    def drop_samples(self):
+        super().drop_samples()
+        self.rgb = None
+        self.image = None
+        self.image_key = None
+
+
+def parse_family(text):
+    """Parse "f(x, a); a=start..end; count" into (expression, parameter, (start, end), count)"""
+    parts = [part.strip() for part in text.split(";")]
+    if len(parts) not in (2, 3) or "=" not in parts[1] or ".." not in parts[1]:
+        raise ValueError("expected 'f(x, a); a=start..end; count'")
+    parameter, _, span = parts[1].partition("=")
+    start, _, end = span.partition("..")
+    count = int(parts[2]) if len(parts) == 3 else 100
+    if count < 1:
+        raise ValueError("a family needs at least one member")
+    return parts[0], parameter.strip(), (float(start), float(end)), count
+
+
+class DerivedCurve(Curve):
+    """The derivative or running integral of another curve, computed from that curve's samples"""
+
+    anchor_points = 4096  # Points of the grid the integral from 0 to the left edge of the view is taken on
+
+    def __init__(self, parent, kind, name=None, color=None):
+        super().__init__(None, name or (f"{parent.name}'" if kind == "derivative" else f"∫{parent.name}"),
+                         color or parent.color, parent.start_time, parent.end_time)
+        self.kind = kind  # "derivative" or "integral"
+        self.parent = parent
+        self.parent_samples = None  # The parent's samples this curve was last computed from
+    
+    def state(self):
+        if self.parent.state() is None:
+            return None
+        return {"kind": self.kind, "parent": self.parent.key, "name": self.name, "color": self.color}
+    
+    def cache_identity(self):
+        return None
+    
+    def sample_for(self, plotter):
+        """Recompute from the parent's samples, but only when the parent resampled"""
+        parent_samples = plotter.sample_curve(self.parent)
+        if parent_samples is None:
+            return None
+        if self.samples is not None and self.parent_samples is parent_samples:
+            return self.samples
+        
+        xs, ys = parent_samples
+        if len(xs) < 2:
+            return None
+        self.samples = (xs, self.derive(xs, ys))
+        self.sample_key = self.parent.sample_key
+        self.parent_samples = parent_samples
+        return self.samples
+    
+    def evaluate_grid(self, xs):
+        return self.derive(xs, self.parent.evaluate_grid(xs))
+    
+    def derive(self, xs, ys):
+        """Derivative or integral of the parent's values ys over xs; the integral is always zero at x = 0"""
+        if self.kind == "derivative":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.gradient(ys, xs)
+        values = self.running_integral(xs, ys)
+        if xs[0] <= 0 <= xs[-1]:
+            values -= np.interp(0.0, xs, values)
+        else:
+            values += self.integral_to(xs[0])
+        values[~np.isfinite(ys)] = np.nan
+        return values
+    
+    def running_integral(self, xs, ys):
+        # Trapezoids over undefined stretches count as zero
+        areas = np.nan_to_num((ys[1:] + ys[:-1]) / 2 * np.diff(xs), nan=0.0, posinf=0.0, neginf=0.0)
+        return np.concatenate(([0.0], np.cumsum(areas)))
+    
+    def integral_to(self, x):
+        """Integral of the parent from 0 to x, evaluated on its own grid so panning does not shift the curve"""
+        xs = np.linspace(0.0, x, self.anchor_points)
+        ys = self.parent.evaluate_grid(xs)
+        outside = np.zeros(len(xs), dtype=bool)
+        if self.start_time is not None:
+            outside |= xs < self.start_time
+        if self.end_time is not None:
+            outside |= xs > self.end_time
+        ys[outside] = np.nan
+        return self.running_integral(xs, ys)[-1]
+    
+    def drop_samples(self):
+        super().drop_samples()
+        self.parent_samples = None
+
+
+def curve_from_state(entry, curves=None):
+    """Rebuild a curve from its state() dict; derived curves find their parent in curves by saved key"""
+    kind = entry.get("kind", "function")
+    if kind in ("derivative", "integral"):
+        return DerivedCurve(curves[entry["parent"]], kind, entry["name"], entry["color"])
+    if kind == "parametric":
+        return ParametricCurve(entry["x_expression"], entry["y_expression"], entry["name"], entry["color"],
+                               entry["t_range"])
+    if kind == "polar":
+        return PolarCurve(entry["r_expression"], entry["name"], entry["color"], entry["t_range"])
+    if kind == "implicit":
+        return ImplicitCurve(entry["expression"], entry["name"], entry["color"])
+    if kind == "piecewise":
+        return PiecewiseCurve(entry["pieces"], entry["name"], entry["color"])
+    if kind == "family":
+        return FamilyCurve(entry["expression"], entry["name"], entry["color"], entry["parameter"], entry["values"],
+                           entry["count"], entry["colormap"], entry["mode"])
+    if kind == "heatmap":
+        return HeatmapCurve(entry["expression"], entry["name"], entry["color"], entry["colormap"], entry["levels"])
+    parameters = entry.get("parameters") or {}
+    return Curve(expressions.compile_expression(entry["expression"], ("x", *parameters)), entry["name"],
+                 entry["color"], entry["start_time"], entry["end_time"], entry["start_value"], entry["end_value"],
+                 expression=entry["expression"], parameters=parameters)
+
 
 class FunctionPlotter(tk.Frame):
+    hover_interval = 16  # Milliseconds between crosshair updates while the pointer moves
+    scrub_interval = 16  # Milliseconds between redraws while a parameter slider is dragged
+    feature_colors = {"root": "black", "min": "blue", "max": "red", "intersection": "purple"}
+    
     def __init__(self, master=None, app=None, width=400, height=300, x_range=(-10, 10), y_range=(-10, 10), title="Function Plot", **kwargs):
         super().__init__(master, **kwargs)
         self.app = app
@@ -13,8 +799,31 @@ class FunctionPlotter(tk.Frame):
         self.x_range = x_range
         self.y_range = y_range
         self.title = title
-        self.curves = []  # List to store multiple curves (function, name, color)
+        self.curves = []  # List of Curve objects
         self.grid_spacing = 1  # Distance between grid lines
+        self.y_grid_spacing = None  # Separate y grid spacing picked by autoscale
+        self.autoscale = False  # Fit y_range to the sampled data on every render
+        self.autoscale_percentile = None  # Clip this percentage off both ends when fitting
+        self.x_scale_type = "linear"  # Name of the axis scale in scales.SCALES
+        self.y_scale_type = "linear"
+        self.item_count = 0  # Canvas items after the last full render
+        self.frozen = False  # True while the plot is shown as a static image
+        self.frozen_image = None
+        self.lazy = False  # Only render once scrolled into view
+        self.pointer = None  # Last (x, y) of the pointer over the canvas, None when it is outside
+        self.hover_job = None
+        self.crosshair_items = None  # (line, x label, [(marker, label) per curve]) once created
+        self.show_features = False  # Mark roots, extrema and intersections
+        self.feature_index = None  # features.FeatureIndex, created when features are first shown
+        self.visible_features = []  # (x, y, kind, description) of the features in view
+        self.curve_items = {}  # Curve key -> its line items from the last render
+        self.scrubbed = {}  # Curve key -> curve whose parameters changed since the last redraw
+        self.scrub_job = None
+        self.hit_index = None  # spatial.SegmentGrid of the drawn curve segments, one layer per curve
+        self.highlighted = None  # Key of the curve picked by clicking on it
+        self.hover_hit = False  # Whether the pointer is over a curve
+        self.link = None  # LinkGroup whose ranges this plotter follows
+        self.minimap = None  # Minimap strip under the canvas, when shown
         self.init_ui()
         
         # Create a unique ID for this plotter
@@ -41,21 +850,18 @@ class FunctionPlotter(tk.Frame):
         self.canvas = tk.Canvas(self, width=self.width, height=self.height, bg="white")
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.canvas.bind("<Configure>", self.resize)
+        self.canvas.bind("<Enter>", self.on_interact)
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Leave>", self.on_leave)
         # Border for selection
         self.configure(relief=tk.GROOVE, borderwidth=1)
         
         # Initial plot with empty axes
-        self.draw_grid()
+        self.update_plot()
     
-    def find_app(self, widget):
-        while widget is not None:
-            if hasattr(widget, 'select_plotter'):
-                return widget
-            widget = widget.master
-        return None
-
     def on_select_changed(self):
-        app = self.find_app(self)
+        app = self.app
         if app is not None:
             is_selected = self.selected_var.get()
             if is_selected:
@@ -64,6 +870,111 @@ class FunctionPlotter(tk.Frame):
                 if app.selected_plotter == self:
                     self.selected_var.set(True)
     
+    def on_interact(self, event=None):
+        """Mark the plotter as recently used and bring a frozen plot back to life"""
+        if self.app is not None:
+            self.app.budget.touch(self)
+        self.thaw()
+    
+    def on_click(self, event):
+        """Pick the curve under the pointer, or drop the pick when clicking next to all curves"""
+        self.on_interact(event)
+        hit = self.hit_test(event.x, event.y)
+        self.highlight(hit[0] if hit else None)
+    
+    def hit_test(self, x, y, radius=6):
+        """Return (curve, sample index) of the drawn curve nearest to canvas point (x, y), or None"""
+        if self.hit_index is None:
+            return None
+        nearest = self.hit_index.nearest(x, y, radius)
+        if nearest is None:
+            return None
+        curves = {curve.key: curve for curve in self.curves}
+        return (curves[nearest[0]], nearest[1]) if nearest[0] in curves else None
+    
+    def highlight(self, curve):
+        """Draw one curve thicker; only the lines of the old and new picks are restyled"""
+        key = curve.key if curve is not None else None
+        if key == self.highlighted:
+            return
+        for item in self.curve_items.get(self.highlighted, ()):
+            self.canvas.itemconfig(item, width=2)
+        self.highlighted = key
+        for item in self.curve_items.get(key, ()):
+            self.canvas.itemconfig(item, width=4)
+            self.canvas.tag_raise(item)
+    
+    def on_motion(self, event):
+        """Remember the pointer and update the crosshair at most once per hover interval"""
+        self.pointer = (event.x, event.y)
+        if self.hover_job is None:
+            self.hover_job = self.after(self.hover_interval, self.update_crosshair)
+    
+    def on_leave(self, event=None):
+        self.pointer = None
+        if self.hover_job is not None:
+            self.after_cancel(self.hover_job)
+            self.hover_job = None
+        self.canvas.delete("crosshair")
+        self.crosshair_items = None
+    
+    def value_at(self, curve, x):
+        """Interpolate a function curve at x from its cached samples, without evaluating it"""
+        if not curve.single_valued or curve.samples is None:
+            return math.nan
+        xs, ys = curve.samples
+        if not xs[0] <= x <= xs[-1]:
+            return math.nan
+        i = min(max(int(np.searchsorted(xs, x, side="right")), 1), len(xs) - 1)
+        x0, x1 = xs[i - 1], xs[i]
+        t = (x - x0) / (x1 - x0) if x1 > x0 else 0.0
+        return float(ys[i - 1] + (ys[i] - ys[i - 1]) * t)
+    
+    def update_crosshair(self):
+        """Move the crosshair and its readouts to the pointer; only the overlay items are touched"""
+        self.hover_job = None
+        if self.pointer is None:
+            return
+        px, py = self.pointer
+        width, height = self.canvas_size()
+        x = float(self.from_canvas_x(px))
+        
+        # Show that a click here would pick a curve
+        hover_hit = self.hit_test(px, py) is not None
+        if hover_hit != self.hover_hit:
+            self.hover_hit = hover_hit
+            self.canvas.config(cursor="hand2" if hover_hit else "")
+        curves = [curve for curve in self.curves if curve.single_valued]
+        
+        # Overlay items are reused; they are only rebuilt after a render or when the curves change
+        if self.crosshair_items is None or len(self.crosshair_items[2]) != len(curves):
+            self.canvas.delete("crosshair")
+            line = self.canvas.create_line(0, 0, 0, 0, fill="#888888", dash=(3, 3), tags="crosshair")
+            label = self.canvas.create_text(0, 0, fill="black", tags="crosshair")
+            markers = [(self.canvas.create_oval(0, 0, 0, 0, tags="crosshair"),
+                        self.canvas.create_text(0, 0, tags="crosshair")) for _ in curves]
+            self.crosshair_items = (line, label, markers)
+        line, label, markers = self.crosshair_items
+        
+        # Readouts sit beside the line, on whichever side has room
+        anchor, text_x = (tk.NE, px - 5) if px > width * 0.7 else (tk.NW, px + 5)
+        self.canvas.coords(line, px, 0, px, height)
+        self.canvas.coords(label, text_x, 5)
+        self.canvas.itemconfig(label, text=f"x = {self.axis_scales()[0].readout(x)}", anchor=anchor)
+        
+        y_min, y_max = self.y_range
+        for i, (curve, (marker, text)) in enumerate(zip(curves, markers)):
+            y = self.value_at(curve, x)
+            shown = math.isfinite(y) and y_min <= y <= y_max and math.isfinite(self.to_canvas_y(y))
+            if shown:
+                canvas_y = float(self.to_canvas_y(y))
+                self.canvas.coords(marker, px - 3, canvas_y - 3, px + 3, canvas_y + 3)
+            self.canvas.itemconfig(marker, fill=curve.color, outline=curve.color,
+                                   state=tk.NORMAL if shown else tk.HIDDEN)
+            self.canvas.coords(text, text_x, 22 + 15 * i)
+            value = f"{y:.4g}" if math.isfinite(y) else "–"
+            self.canvas.itemconfig(text, text=f"{curve.name}: {value}", fill=curve.color, anchor=anchor)
+    
     def set_selected(self, is_selected):
         self.selected_var.set(is_selected)
         self.configure(
@@ -72,71 +983,219 @@ class FunctionPlotter(tk.Frame):
         )
         
     def draw_grid(self):
-        self.canvas.delete("all")  # Clear canvas
-        
+        """Redraw the whole plot in one go"""
+        for _ in self.render_slices():
+            pass
+
+    def canvas_size(self):
         width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
         # If canvas hasn't been drawn yet, use the initial values
         if width <= 1:
             width, height = self.width, self.height
+        return width, height
+    
+    def axis_scales(self):
+        return scales.get_scale(self.x_scale_type), scales.get_scale(self.y_scale_type)
+    
+    def to_canvas_x(self, values):
+        """Map x values (scalar or array) to canvas pixels through the x scale"""
+        width, _ = self.canvas_size()
+        scale = scales.get_scale(self.x_scale_type)
+        low, high = scale.forward(self.x_range)
+        return (scale.forward(values) - low) * (width / (high - low))
+    
+    def to_canvas_y(self, values):
+        """Map y values (scalar or array) to canvas pixels through the y scale"""
+        _, height = self.canvas_size()
+        scale = scales.get_scale(self.y_scale_type)
+        low, high = scale.forward(self.y_range)
+        return height - (scale.forward(values) - low) * (height / (high - low))  # Invert y-coordinate
+    
+    def from_canvas_x(self, pixels):
+        """Map canvas pixels back to x values"""
+        width, _ = self.canvas_size()
+        scale = scales.get_scale(self.x_scale_type)
+        low, high = scale.forward(self.x_range)
+        return scale.inverse(low + np.asarray(pixels, dtype=float) * ((high - low) / width))
+    
+    def from_canvas_y(self, pixels):
+        """Map canvas pixels back to y values"""
+        _, height = self.canvas_size()
+        scale = scales.get_scale(self.y_scale_type)
+        low, high = scale.forward(self.y_range)
+        return scale.inverse(low + (height - np.asarray(pixels, dtype=float)) * ((high - low) / height))
+    
+    def render_slices(self):
+        """Redraw the plot step by step, yielding after the grid and after each curve"""
+        # With autoscale the samples are needed before the grid can be drawn
+        if self.autoscale:
+            fitted = []
+            for curve in self.curves:
+                if curve.traced_in_view:
+                    continue
+                samples = self.sample_curve(curve)
+                if samples is not None:
+                    fitted.append(samples[1])
+                yield
+            self.fit_y_range(fitted)
+            for curve in self.curves:
+                curve.follow_y_range(self)
+        
+        self.canvas.delete("all")  # Clear canvas
+        self.frozen_image = None
+        self.crosshair_items = None
+        self.curve_items = {}
+        if self.hit_index is not None:
+            self.hit_index.clear()
+        
+        width, height = self.canvas_size()
         
         # Draw grid lines
         x_min, x_max = self.x_range
         y_min, y_max = self.y_range
-        
-        # Calculate pixel per unit
-        x_scale = width / (x_max - x_min)
-        y_scale = height / (y_max - y_min)
+        x_axis_scale, y_axis_scale = self.axis_scales()
         
         # Vertical grid lines (x-axis)
-        x = x_min
-        while x <= x_max:
-            canvas_x = (x - x_min) * x_scale
+        x_spacing = x_axis_scale.tick_spacing(x_min, x_max, self.grid_spacing)
+        x_major, x_minor = x_axis_scale.ticks(x_min, x_max, x_spacing)
+        for canvas_x in self.to_canvas_x(x_minor):
+            self.canvas.create_line(canvas_x, 0, canvas_x, height, fill="#F0F0F0", dash=(2, 4))
+        for x, canvas_x in zip(x_major, self.to_canvas_x(x_major)):
+            is_zero = abs(x) < x_spacing * 0.01
             # Draw light gray grid lines
-            if abs(x) > 0.01:  # Not the y-axis
+            if not is_zero:  # Not the y-axis
                 self.canvas.create_line(canvas_x, 0, canvas_x, height, fill="#E0E0E0", dash=(2, 4))
             # Draw x-axis labels
-            if abs(x) >= self.grid_spacing or abs(x) < 0.01:
-                self.canvas.create_text(canvas_x, height - 10, text=str(round(x, 1)), fill="gray")
-            x += self.grid_spacing
+            if x_axis_scale.name != "linear" or abs(x) >= x_spacing * 0.99 or is_zero:
+                label = x_axis_scale.label(0.0 if is_zero else x, x_spacing)
+                self.canvas.create_text(canvas_x, height - 10, text=label, fill="gray")
         
         # Horizontal grid lines (y-axis)
-        y = y_min
-        while y <= y_max:
-            canvas_y = height - (y - y_min) * y_scale  # Invert y-coordinate
+        y_spacing = y_axis_scale.tick_spacing(y_min, y_max, self.y_grid_spacing or self.grid_spacing)
+        y_major, y_minor = y_axis_scale.ticks(y_min, y_max, y_spacing)
+        for canvas_y in self.to_canvas_y(y_minor):
+            self.canvas.create_line(0, canvas_y, width, canvas_y, fill="#F0F0F0", dash=(2, 4))
+        for y, canvas_y in zip(y_major, self.to_canvas_y(y_major)):
+            is_zero = abs(y) < y_spacing * 0.01
             # Draw light gray grid lines
-            if abs(y) > 0.01:  # Not the x-axis
+            if not is_zero:  # Not the x-axis
                 self.canvas.create_line(0, canvas_y, width, canvas_y, fill="#E0E0E0", dash=(2, 4))
             # Draw y-axis labels
-            if abs(y) >= self.grid_spacing or abs(y) < 0.01:
-                self.canvas.create_text(10, canvas_y, text=str(round(y, 1)), fill="gray", anchor=tk.W)
-            y += self.grid_spacing
+            if y_axis_scale.name != "linear" or abs(y) >= y_spacing * 0.99 or is_zero:
+                label = y_axis_scale.label(0.0 if is_zero else y, y_spacing)
+                self.canvas.create_text(10, canvas_y, text=label, fill="gray", anchor=tk.W)
         
         # Draw x-axis
         if y_min <= 0 <= y_max:
-            y_axis_pos = height - (0 - y_min) * y_scale
+            y_axis_pos = self.to_canvas_y(0.0)
             self.canvas.create_line(0, y_axis_pos, width, y_axis_pos, fill="black", width=2)
             self.canvas.create_text(width - 20, y_axis_pos - 10, text="x", fill="black")
         
         # Draw y-axis
         if x_min <= 0 <= x_max:
-            x_axis_pos = (0 - x_min) * x_scale
+            x_axis_pos = self.to_canvas_x(0.0)
             self.canvas.create_line(x_axis_pos, 0, x_axis_pos, height, fill="black", width=2)
             self.canvas.create_text(x_axis_pos + 10, 20, text="y", fill="black")
+        yield
         
         # Draw all existing curves
-        for curve_data in self.curves:
-            # Unpack all parameters (handling both old and new format)
-            if len(curve_data) == 3:
-                func, name, color = curve_data
-                start_time = end_time = start_value = end_value = None
-            else:
-                func, name, color, start_time, end_time, start_value, end_value = curve_data
-            
-            self.plot_function(func, name, color, start_time, end_time, start_value, end_value)
+        for curve in self.curves:
+            self.plot_curve(curve)
+            yield
+        
+        if self.show_features:
+            self.draw_features()
+            yield
         
         # Draw legend
         self.draw_legend()
+        self.item_count = len(self.canvas.find_all())
+        if self.minimap is not None:
+            self.minimap.refresh()
+        
+        # The crosshair went with the rest of the canvas; bring it back if the pointer is still here
+        if self.pointer is not None and self.hover_job is None:
+            self.hover_job = self.after(self.hover_interval, self.update_crosshair)
 
+    def draw_features(self):
+        """Mark roots, extrema and intersections in view, solving only x ranges not searched before"""
+        if self.feature_index is None:
+            self.feature_index = features.FeatureIndex()
+        index = self.feature_index
+        x_min, x_max = self.x_range
+        y_min, y_max = self.y_range
+        
+        # Refinement calls the functions at single points, in the watchdog worker for typed expressions
+        curves = [curve for curve in self.curves
+                  if curve.kind == "function" and curve.samples is not None and not curve.too_slow]
+        search = watchdog.shared().call
+        found = []
+        for curve in list(curves):
+            xs, ys = curve.samples
+            # Zooming in samples more finely, which can reveal features a coarser search missed
+            step = (xs[-1] - xs[0]) / max(len(xs) - 1, 1)
+            try:
+                for low, high in index.missing((curve.key,), x_min, x_max, step):
+                    index.add((curve.key,), low, high, step,
+                              search(features.roots_and_extrema, xs, ys, curve.scalar_function(), low, high))
+            except watchdog.EvaluationTimeout:
+                self.mark_slow(curve)
+                curves.remove(curve)
+                continue
+            except Exception as e:
+                self.mark_failed(curve, e)
+                curves.remove(curve)
+                continue
+            found.extend((x, y, kind, f"{kind} of {curve.name}")
+                         for x, y, kind in index.query((curve.key,), x_min, x_max))
+        
+        for i, curve in enumerate(curves):
+            xs, ys = curve.samples
+            step = (xs[-1] - xs[0]) / max(len(xs) - 1, 1)
+            for other in curves[i + 1:]:
+                key = (curve.key, other.key)
+                for low, high in index.missing(key, x_min, x_max, step):
+                    try:
+                        found_here = search(features.intersections, curve.samples, other.samples,
+                                            curve.scalar_function(), other.scalar_function(), low, high)
+                    except Exception:
+                        # Both functions passed their own search, so the range is left without intersections
+                        # rather than searched again on every render
+                        found_here = []
+                    index.add(key, low, high, step, found_here)
+                found.extend((x, y, kind, f"{curve.name} meets {other.name}")
+                             for x, y, kind in index.query(key, x_min, x_max))
+        
+        found = [feature for feature in found if y_min <= feature[1] <= y_max]
+        found.sort()
+        canvas_xs = self.to_canvas_x([feature[0] for feature in found])
+        canvas_ys = self.to_canvas_y([feature[1] for feature in found])
+        for (x, y, kind, _), canvas_x, canvas_y in zip(found, canvas_xs, canvas_ys):
+            self.canvas.create_oval(canvas_x - 4, canvas_y - 4, canvas_x + 4, canvas_y + 4,
+                                    outline=self.feature_colors[kind], width=2, tags="feature")
+        
+        if found != self.visible_features:
+            self.visible_features = found
+            self.notify("features")
+    
+    def set_show_features(self, enabled):
+        """Turn the root, extremum and intersection markers on or off"""
+        self.show_features = enabled
+        if not enabled and self.visible_features:
+            self.visible_features = []
+            self.notify("features")
+        self.update_plot()
+    
+    def set_show_minimap(self, enabled):
+        """Show or hide the overview strip under the canvas"""
+        if enabled and self.minimap is None:
+            self.minimap = Minimap(self)
+            self.minimap.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=(0, 5), before=self.canvas)
+        elif not enabled and self.minimap is not None:
+            self.minimap.destroy()
+            self.minimap = None
+        self.notify("config")
+    
     def draw_legend(self):
         if not self.curves:
             return
@@ -153,74 +1212,200 @@ class FunctionPlotter(tk.Frame):
                                      fill="white", outline="gray")
         
         # Draw legend entries
-        for i, (_, name, color) in enumerate(self.curves):
+        for i, curve in enumerate(self.curves):
             y_pos = legend_y + 10 + i * 20
             # Draw line sample
-            self.canvas.create_line(legend_x + 10, y_pos, legend_x + 30, y_pos, fill=color, width=2)
+            self.canvas.create_line(legend_x + 10, y_pos, legend_x + 30, y_pos, fill=curve.color, width=2)
             # Draw curve name
-            self.canvas.create_text(legend_x + 40, y_pos, text=name, fill="black", anchor=tk.W)
+            self.canvas.create_text(legend_x + 40, y_pos, text=curve.name, fill="black", anchor=tk.W)
     
-    def plot_function(self, func, name, color, start_time=None, end_time=None, start_value=None, end_value=None):
-        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
-        if width <= 1:
-            width, height = self.width, self.height
-            
+    def show_render_error(self, error):
+        """Leave a note on the canvas when a render failed part way through"""
+        width, height = self.canvas_size()
+        self.canvas.delete("render_error")
+        self.canvas.create_text(width / 2, height / 2, text=f"Render failed: {type(error).__name__}: {error}",
+                                fill="red", width=max(width - 20, 50), tags="render_error")
+    
+    def sample_curve(self, curve):
+        """Return the curve's (xs, ys) samples for the current view, or None if it is offscreen or skipped"""
+        if curve.skipped:
+            return None
+        try:
+            curve.recall_slow()
+            return curve.sample_for(self)
+        except watchdog.EvaluationTimeout:
+            self.mark_slow(curve)
+            return None
+        except Exception as e:
+            self.mark_failed(curve, e)
+            return None
+    
+    def mark_slow(self, curve):
+        """Step a curve that ran over its time budget down to fewer samples, and then to being skipped"""
+        curve.drop_samples()
+        if curve.too_slow:
+            curve.skipped = True
+        else:
+            curve.remember_slow()
+        curve.too_slow = True
+        self.notify("curves")
+        if not curve.skipped:
+            # Try again with fewer samples on a later frame; this one already spent the whole budget
+            self.after_idle(self.update_plot)
+    
+    def mark_failed(self, curve, error):
+        """Skip a curve whose evaluation raised; it would only fail again on every render"""
+        curve.drop_samples()
+        curve.error = f"{type(error).__name__}: {error}"
+        curve.skipped = True
+        self.notify("curves")
+    
+    def plot_curve(self, curve):
+        if curve.kind == "heatmap":
+            self.draw_field(curve)
+            return
+        if curve.kind == "family":
+            self.draw_family(curve)
+            return
+        
+        samples = self.sample_curve(curve)
+        if samples is None:
+            return
+        xs, ys = samples
         x_min, x_max = self.x_range
         y_min, y_max = self.y_range
         
-        # Apply time range constraints if provided
-        x_start = start_time if start_time is not None else x_min
-        x_end = end_time if end_time is not None else x_max
+        canvas_x = self.to_canvas_x(xs)
+        canvas_y = self.to_canvas_y(ys)
+        
+        # Points outside the ranges, discontinuities (NaN) and values the scale cannot show split the curve
+        with np.errstate(invalid="ignore"):
+            visible = ((xs >= x_min) & (xs <= x_max) & (ys >= y_min) & (ys <= y_max)
+                       & np.isfinite(canvas_x) & np.isfinite(canvas_y))
+        self.curve_items[curve.key] = self.draw_segments(canvas_x, canvas_y, visible, curve.color,
+                                                         self.curve_items.get(curve.key, ()),
+                                                         width=4 if curve.key == self.highlighted else 2)
+        
+        # Keep the hit-test layer of this curve in step with what was just drawn
+        if self.hit_index is None:
+            self.hit_index = spatial.SegmentGrid()
+        self.hit_index.set_layer(curve.key, canvas_x, canvas_y, visible)
+    
+    def draw_family(self, curve):
+        """Draw a curve family as colored member lines, or as a density image when it is large"""
+        if self.sample_curve(curve) is None:
+            return
+        if curve.render_mode() == "density":
+            self.draw_field(curve)
+            return
         
-        # Ensure we're within the visible range
-        x_start = max(x_start, x_min)
-        x_end = min(x_end, x_max)
+        xs, ys = curve.rows()
+        canvas_x = self.to_canvas_x(xs)
+        canvas_ys = self.to_canvas_y(ys)
+        y_min, y_max = self.y_range
+        with np.errstate(invalid="ignore"):
+            visible = (ys >= y_min) & (ys <= y_max) & np.isfinite(canvas_ys)
+        colors = curve.member_colors()
+        for i in curve.members():
+            self.draw_segments(canvas_x, canvas_ys[i], visible[i], colors[i])
+    
+    def draw_field(self, curve):
+        """Show a heatmap or density image under the grid, above any earlier ones"""
+        if curve.skipped:
+            return
+        try:
+            curve.recall_slow()
+            image = curve.image_for(self)
+        except watchdog.EvaluationTimeout:
+            self.mark_slow(curve)
+            return
+        except Exception as e:
+            self.mark_failed(curve, e)
+            return
+        item = self.canvas.create_image(0, 0, image=image, anchor=tk.NW, tags=("field", curve.key))
+        fields = self.canvas.find_withtag("field")
+        if len(fields) > 1:
+            self.canvas.tag_raise(item, fields[-2])
+        else:
+            self.canvas.tag_lower(item)
+    
+    def fit_y_range(self, arrays):
+        """Fit y_range and its grid spacing to the y samples taken for the current view"""
+        ys = np.concatenate(arrays) if arrays else np.empty(0)
+        ys = ys[np.isfinite(ys)]
+        if self.y_scale_type == "log":
+            ys = ys[ys > 0]
+        if not ys.size:
+            # Nothing to fit to, but a log axis still needs a range it can show
+            if not self.axis_scales()[1].valid_range(*self.y_range):
+                self.y_range = (0.1, 10.0)
+                self.notify("config")
+            return
         
-        # Calculate pixel per unit
-        x_scale = width / (x_max - x_min)
-        y_scale = height / (y_max - y_min)
+        if self.autoscale_percentile:
+            y_low, y_high = np.percentile(ys, [self.autoscale_percentile, 100 - self.autoscale_percentile])
+        else:
+            y_low, y_high = ys.min(), ys.max()
+        y_low, y_high = float(y_low), float(y_high)
+        
+        # Log axes are fitted to whole decades
+        if self.y_scale_type == "log":
+            y_range = (10.0 ** math.floor(math.log10(y_low)), 10.0 ** math.ceil(math.log10(y_high)))
+            if y_range[0] == y_range[1]:
+                y_range = (y_range[0], y_range[1] * 10)
+            if y_range != tuple(self.y_range):
+                self.y_range = y_range
+                self.notify("config")
+            return
         
-        # Number of points to plot
-        num_points = int((x_end - x_start) / (x_max - x_min) * width)
-        num_points = max(num_points, 2)  # Ensure at least 2 points
+        # Give flat curves some room around them
+        if y_high - y_low <= abs(y_high) * 1e-12:
+            pad = abs(y_high) * 0.5 or 1.0
+            y_low, y_high = y_low - pad, y_high + pad
         
-        points = []
-        for i in range(num_points):
-            x = x_start + (x_end - x_start) * i / (num_points - 1)
-            
-            # Handle start and end point values if specified
-            if i == 0 and start_value is not None:
-                y = start_value
-            elif i == num_points - 1 and end_value is not None:
-                y = end_value
+        spacing = ticks.nice_step(y_high - y_low)
+        y_range = ticks.nice_bounds(y_low, y_high, spacing)
+        if y_range != tuple(self.y_range) or spacing != self.y_grid_spacing:
+            self.y_range = y_range
+            self.y_grid_spacing = spacing
+            self.notify("config")
+    
+    def set_scales(self, x_scale_type=None, y_scale_type=None):
+        """Switch the x and/or y axis between linear, log, symlog and (x only) time scales"""
+        if x_scale_type is not None:
+            self.x_scale_type = x_scale_type
+        if y_scale_type is not None:
+            self.y_scale_type = y_scale_type
+        self.update_plot()
+        self.notify("config")
+    
+    def set_autoscale(self, enabled, percentile=None):
+        """Turn y autoscale on or off, optionally clipping a percentage of outliers at both ends"""
+        self.autoscale = enabled
+        self.autoscale_percentile = percentile
+        if not enabled:
+            self.y_grid_spacing = None
+        self.update_plot()
+        self.notify("config")
+    
+    def draw_segments(self, canvas_x, canvas_y, visible, color, items=(), width=2):
+        """Draw one line per run of visible points, moving existing items with coords, and return the line items"""
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], visible, [False])).astype(np.int8)))
+        runs = [(start, end) for start, end in zip(edges[::2], edges[1::2]) if end - start >= 2]
+        lines = []
+        for i, (start, end) in enumerate(runs):
+            points = np.column_stack((canvas_x[start:end], canvas_y[start:end])).ravel().tolist()
+            if i < len(items):
+                self.canvas.coords(items[i], points)
+                lines.append(items[i])
             else:
-                try:
-                    y = func(x)
-                except (ValueError, ZeroDivisionError):
-                    # Handle discontinuities
-                    if points:
-                        self.canvas.create_line(points, fill=color, width=2)
-                        points = []
-                    continue
-            
-            # Skip points outside the y-range
-            if y < y_min or y > y_max:
-                if points:  # Add this check to avoid creating separate lines
-                    self.canvas.create_line(points, fill=color, width=2)
-                    points = []
-                continue
-            
-            canvas_x = (x - x_min) * x_scale
-            canvas_y = height - (y - y_min) * y_scale  # Invert y-coordinate
-            points.append(canvas_x)
-            points.append(canvas_y)
-        
-        # Draw the collected points
-        if points:
-            self.canvas.create_line(points, fill=color, width=2)
+                lines.append(self.canvas.create_line(points, fill=color, width=width, tags="curve"))
+        for item in items[len(runs):]:
+            self.canvas.delete(item)
+        return lines
     
     def add_function(self, func, name=None, color=None, start_time=None, end_time=None, 
-                    start_value=None, end_value=None):
+                    start_value=None, end_value=None, expression=None, parameters=None, cache_key=None):
         """
         Add a function to plot with optional time range and endpoint values
         
@@ -232,6 +1417,10 @@ class FunctionPlotter(tk.Frame):
         - end_time: Ending x value (defaults to x_max)
         - start_value: Y value at start_time (if None, uses func(start_time))
         - end_value: Y value at end_time (if None, uses func(end_time))
+        - expression: Source text of func, needed to save it in a workspace
+        - parameters: Values of the free names func takes after x, by name
+        - cache_key: JSON-able identity of a plain Python func, e.g. ("simulation", 3), which lets its slow
+          samples be kept on disk; change it whenever func changes
         """
         if name is None:
             name = f"Function {len(self.curves) + 1}"
@@ -240,30 +1429,99 @@ class FunctionPlotter(tk.Frame):
             color = colors[len(self.curves) % len(colors)]
             
         # Store all the function parameters in the curves list
-        self.curves.append((func, name, color, start_time, end_time, start_value, end_value))
+        self.add_curve(Curve(func, name, color, start_time, end_time, start_value, end_value, expression,
+                             parameters, cache_key))
+    
+    def set_parameter(self, curve, name, value):
+        """Change one parameter of a curve; the redraw is coalesced to one per scrub interval"""
+        curve.parameters[name] = value
+        self.scrubbed[curve.key] = curve
+        if self.scrub_job is None:
+            self.scrub_job = self.after(self.scrub_interval, self.redraw_scrubbed)
+    
+    def redraw_scrubbed(self):
+        """Re-evaluate curves whose parameters changed over their cached grid and move their lines through coords"""
+        self.scrub_job = None
+        scrubbed, self.scrubbed = self.scrubbed, {}
+        if self.frozen:
+            self.update_plot()
+            return
+        
+        redraw = []
+        for curve in scrubbed.values():
+            if curve not in self.curves or curve.samples is None:
+                continue
+            try:
+                curve.reevaluate()
+            except watchdog.EvaluationTimeout:
+                self.mark_slow(curve)
+                continue
+            except Exception as e:
+                self.mark_failed(curve, e)
+                continue
+            redraw.append(curve)
+            if self.feature_index is not None:
+                self.feature_index.forget(curve.key)
+        
+        # Derived curves follow their parent; they notice its new samples themselves
+        redraw.extend(curve for curve in self.curves if isinstance(curve, DerivedCurve) and curve.parent in redraw)
+        for curve in redraw:
+            self.plot_curve(curve)
+    
+    def derive_curve(self, curve, kind):
+        """Add the derivative or running integral of one of the plot's curves"""
+        self.add_curve(DerivedCurve(curve, kind))
+    
+    def add_curve(self, curve):
+        """Add an already built Curve to the plot"""
+        self.curves.append(curve)
         self.update_plot()
+        self.notify("curves")
     
     def remove_function(self, index):
-        """Remove a function by index"""
+        """Remove a function by index, along with any curves derived from it"""
         if 0 <= index < len(self.curves):
-            del self.curves[index]
+            removed = {self.curves[index]}
+            for curve in self.curves:
+                if isinstance(curve, DerivedCurve) and curve.parent in removed:
+                    removed.add(curve)
+            if self.feature_index is not None:
+                for curve in removed:
+                    self.feature_index.forget(curve.key)
+            self.curves = [curve for curve in self.curves if curve not in removed]
             self.update_plot()
+            self.notify("curves")
             return True
         return False
     
+    def notify(self, event):
+        """Publish a change of this plotter on the owning app's registry"""
+        if self.app is not None:
+            self.app.registry.publish(event, self)
+    
     def update_plot(self):
         """Update the plot with current settings"""
-        self.draw_grid()
+        # Anything that needs a real render ends the frozen state
+        self.frozen = False
+        
+        # Inside a MultiPlotterApp the redraw is queued on the shared scheduler
+        if self.app is not None:
+            self.app.scheduler.mark_dirty(self)
+        else:
+            self.draw_grid()
     
     def clear_all(self):
         """Clear all curves"""
         self.curves = []
+        self.feature_index = None
         self.update_plot()
+        self.notify("curves")
     
     def set_title(self, title):
         """Set the title of the plot"""
         self.title = title
         self.title_label.config(text=title)
+        self.notify("config")
     
     def set_ranges(self, x_range=None, y_range=None, grid_spacing=None):
         """Set the x and y ranges for the plot"""
@@ -271,29 +1529,690 @@ class FunctionPlotter(tk.Frame):
             self.x_range = x_range
         if y_range is not None:
             self.y_range = y_range
+            self.y_grid_spacing = None
         if grid_spacing is not None:
             self.grid_spacing = grid_spacing
         self.update_plot()
+        self.notify("config")
+        if self.link is not None:
+            self.link.follow(self)
     
     def resize(self, event=None):
         """Handle resize events"""
+        # Frozen plots keep their image until they are used again
+        if not self.frozen:
+            self.update_plot()
+    
+    def cache_bytes(self):
+        """Bytes held by the sample caches and the frozen image, at four bytes per image pixel"""
+        image_bytes = 0
+        if self.frozen_image is not None:
+            image_bytes = self.frozen_image.width() * self.frozen_image.height() * 4
+        return sum(curve.cache_bytes() for curve in self.curves) + image_bytes
+    
+    def freeze(self):
+        """Replace lines and shapes with one static image and drop the sample caches"""
+        if self.frozen:
+            return
+        self.on_leave()
+        
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1:
+            width, height = self.width, self.height
+        
+        # Rasterize in stacking order; text items stay live on top of the image
+        rgb = raster.new_raster(width, height)
+        curves = {curve.key: curve for curve in self.curves}
+        for item in self.canvas.find_all():
+            kind = self.canvas.type(item)
+            tags = self.canvas.gettags(item)
+            if kind == "image" and "field" in tags:
+                field_rgb = curves[tags[1]].rgb
+                rows, columns = min(height, field_rgb.shape[0]), min(width, field_rgb.shape[1])
+                rgb[:rows, :columns] = field_rgb[:rows, :columns]
+            elif kind == "line":
+                dash = self.canvas.itemcget(item, "dash")
+                raster.draw_polyline(rgb, self.canvas.coords(item), self.color_rgb(self.canvas.itemcget(item, "fill")),
+                                     width=int(float(self.canvas.itemcget(item, "width"))),
+                                     dash=tuple(int(v) for v in dash.split()) if dash else None)
+            elif kind == "rectangle":
+                x0, y0, x1, y1 = self.canvas.coords(item)
+                fill = self.canvas.itemcget(item, "fill")
+                if fill:
+                    raster.fill_rectangle(rgb, x0, y0, x1, y1, self.color_rgb(fill))
+                outline = self.canvas.itemcget(item, "outline")
+                if outline:
+                    raster.draw_polyline(rgb, [x0, y0, x1, y0, x1, y1, x0, y1, x0, y0], self.color_rgb(outline))
+            else:
+                continue
+            self.canvas.delete(item)
+        
+        self.frozen_image = raster.photo_image(rgb, master=self.canvas)
+        image_item = self.canvas.create_image(0, 0, image=self.frozen_image, anchor=tk.NW)
+        self.canvas.tag_lower(image_item)
+        
+        for curve in self.curves:
+            curve.drop_samples()
+        self.item_count = len(self.canvas.find_all())
+        self.frozen = True
+    
+    def unload(self):
+        """Drop everything drawn, image included; the plot is rendered again once it is in view"""
+        self.canvas.delete("all")
+        self.frozen_image = None
+        self.crosshair_items = None
+        self.curve_items = {}
+        self.item_count = 0
+        self.lazy = True
         self.update_plot()
+    
+    def thaw(self):
+        """Render a frozen plot live again"""
+        if self.frozen:
+            self.update_plot()
+    
+    def color_rgb(self, color):
+        """Convert a Tk color name to an 8-bit RGB tuple"""
+        return tuple(channel >> 8 for channel in self.winfo_rgb(color))
+
+
+class Minimap(tk.Canvas):
+    """Strip under a plotter with its functions over the overview range and a brush that sets the view"""
+
+    resolution = 3  # Pixels per overview sample
+
+    def __init__(self, plotter, height=48, **kwargs):
+        super().__init__(plotter, height=height, bg="#f8f8f8", highlightthickness=1,
+                         highlightbackground="#d0d0d0", **kwargs)
+        self.plotter = plotter
+        self.extent = None  # (low, high) of the overview, grown to take in every view shown
+        self.scale_type = None  # x scale the extent was taken on
+        self.key = None  # What the drawn overview was made from
+        self.brush = None
+        self.drag = None  # (pointer x, x range) when a brush drag started
+        self.pending = None  # x range the brush was dragged to, applied on the next tick
+        self.move_job = None
+        self.bind("<Configure>", lambda event: self.refresh())
+        self.bind("<Button-1>", self.on_press)
+        self.bind("<B1-Motion>", self.on_drag)
+    
+    def initial_extent(self):
+        """The current view widened to the bounded domains of the curves"""
+        low, high = self.plotter.x_range
+        starts = [curve.start_time for curve in self.plotter.curves if getattr(curve, "start_time", None) is not None]
+        ends = [curve.end_time for curve in self.plotter.curves if getattr(curve, "end_time", None) is not None]
+        extent = (min([low] + starts), max([high] + ends))
+        scale = scales.get_scale(self.plotter.x_scale_type)
+        return extent if scale.valid_range(*extent) else (low, high)
+    
+    def to_strip(self, values, width):
+        scale = scales.get_scale(self.plotter.x_scale_type)
+        low, high = scale.forward(self.extent)
+        return (scale.forward(values) - low) / (high - low) * width
+    
+    def refresh(self):
+        """Redraw the overview if anything it shows changed, and move the brush to the current view"""
+        width, height = self.winfo_width(), self.winfo_height()
+        if width <= 1:
+            return
+        plotter = self.plotter
+        low, high = plotter.x_range
+        scale = scales.get_scale(plotter.x_scale_type)
+        if not scale.valid_range(low, high):
+            return
+        # An extent taken on another scale may not even be valid on this one
+        if self.extent is None or plotter.x_scale_type != self.scale_type:
+            self.extent = self.initial_extent()
+            self.scale_type = plotter.x_scale_type
+        self.extent = (min(self.extent[0], low), max(self.extent[1], high))
+        
+        key = (self.extent, width, height, plotter.x_scale_type,
+               tuple((curve.key, curve.color, *curve.parameters.values()) for curve in plotter.curves))
+        if key != self.key:
+            self.key = key
+            self.draw_overview(width, height)
+        
+        x0, x1 = self.to_strip(plotter.x_range, width)
+        if self.brush is None:
+            self.brush = self.create_rectangle(0, 0, 0, 0, outline="#3366cc", fill="#3366cc", stipple="gray25")
+        self.coords(self.brush, x0, 1, x1, height - 2)
+        self.tag_raise(self.brush)
+    
+    def draw_overview(self, width, height):
+        """Sample each function at low resolution over the extent and draw it, scaled to the strip"""
+        self.delete("overview")
+        scale = scales.get_scale(self.plotter.x_scale_type)
+        xs = scale.grid(*self.extent, max(width // self.resolution, 2))
+        
+        overview = []
+        for curve in self.plotter.curves:
+            if curve.kind != "function" or curve.skipped:
+                continue
+            try:
+                overview.append((curve, curve.evaluate_grid(xs)))
+            except Exception:
+                # Timeouts and evaluation errors only leave the curve out of the overview
+                continue
+        finite = np.concatenate([ys[np.isfinite(ys)] for _, ys in overview] or [np.empty(0)])
+        if not finite.size:
+            return
+        
+        # Poles would flatten everything else, so the vertical range ignores the outer percent
+        y_low, y_high = np.percentile(finite, [1, 99])
+        if y_high - y_low <= abs(y_high) * 1e-12:
+            y_low, y_high = y_low - 1, y_high + 1
+        columns = self.to_strip(xs, width)
+        for curve, ys in overview:
+            rows = np.clip(height - 3 - (ys - y_low) / (y_high - y_low) * (height - 6), 0, height)
+            visible = np.isfinite(ys)
+            for run in np.split(np.arange(len(xs)), np.flatnonzero(np.diff(visible)) + 1):
+                if len(run) > 1 and visible[run[0]]:
+                    points = np.column_stack((columns[run], rows[run])).ravel().tolist()
+                    self.create_line(points, fill=curve.color, tags="overview")
+    
+    def on_press(self, event):
+        """Start dragging the brush; pressing beside it first centres the view there"""
+        plotter = self.plotter
+        plotter.on_interact()
+        if self.extent is None or self.scale_type != plotter.x_scale_type:
+            return
+        width = self.winfo_width()
+        x0, x1 = self.to_strip(plotter.x_range, width)
+        if not x0 <= event.x <= x1:
+            self.move_view(event.x - (x0 + x1) / 2, plotter.x_range, width)
+        self.drag = (event.x, self.pending or plotter.x_range)
+    
+    def on_drag(self, event):
+        if self.drag is not None and self.scale_type == self.plotter.x_scale_type:
+            start, x_range = self.drag
+            self.move_view(event.x - start, x_range, self.winfo_width())
+    
+    def move_view(self, shift, x_range, width):
+        """Set the plotter's x range to x_range moved by shift strip pixels, kept within the extent"""
+        scale = scales.get_scale(self.plotter.x_scale_type)
+        low, high = scale.forward(self.extent)
+        view_low, view_high = scale.forward(x_range)
+        delta = shift / width * (high - low)
+        delta = min(max(delta, low - view_low), high - view_high)
+        new_range = tuple(float(value) for value in scale.inverse([view_low + delta, view_high + delta]))
+        
+        # The brush follows the pointer at once; the plotter and its link group at most once per interval
+        if self.brush is not None:
+            x0, x1 = self.to_strip(new_range, width)
+            self.coords(self.brush, x0, 1, x1, self.winfo_height() - 2)
+        self.pending = new_range
+        if self.move_job is None:
+            self.move_job = self.after(self.plotter.scrub_interval, self.apply_move)
+    
+    def apply_move(self):
+        self.move_job = None
+        new_range, self.pending = self.pending, None
+        if new_range is not None and new_range != tuple(self.plotter.x_range):
+            self.plotter.set_ranges(x_range=new_range)
+
+
+class PlotterRegistry:
+    """Plotters of an app keyed by id, with the selection and change notifications batched per idle callback"""
+
+    def __init__(self, widget):
+        self.widget = widget  # Any Tk widget, used to schedule the flush
+        self.plotters = {}  # Plotter id -> plotter, in insertion order
+        self.selected = None
+        self.previous = None  # Selection before the current one
+        self.listeners = {}  # Event -> list of callbacks
+        self.pending = {}  # Event -> {plotter id: plotter} waiting for the flush
+        self.after_id = None
+    
+    def __len__(self):
+        return len(self.plotters)
+    
+    def __iter__(self):
+        return iter(list(self.plotters.values()))
+    
+    def get(self, plotter_id):
+        return self.plotters.get(plotter_id)
+    
+    def add(self, plotter):
+        self.plotters[plotter.id] = plotter
+        self.publish("added", plotter)
+    
+    def remove(self, plotter):
+        """Unregister a plotter, dropping it from the selection history too"""
+        self.plotters.pop(plotter.id, None)
+        if self.selected is plotter:
+            self.selected = None
+        if self.previous is plotter:
+            self.previous = None
+        self.publish("removed", plotter)
+    
+    def select(self, plotter):
+        """Make a plotter the selection and return the one it replaces"""
+        replaced = self.selected
+        if replaced is not plotter:
+            if replaced is not None:
+                self.previous = replaced
+            self.selected = plotter
+        self.publish("selected", plotter)
+        return replaced
+    
+    def subscribe(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+    
+    def publish(self, event, plotter):
+        if plotter is not None:
+            self.pending.setdefault(event, {})[plotter.id] = plotter
+        else:
+            self.pending.setdefault(event, {})
+        if self.after_id is None:
+            self.after_id = self.widget.after_idle(self.flush)
+    
+    def flush(self):
+        """Deliver everything published since the last flush"""
+        self.after_id = None
+        pending, self.pending = self.pending, {}
+        for event, plotters in pending.items():
+            for callback in self.listeners.get(event, []):
+                callback(list(plotters.values()))
+
+
+class PlotBudget:
+    """Freezes, then unloads, least recently used plotters when canvas items or cached bytes exceed a budget"""
+
+    def __init__(self, app, max_items=20000, max_cache_bytes=32 * 1024 * 1024):
+        self.app = app
+        self.max_items = max_items
+        self.max_cache_bytes = max_cache_bytes
+        self.last_used = {}  # Plotter id -> value of the use counter when last touched
+        self.clock = 0
+        self.after_id = None
+    
+    def touch(self, plotter):
+        self.clock += 1
+        self.last_used[plotter.id] = self.clock
+    
+    def forget(self, plotter):
+        self.last_used.pop(plotter.id, None)
+    
+    def usage(self):
+        """Return (live canvas items, sample cache and frozen image bytes) across all plotters"""
+        items = cache_bytes = 0
+        for plotter in self.app.registry:
+            items += plotter.item_count
+            cache_bytes += plotter.cache_bytes()
+        return items, cache_bytes
+    
+    def over_budget(self, items, cache_bytes):
+        return items > self.max_items or cache_bytes > self.max_cache_bytes
+    
+    def schedule_check(self):
+        if self.after_id is None:
+            self.after_id = self.app.after_idle(self.enforce)
+    
+    def enforce(self):
+        """Freeze unselected plotters, then drop offscreen frozen images, least recently used first"""
+        self.after_id = None
+        items, cache_bytes = self.usage()
+        if not self.over_budget(items, cache_bytes):
+            return
+        
+        candidates = [plotter for plotter in self.app.registry
+                      if not plotter.frozen
+                      and plotter is not self.app.selected_plotter
+                      and not self.app.scheduler.is_pending(plotter)]
+        candidates.sort(key=lambda plotter: self.last_used.get(plotter.id, 0))
+        
+        for plotter in candidates:
+            if not self.over_budget(items, cache_bytes):
+                break
+            items -= plotter.item_count
+            cache_bytes -= plotter.cache_bytes()
+            plotter.freeze()
+            items += plotter.item_count
+            cache_bytes += plotter.cache_bytes()
+        
+        # Frozen images cost more memory than the samples they replace, so offscreen ones go entirely
+        frozen = [plotter for plotter in self.app.registry
+                  if plotter.frozen
+                  and plotter is not self.app.selected_plotter
+                  and not self.app.is_plotter_visible(plotter)]
+        frozen.sort(key=lambda plotter: self.last_used.get(plotter.id, 0))
+        for plotter in frozen:
+            if not self.over_budget(items, cache_bytes):
+                break
+            items -= plotter.item_count
+            cache_bytes -= plotter.cache_bytes()
+            plotter.unload()
+
+
+class RenderScheduler:
+    """Redraws dirty plotters from the Tk event loop within a per-frame time budget"""
+
+    def __init__(self, app, frame_budget=0.012, frame_interval=16):
+        self.app = app
+        self.frame_budget = frame_budget  # Seconds of drawing allowed per frame
+        self.frame_interval = frame_interval  # Milliseconds between frames
+        self.dirty = set()
+        self.deferred = set()  # Lazy plotters waiting to be scrolled into view
+        self.current = None  # (plotter, slices) of a render still in progress
+        self.after_id = None
+        self.first_queued = None  # When the first plotter was queued, until it has been drawn completely
+        self.first_rendered = False
+
+    def mark_dirty(self, plotter):
+        """Queue a plotter for redraw on one of the next frames"""
+        if self.first_queued is None:
+            self.first_queued = time.perf_counter()
+        self.deferred.discard(plotter)
+        self.dirty.add(plotter)
+        # A render already in progress for this plotter is stale now
+        if self.current is not None and self.current[0] is plotter:
+            self.current = None
+        if self.after_id is None:
+            self.after_id = self.app.after_idle(self.run_frame)
+
+    def discard(self, plotter):
+        """Forget a plotter that is about to be destroyed"""
+        self.dirty.discard(plotter)
+        self.deferred.discard(plotter)
+        if self.current is not None and self.current[0] is plotter:
+            self.current = None
+
+    def is_pending(self, plotter):
+        """Check whether a plotter is waiting for or in the middle of a render"""
+        return (plotter in self.dirty or plotter in self.deferred
+                or (self.current is not None and self.current[0] is plotter))
+    
+    def wake_visible(self):
+        """Queue deferred plotters that have been scrolled into view"""
+        for plotter in [p for p in self.deferred if self.app.is_plotter_visible(p)]:
+            self.mark_dirty(plotter)
+    
+    def priority(self, plotter):
+        """Selected plotter first, then plotters in view, then offscreen ones"""
+        if plotter is self.app.selected_plotter:
+            return 0
+        if self.app.is_plotter_visible(plotter):
+            return 1
+        return 2
+
+    def run_frame(self):
+        """Render slices until the frame budget is spent, then yield to the event loop"""
+        self.after_id = None
+        deadline = time.perf_counter() + self.frame_budget
+        
+        while time.perf_counter() < deadline:
+            if self.current is None:
+                if not self.dirty:
+                    break
+                plotter = min(self.dirty, key=self.priority)
+                if plotter.lazy and self.priority(plotter) == 2:
+                    # Only offscreen plotters are left; park the lazy ones until they become visible
+                    lazy = {p for p in self.dirty if p.lazy}
+                    self.deferred |= lazy
+                    self.dirty -= lazy
+                    continue
+                self.dirty.discard(plotter)
+                if not plotter.winfo_exists():
+                    continue
+                self.current = (plotter, plotter.render_slices())
+            
+            try:
+                next(self.current[1])
+            except StopIteration:
+                self.current[0].lazy = False
+                self.current = None
+                self.app.budget.schedule_check()
+                if not self.first_rendered:
+                    self.first_rendered = True
+                    startup_timer.record("first render", time.perf_counter() - self.first_queued)
+            except Exception as e:
+                # A failing plotter shows its error and must not stall the others
+                plotter, self.current = self.current[0], None
+                plotter.show_render_error(e)
+        
+        if self.current is not None or self.dirty:
+            self.after_id = self.app.after(self.frame_interval, self.run_frame)
+
+
+class LinkGroup:
+    """Plotters whose x range, and optionally y range, follow each other, sharing one x grid and sample buffers"""
+
+    max_buffers = 256  # Drop all buffers past this many, e.g. after many parameter changes
+
+    def __init__(self, name, link_y=False):
+        self.name = name
+        self.link_y = link_y
+        self.members = []
+        self.x_range = None  # Range the grids and buffers were taken for
+        self.grids = {}  # (scale type, start, end, points) -> xs
+        self.buffers = {}  # Content address of a curve and its grid -> (xs, ys)
+    
+    def add(self, plotter):
+        if plotter.link is not None:
+            plotter.link.discard(plotter)
+        self.members.append(plotter)
+        plotter.link = self
+    
+    def discard(self, plotter):
+        if plotter in self.members:
+            self.members.remove(plotter)
+        if plotter.link is self:
+            plotter.link = None
+    
+    def grid(self, scale_type, start, end, num_points):
+        """The sample grid for a range, computed once for all members"""
+        key = (scale_type, start, end, num_points)
+        if key not in self.grids:
+            self.grids[key] = scales.get_scale(scale_type).grid(start, end, num_points)
+        return self.grids[key]
+    
+    def find(self, curve, key):
+        """Samples another member took of an identical curve on the same grid, or None"""
+        address = curve.disk_address(key)
+        return None if address is None else self.buffers.get(address)
+    
+    def keep(self, curve, key, samples):
+        address = curve.disk_address(key)
+        if address is None:
+            return
+        if len(self.buffers) >= self.max_buffers:
+            self.buffers = {}
+        self.buffers[address] = samples
+    
+    def follow(self, leader):
+        """Move every other member to the leader's ranges, where the member's scales can show them"""
+        if leader.x_range != self.x_range:
+            # Grids and buffers of the old range will not be asked for again
+            self.x_range = leader.x_range
+            self.grids = {}
+            self.buffers = {}
+        
+        for member in self.members:
+            if member is leader:
+                continue
+            x_scale, y_scale = member.axis_scales()
+            changed = False
+            if x_scale.valid_range(*leader.x_range) and member.x_range != leader.x_range:
+                member.x_range = leader.x_range
+                changed = True
+            if (self.link_y and not member.autoscale and member.y_range != leader.y_range
+                    and y_scale.valid_range(*leader.y_range)):
+                member.y_range = leader.y_range
+                member.y_grid_spacing = leader.y_grid_spacing
+                changed = True
+            if changed:
+                member.update_plot()
+                member.notify("config")
+
+
+class FunctionListRow:
+    """Widgets for one entry of the function list, reused for whichever curve it is bound to"""
+
+    def __init__(self, panel):
+        self.curve = None
+        self.text = None
+        self.color = None
+        
+        self.frame = tk.Frame(panel.rows_frame, bg="#e8e8e8")
+        
+        self.color_indicator = tk.Frame(self.frame, width=10, height=10, bg="#e8e8e8")
+        self.color_indicator.pack(side=tk.LEFT, padx=5)
+        
+        self.label = tk.Label(self.frame, bg="#e8e8e8")
+        self.label.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            self.frame,
+            text="X",
+            command=lambda: panel.on_remove(self.curve),
+            width=2,
+            relief=tk.FLAT
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        # Derive and integrate actions, only shown for curves with one y per x
+        self.actions = tk.Frame(self.frame, bg="#e8e8e8")
+        tk.Button(self.actions, text="∫", command=lambda: panel.on_derive(self.curve, "integral"),
+                  width=2, relief=tk.FLAT).pack(side=tk.RIGHT)
+        tk.Button(self.actions, text="d/dx", command=lambda: panel.on_derive(self.curve, "derivative"),
+                  relief=tk.FLAT).pack(side=tk.RIGHT)
+        self.actions_shown = False
+    
+    def bind(self, curve):
+        """Show a curve in this row, only touching the widgets whose value changed"""
+        self.curve = curve
+        status = curve.status()
+        text = f"{curve.name} ({status})" if status else curve.name
+        if text != self.text:
+            self.text = text
+            self.label.config(text=text)
+        if curve.color != self.color:
+            self.color = curve.color
+            self.color_indicator.config(bg=curve.color)
+        if curve.single_valued != self.actions_shown:
+            self.actions_shown = curve.single_valued
+            if self.actions_shown:
+                self.actions.pack(side=tk.RIGHT)
+            else:
+                self.actions.pack_forget()
+
+
+class FunctionListPanel(tk.Frame):
+    """Keyed list of curve rows that diffs against the previous state instead of rebuilding"""
+
+    def __init__(self, master, on_remove, on_derive, visible_rows=25, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_remove = on_remove
+        self.on_derive = on_derive  # Called with (curve, "derivative" or "integral")
+        self.visible_rows = visible_rows  # Above this many curves only a window of rows is shown
+        
+        self.curves = []
+        self.offset = 0  # Index of the first curve shown when virtualized
+        self.rows = {}  # Curve key -> bound row
+        self.pool = []  # Rows not bound to any curve
+        self.packed_keys = []  # Keys in the order their rows are packed
+        
+        self.rows_frame = tk.Frame(self, bg=self["bg"])
+        self.rows_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Only shown once the list is virtualized
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+    
+    def set_curves(self, curves):
+        """Show a new list of curves"""
+        self.curves = list(curves)
+        self.refresh()
+    
+    def on_scroll(self, action, value, unit=None):
+        """Move the window of visible rows from the scrollbar"""
+        if action == "moveto":
+            self.offset = int(float(value) * len(self.curves))
+        else:
+            step = self.visible_rows if unit == "pages" else 1
+            self.offset += int(value) * step
+        self.refresh()
+    
+    def refresh(self):
+        """Bring the packed rows in line with the current curves"""
+        total = len(self.curves)
+        if total > self.visible_rows:
+            self.offset = max(0, min(self.offset, total - self.visible_rows))
+            window = self.curves[self.offset:self.offset + self.visible_rows]
+            self.scrollbar.set(self.offset / total, (self.offset + len(window)) / total)
+            if not self.scrollbar.winfo_ismapped():
+                self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        else:
+            self.offset = 0
+            window = self.curves
+            self.scrollbar.pack_forget()
+        
+        keys = [curve.key for curve in window]
+        shown = set(keys)
+        
+        # Return rows of curves that are gone or scrolled away to the pool
+        for key in list(self.rows):
+            if key not in shown:
+                row = self.rows.pop(key)
+                row.frame.pack_forget()
+                row.curve = None
+                self.pool.append(row)
+        
+        for curve in window:
+            row = self.rows.get(curve.key)
+            if row is None:
+                row = self.pool.pop() if self.pool else FunctionListRow(self)
+                self.rows[curve.key] = row
+            row.bind(curve)
+        
+        # Repack only if the order changed; appending just packs the new rows
+        packed = [key for key in self.packed_keys if key in shown]
+        if keys[:len(packed)] != packed:
+            for key in packed:
+                self.rows[key].frame.pack_forget()
+            packed = []
+        for key in keys[len(packed):]:
+            self.rows[key].frame.pack(fill=tk.X, pady=2)
+        self.packed_keys = keys
 
 
 class MultiPlotterApp(tk.Tk):
-    def __init__(self):
+    slider_resolution = 0.01  # Step of the parameter sliders
+    max_reported_errors = 10  # Skipped plots listed by name when a workspace opens with errors
+    
+    def __init__(self, fast_start=True):
+        started = time.perf_counter()
         super().__init__()
+        # Fast start defers rarely used panels and heavy imports until they are needed
+        self.fast_start = fast_start
+        if not fast_start:
+            for module in (np, raster, workspace, scales, expressions, contours, intervals, watchdog, samplecache,
+                           features, spatial):
+                module.load()
         self.title("Multi-Function Plotter")
         self.geometry("1200x800")
         self.minsize(800, 600)
         
-        self.selected_plotter = None
-        self.plotters = []
+        # Plotters by id plus the selection; changes are delivered in batches
+        self.registry = PlotterRegistry(self)
+        self.registry.subscribe("selected", self.on_selection_changed)
+        self.registry.subscribe("curves", self.on_curves_changed)
+        self.registry.subscribe("config", self.on_config_changed)
+        self.registry.subscribe("features", self.on_features_changed)
+        self.link_groups = {}  # Name -> LinkGroup
+        
+        # All plotters queue their redraws here instead of drawing synchronously
+        self.scheduler = RenderScheduler(self)
+        # Freezes plotters nobody is looking at once the session gets large
+        self.budget = PlotBudget(self)
         
         self.create_widgets()
         
         # Bind resize event
         self.bind("<Configure>", self.on_resize)
+        startup_timer.record("build widgets", time.perf_counter() - started)
+    
+    @property
+    def selected_plotter(self):
+        return self.registry.selected
 
     def create_widgets(self):
         # Create main frame that expands with window
@@ -311,6 +2230,12 @@ class MultiPlotterApp(tk.Tk):
         self.delete_btn = tk.Button(self.toolbar, text="Delete Selected", command=self.delete_selected)
         self.delete_btn.pack(side=tk.LEFT, padx=5, pady=5)
         
+        self.open_btn = tk.Button(self.toolbar, text="Open Workspace", command=self.open_workspace)
+        self.open_btn.pack(side=tk.LEFT, padx=(20, 5), pady=5)
+        
+        self.save_btn = tk.Button(self.toolbar, text="Save Workspace", command=self.save_workspace)
+        self.save_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
         # Create content area with two panes
         self.content = tk.PanedWindow(self.main_frame, orient=tk.HORIZONTAL)
         self.content.pack(fill=tk.BOTH, expand=True)
@@ -326,7 +2251,7 @@ class MultiPlotterApp(tk.Tk):
         # Add scrollbar to canvas
         self.plot_scrollbar = tk.Scrollbar(self.plot_container_frame, orient=tk.VERTICAL, command=self.plot_canvas.yview)
         self.plot_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.plot_canvas.configure(yscrollcommand=self.plot_scrollbar.set)
+        self.plot_canvas.configure(yscrollcommand=self.on_plots_scrolled)
         
         # Create a frame inside the canvas to hold the plots
         self.plot_frame = tk.Frame(self.plot_canvas, bg="#f5f5f5")
@@ -369,6 +2294,11 @@ class MultiPlotterApp(tk.Tk):
         tk.Label(range_frame, text="to", bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
         tk.Entry(range_frame, textvariable=self.x_max_var, width=6).pack(side=tk.LEFT, padx=2)
         
+        # The minimap shows the whole x extent with a brush for the view
+        self.minimap_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(range_frame, text="Minimap", variable=self.minimap_var, command=self.toggle_minimap,
+                       bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
+        
         # Y Range
         tk.Label(config_controls, text="Y Range:", bg="#e8e8e8").grid(row=2, column=0, sticky=tk.W, pady=5)
         range_frame = tk.Frame(config_controls, bg="#e8e8e8")
@@ -380,50 +2310,157 @@ class MultiPlotterApp(tk.Tk):
         tk.Label(range_frame, text="to", bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
         tk.Entry(range_frame, textvariable=self.y_max_var, width=6).pack(side=tk.LEFT, padx=2)
         
+        # Autoscale fits the y range to the data, optionally clipping outliers
+        self.autoscale_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(range_frame, text="Auto", variable=self.autoscale_var, bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
+        self.clip_var = tk.StringVar(value="")
+        tk.Label(range_frame, text="clip %", bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
+        tk.Entry(range_frame, textvariable=self.clip_var, width=4).pack(side=tk.LEFT, padx=2)
+        
         # Grid Spacing
         tk.Label(config_controls, text="Grid Spacing:", bg="#e8e8e8").grid(row=3, column=0, sticky=tk.W, pady=5)
         self.grid_var = tk.DoubleVar(value=1.0)
         tk.Entry(config_controls, textvariable=self.grid_var, width=6).grid(row=3, column=1, sticky=tk.W, pady=5)
         
+        # Axis scales
+        tk.Label(config_controls, text="Axis Scale:", bg="#e8e8e8").grid(row=4, column=0, sticky=tk.W, pady=5)
+        scale_frame = tk.Frame(config_controls, bg="#e8e8e8")
+        scale_frame.grid(row=4, column=1, sticky=tk.W+tk.E, pady=5)
+        
+        self.x_scale_var = tk.StringVar(value="linear")
+        self.y_scale_var = tk.StringVar(value="linear")
+        tk.Label(scale_frame, text="x", bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
+        ttk.Combobox(scale_frame, textvariable=self.x_scale_var, values=["linear", "log", "symlog", "time"],
+                     state="readonly", width=7).pack(side=tk.LEFT, padx=2)
+        tk.Label(scale_frame, text="y", bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
+        ttk.Combobox(scale_frame, textvariable=self.y_scale_var, values=["linear", "log", "symlog"],
+                     state="readonly", width=7).pack(side=tk.LEFT, padx=2)
+        
+        # Link group: plotters in the same group share their x range (and y range if ticked)
+        tk.Label(config_controls, text="Link:", bg="#e8e8e8").grid(row=5, column=0, sticky=tk.W, pady=5)
+        link_frame = tk.Frame(config_controls, bg="#e8e8e8")
+        link_frame.grid(row=5, column=1, sticky=tk.W+tk.E, pady=5)
+        
+        self.link_var = tk.StringVar(value="none")
+        self.link_y_var = tk.BooleanVar(value=False)
+        ttk.Combobox(link_frame, textvariable=self.link_var, values=["none", "A", "B", "C", "D"],
+                     state="readonly", width=7).pack(side=tk.LEFT, padx=2)
+        tk.Checkbutton(link_frame, text="y too", variable=self.link_y_var, bg="#e8e8e8").pack(side=tk.LEFT, padx=2)
+        
         # Apply button
         self.apply_btn = tk.Button(config_controls, text="Apply Changes", command=self.apply_config)
-        self.apply_btn.grid(row=4, column=0, columnspan=2, pady=10)
+        self.apply_btn.grid(row=6, column=0, columnspan=2, pady=10)
         self.apply_btn.config(state=tk.NORMAL)
         
         # Section for current functions
         tk.Label(config_controls, text="Current Functions", font=("Arial", 11, "bold"), 
-                bg="#e8e8e8").grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(20, 5))
+                bg="#e8e8e8").grid(row=7, column=0, columnspan=2, sticky=tk.W, pady=(20, 5))
         
-        # Frame for function list
-        self.function_list_frame = tk.Frame(config_controls, bg="#e8e8e8")
-        self.function_list_frame.grid(row=6, column=0, columnspan=2, sticky=tk.W+tk.E, pady=5)
+        # Keyed list of the selected plotter's functions
+        self.function_list = FunctionListPanel(config_controls, self.remove_curve, self.derive_curve, bg="#e8e8e8")
+        self.function_list.grid(row=8, column=0, columnspan=2, sticky=tk.W+tk.E, pady=5)
         
         # Section for adding functions
         tk.Label(config_controls, text="Add Function", font=("Arial", 11, "bold"), 
-                bg="#e8e8e8").grid(row=7, column=0, columnspan=2, sticky=tk.W, pady=(20, 5))
+                bg="#e8e8e8").grid(row=9, column=0, columnspan=2, sticky=tk.W, pady=(20, 5))
         
         # Function entry
-        tk.Label(config_controls, text="f(x) =", bg="#e8e8e8").grid(row=8, column=0, sticky=tk.W, pady=5)
+        # Curve type
+        tk.Label(config_controls, text="Type:", bg="#e8e8e8").grid(row=10, column=0, sticky=tk.W, pady=5)
+        self.curve_type_var = tk.StringVar(value="function")
+        curve_type_combo = ttk.Combobox(config_controls, textvariable=self.curve_type_var,
+                                        values=["function", "family", "piecewise", "parametric", "polar",
+                                                "implicit", "heatmap", "filled contour"], state="readonly")
+        curve_type_combo.grid(row=10, column=1, sticky=tk.W+tk.E, pady=5)
+        curve_type_combo.bind("<<ComboboxSelected>>", self.on_curve_type_changed)
+        
+        self.func_label = tk.Label(config_controls, text="f(x) =", bg="#e8e8e8")
+        self.func_label.grid(row=11, column=0, sticky=tk.W, pady=5)
         self.func_var = tk.StringVar(value="math.sin(x)")
         self.func_entry = tk.Entry(config_controls, textvariable=self.func_var)
-        self.func_entry.grid(row=8, column=1, sticky=tk.W+tk.E, pady=5)
+        self.func_entry.grid(row=11, column=1, sticky=tk.W+tk.E, pady=5)
         
         # Function name
-        tk.Label(config_controls, text="Name:", bg="#e8e8e8").grid(row=9, column=0, sticky=tk.W, pady=5)
+        tk.Label(config_controls, text="Name:", bg="#e8e8e8").grid(row=12, column=0, sticky=tk.W, pady=5)
         self.func_name_var = tk.StringVar(value="")
         self.func_name_entry = tk.Entry(config_controls, textvariable=self.func_name_var)
-        self.func_name_entry.grid(row=9, column=1, sticky=tk.W+tk.E, pady=5)
+        self.func_name_entry.grid(row=12, column=1, sticky=tk.W+tk.E, pady=5)
         
         # Function color
-        tk.Label(config_controls, text="Color:", bg="#e8e8e8").grid(row=10, column=0, sticky=tk.W, pady=5)
+        tk.Label(config_controls, text="Color:", bg="#e8e8e8").grid(row=13, column=0, sticky=tk.W, pady=5)
         self.func_color_var = tk.StringVar(value="blue")
         self.func_color_combo = ttk.Combobox(config_controls, textvariable=self.func_color_var, 
                                           values=["blue", "red", "green", "purple", "orange", "brown"], 
                                           state="readonly")
-        self.func_color_combo.grid(row=10, column=1, sticky=tk.W+tk.E, pady=5)
+        self.func_color_combo.grid(row=13, column=1, sticky=tk.W+tk.E, pady=5)
 
-        domain_frame = tk.Frame(config_controls, bg="#e8e8e8")
-        domain_frame.grid(row=11, column=0, columnspan=2, sticky=tk.W+tk.E, pady=5)
+        # Domain restriction values; the widgets for them are built on first use
+        self.start_time_var = tk.StringVar(value="")
+        self.end_time_var = tk.StringVar(value="")
+        self.start_value_var = tk.StringVar(value="")
+        self.end_value_var = tk.StringVar(value="")
+        
+        self.domain_container = tk.Frame(config_controls, bg="#e8e8e8")
+        self.domain_container.grid(row=14, column=0, columnspan=2, sticky=tk.W+tk.E, pady=5)
+        self.domain_frame = None
+        self.domain_toggle = tk.Button(self.domain_container, text="Domain restriction ▸", relief=tk.FLAT,
+                                       bg="#e8e8e8", command=self.toggle_domain_panel)
+        self.domain_toggle.pack(anchor=tk.W)
+        if not self.fast_start:
+            self.toggle_domain_panel()
+        
+        # Add function button
+        self.add_func_btn = tk.Button(config_controls, text="Add Function", command=self.add_function)
+        self.add_func_btn.grid(row=15, column=0, columnspan=2, pady=10)
+        self.add_func_btn.config(state=tk.NORMAL)
+        
+        # Clear functions button
+        self.clear_btn = tk.Button(config_controls, text="Clear All Functions", command=self.clear_functions)
+        self.clear_btn.grid(row=16, column=0, columnspan=2, pady=5)
+        self.clear_btn.config(state=tk.NORMAL)
+        
+        # Roots, extrema and intersections of the selected plot
+        self.features_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(config_controls, text="Mark roots, extrema and intersections", variable=self.features_var,
+                       command=self.toggle_features, bg="#e8e8e8").grid(row=17, column=0, columnspan=2, sticky=tk.W)
+        features_frame = tk.Frame(config_controls, bg="#e8e8e8")
+        features_frame.grid(row=18, column=0, columnspan=2, sticky=tk.W+tk.E, pady=5)
+        self.features_list = tk.Listbox(features_frame, height=6)
+        features_scrollbar = tk.Scrollbar(features_frame, orient=tk.VERTICAL, command=self.features_list.yview)
+        self.features_list.config(yscrollcommand=features_scrollbar.set)
+        self.features_list.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        features_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # One slider per free parameter of the selected plot's functions
+        tk.Label(config_controls, text="Parameters", font=("Arial", 10, "bold"), bg="#e8e8e8").grid(
+            row=19, column=0, columnspan=2, sticky=tk.W, pady=(10, 5))
+        self.parameters_frame = tk.Frame(config_controls, bg="#e8e8e8")
+        self.parameters_frame.grid(row=20, column=0, columnspan=2, sticky=tk.W+tk.E)
+        self.sliders = {}  # (curve key, parameter name) -> (label, slider)
+        
+        # Set column weights
+        config_controls.columnconfigure(1, weight=1)
+    
+    def on_curve_type_changed(self, event=None):
+        """Relabel the expression entry for the chosen curve type"""
+        labels = {"function": "f(x) =", "family": "f(x, a); a=lo..hi; n", "piecewise": "a..b: f(x); ...",
+                  "parametric": "x(t); y(t) =", "polar": "r(t) =", "implicit": "0 = f(x, y) =",
+                  "heatmap": "f(x, y) =", "filled contour": "f(x, y) ="}
+        self.func_label.config(text=labels[self.curve_type_var.get()])
+    
+    def toggle_domain_panel(self):
+        """Show or hide the domain restriction widgets, building them the first time"""
+        if self.domain_frame is None:
+            self.create_domain_widgets()
+        elif self.domain_frame.winfo_manager():
+            self.domain_frame.pack_forget()
+            self.domain_toggle.config(text="Domain restriction ▸")
+            return
+        self.domain_frame.pack(fill=tk.X)
+        self.domain_toggle.config(text="Domain restriction ▾")
+    
+    def create_domain_widgets(self):
+        domain_frame = self.domain_frame = tk.Frame(self.domain_container, bg="#e8e8e8")
 
         # Time range (domain) restrictions
         tk.Label(domain_frame, text="Domain restriction (optional)", font=("Arial", 10, "italic"), 
@@ -431,12 +2468,10 @@ class MultiPlotterApp(tk.Tk):
         
         # Start time
         tk.Label(domain_frame, text="Start x:", bg="#e8e8e8").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.start_time_var = tk.StringVar(value="")
         tk.Entry(domain_frame, textvariable=self.start_time_var, width=8).grid(row=1, column=1, sticky=tk.W, pady=2)
         
         # End time
         tk.Label(domain_frame, text="End x:", bg="#e8e8e8").grid(row=1, column=2, sticky=tk.W, pady=2, padx=(10,0))
-        self.end_time_var = tk.StringVar(value="")
         tk.Entry(domain_frame, textvariable=self.end_time_var, width=8).grid(row=1, column=3, sticky=tk.W, pady=2)
         
         # Value constraints
@@ -445,30 +2480,21 @@ class MultiPlotterApp(tk.Tk):
                  
         # Start value
         tk.Label(domain_frame, text="Start y:", bg="#e8e8e8").grid(row=3, column=0, sticky=tk.W, pady=2)
-        self.start_value_var = tk.StringVar(value="")
         tk.Entry(domain_frame, textvariable=self.start_value_var, width=8).grid(row=3, column=1, sticky=tk.W, pady=2)
         
         # End value
         tk.Label(domain_frame, text="End y:", bg="#e8e8e8").grid(row=3, column=2, sticky=tk.W, pady=2, padx=(10,0))
-        self.end_value_var = tk.StringVar(value="")
         tk.Entry(domain_frame, textvariable=self.end_value_var, width=8).grid(row=3, column=3, sticky=tk.W, pady=2)
-        
-        # Add function button
-        self.add_func_btn = tk.Button(config_controls, text="Add Function", command=self.add_function)
-        self.add_func_btn.grid(row=12, column=0, columnspan=2, pady=10)
-        self.add_func_btn.config(state=tk.NORMAL)
-        
-        # Clear functions button
-        self.clear_btn = tk.Button(config_controls, text="Clear All Functions", command=self.clear_functions)
-        self.clear_btn.grid(row=13, column=0, columnspan=2, pady=5)
-        self.clear_btn.config(state=tk.NORMAL)
-        
-        # Set column weights
-        config_controls.columnconfigure(1, weight=1)
     
     def on_plot_frame_configure(self, event):
         """Update the scrollregion when the plot frame changes size"""
         self.plot_canvas.configure(scrollregion=self.plot_canvas.bbox("all"))
+        self.scheduler.wake_visible()
+    
+    def on_plots_scrolled(self, first, last):
+        """Keep the scrollbar in sync and render lazy plotters that came into view"""
+        self.plot_scrollbar.set(first, last)
+        self.scheduler.wake_visible()
     
     def on_canvas_configure(self, event):
         """Resize the window inside the canvas when the canvas changes size"""
@@ -480,81 +2506,255 @@ class MultiPlotterApp(tk.Tk):
         # Only process if it's the main window being resized
         if event.widget == self:
             # Update all plotters
-            for plotter in self.plotters:
+            for plotter in self.registry:
                 plotter.resize()
     
+    def is_plotter_visible(self, plotter):
+        """Check whether any part of a plotter is inside the scrolled plot area"""
+        if not plotter.winfo_ismapped():
+            return False
+        top = self.plot_canvas.canvasy(0)
+        bottom = top + self.plot_canvas.winfo_height()
+        plotter_top = plotter.winfo_y()
+        return plotter_top < bottom and plotter_top + plotter.winfo_height() > top
+    
     def add_plotter(self):
-        title = f"Plot {len(self.plotters) + 1}"
+        title = f"Plot {len(self.registry) + 1}"
         plotter = FunctionPlotter(self.plot_frame, app=self, title=title)
         plotter.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.plotters.append(plotter)
+        self.registry.add(plotter)
         # Add a default function
-        plotter.add_function(lambda x: math.sin(x), "sin(x)", "blue")
+        plotter.add_function(expressions.compile_expression("math.sin(x)"), "sin(x)", "blue",
+                             expression="math.sin(x)")
         self.select_plotter(plotter)
     
+    def add_plotter_from_state(self, state):
+        """Create a plotter from a workspace entry without rendering it yet; nothing is left behind if it fails"""
+        # Curves are rebuilt first, since a bad expression or a missing parent is the likeliest failure
+        built = []
+        curves = {}  # Saved key -> rebuilt curve, for derived curves to find their parent
+        for entry in state["curves"]:
+            curve = curve_from_state(entry, curves)
+            curves[entry.get("key")] = curve
+            # Embedded samples let the first render skip evaluation
+            if "samples" in entry:
+                curve.sample_key, curve.samples = entry["samples"]
+            built.append(curve)
+        
+        plotter = FunctionPlotter(self.plot_frame, app=self, title=state["title"],
+                                  x_range=tuple(state["x_range"]), y_range=tuple(state["y_range"]))
+        try:
+            plotter.grid_spacing = state["grid_spacing"]
+            plotter.autoscale = state.get("autoscale", False)
+            plotter.autoscale_percentile = state.get("autoscale_percentile")
+            plotter.x_scale_type = scales.get_scale(state.get("x_scale", "linear")).name
+            plotter.y_scale_type = scales.get_scale(state.get("y_scale", "linear")).name
+            self.link_plotter(plotter, state.get("link"), state.get("link_y", False))
+            plotter.set_show_minimap(state.get("minimap", False))
+        except Exception:
+            self.link_plotter(plotter, None)
+            plotter.destroy()
+            raise
+        
+        plotter.lazy = True
+        plotter.curves = built
+        plotter.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.registry.add(plotter)
+        plotter.update_plot()
+        plotter.notify("curves")
+        return plotter
+    
+    def save_workspace(self):
+        """Save all plotters and their cached samples to a workspace file"""
+        path = tk.filedialog.asksaveasfilename(defaultextension=".tkplot",
+                                               filetypes=[("Plot workspace", "*.tkplot"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            skipped = workspace.save_workspace(path, self.registry)
+        except OSError as e:
+            tk.messagebox.showerror("Save Failed", str(e))
+            return
+        if skipped:
+            tk.messagebox.showwarning("Workspace Saved",
+                                      f"{skipped} function(s) not typed in as an expression could not be saved.")
+    
+    def open_workspace(self):
+        """Replace all plotters with the ones from a workspace file"""
+        path = tk.filedialog.askopenfilename(filetypes=[("Plot workspace", "*.tkplot"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            states = workspace.load_workspace(path)
+        except (OSError, ValueError, KeyError) as e:
+            tk.messagebox.showerror("Open Failed", str(e))
+            return
+        
+        for plotter in self.registry:
+            self.registry.remove(plotter)
+            self.scheduler.discard(plotter)
+            self.budget.forget(plotter)
+            self.link_plotter(plotter, None)
+            plotter.destroy()
+        self.select_plotter(None)
+        
+        # Build the plotters a few at a time so the window stays responsive
+        self.pending_states = list(reversed(states))
+        self.workspace_errors = []
+        self.build_pending_plotters()
+    
+    def build_pending_plotters(self):
+        deadline = time.perf_counter() + 0.02
+        while self.pending_states and time.perf_counter() < deadline:
+            state = self.pending_states.pop()
+            try:
+                plotter = self.add_plotter_from_state(state)
+            except (SyntaxError, KeyError, ValueError, TypeError) as e:
+                title = state.get("title", "untitled") if isinstance(state, dict) else "untitled"
+                self.workspace_errors.append(f"{title}: {type(e).__name__}: {e}")
+                continue
+            if self.selected_plotter is None:
+                self.select_plotter(plotter)
+        if self.pending_states:
+            self.after(1, self.build_pending_plotters)
+        elif self.workspace_errors:
+            # One report for the whole file, however many plots were skipped
+            errors, self.workspace_errors = self.workspace_errors, []
+            shown = "\n".join(errors[:self.max_reported_errors])
+            if len(errors) > self.max_reported_errors:
+                shown += f"\n... and {len(errors) - self.max_reported_errors} more"
+            tk.messagebox.showerror("Invalid Workspace", f"Skipped {len(errors)} plot(s):\n{shown}")
+    
     def delete_selected(self):
         """Delete the selected plotter"""
-        if self.selected_plotter:
-            # Remove from list
-            self.plotters.remove(self.selected_plotter)
-            # Destroy widget
-            self.selected_plotter.destroy()
-            # Clear selection
-            self.selected_plotter = None
-            # Disable config buttons only if no plotters left
-            if not self.plotters:
-                self.toggle_config_buttons(False)
-            # Clear function list
-            self.update_function_list()
+        plotter = self.selected_plotter
+        if plotter:
+            # Unregister and destroy the widget
+            self.registry.remove(plotter)
+            self.scheduler.discard(plotter)
+            self.budget.forget(plotter)
+            self.link_plotter(plotter, None)
+            plotter.destroy()
+            # Fall back to the previously selected plotter, if it still exists
+            self.select_plotter(self.registry.previous)
+    
+    def link_plotter(self, plotter, name, link_y=False):
+        """Put a plotter in the named link group, or take it out of its group when name is None"""
+        if plotter.link is not None and plotter.link.name != name:
+            plotter.link.discard(plotter)
+        if name is None:
+            return
+        if name not in self.link_groups:
+            self.link_groups[name] = LinkGroup(name)
+        group = self.link_groups[name]
+        group.link_y = link_y
+        if plotter.link is not group:
+            group.add(plotter)
     
     def select_plotter(self, plotter):
-        # Deselect all plotters first
-        for p in self.plotters:
-            if p != plotter:
-                p.set_selected(False)
-        
-        # Update selected plotter reference
-        self.selected_plotter = plotter
-        
+        # Only the previous selection needs to be cleared
+        replaced = self.registry.select(plotter)
+        if replaced is not None and replaced is not plotter:
+            replaced.set_selected(False)
         if plotter:
             plotter.set_selected(True)
+            self.budget.touch(plotter)
+            plotter.thaw()
+    
+    def on_selection_changed(self, plotters):
+        """Sync the config panel with the selection once per batch of changes"""
+        plotter = self.selected_plotter
+        if plotter:
             self.update_config_fields(plotter)
-            self.update_function_list()
             self.toggle_config_buttons(True)
         else:
             self.toggle_config_buttons(False)
-            self.update_function_list()
+        self.update_function_list()
+        self.update_features_list()
+        self.update_parameter_sliders()
     
-    def update_function_list(self):
-        for widget in self.function_list_frame.winfo_children():
-            widget.destroy()
-        
+    def toggle_minimap(self):
         if self.selected_plotter:
-            for i, (_, name, color, *_) in enumerate(self.selected_plotter.curves):
-                self.create_function_entry(i, name, color)
+            self.selected_plotter.set_show_minimap(self.minimap_var.get())
     
-    def create_function_entry(self, index, name, color):
-        func_frame = tk.Frame(self.function_list_frame, bg="#e8e8e8")
-        func_frame.pack(fill=tk.X, pady=2)
-        
-        color_indicator = tk.Frame(func_frame, width=10, height=10, bg=color)
-        color_indicator.pack(side=tk.LEFT, padx=5)
-        
-        tk.Label(func_frame, text=name, bg="#e8e8e8").pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            func_frame, 
-            text="X", 
-            command=lambda idx=index: self.remove_function(idx),
-            width=2, 
-            relief=tk.FLAT
-        ).pack(side=tk.RIGHT, padx=5)
+    def toggle_features(self):
+        if self.selected_plotter:
+            self.selected_plotter.set_show_features(self.features_var.get())
+    
+    def on_features_changed(self, plotters):
+        if self.selected_plotter in plotters:
+            self.update_features_list()
+    
+    def update_features_list(self):
+        """List the features marked on the selected plot"""
+        self.features_list.delete(0, tk.END)
+        if self.selected_plotter:
+            for x, y, kind, description in self.selected_plotter.visible_features:
+                self.features_list.insert(tk.END, f"{description}: ({x:.6g}, {y:.6g})")
+    
+    def on_curves_changed(self, plotters):
+        if self.selected_plotter in plotters:
+            self.update_function_list()
+            self.update_parameter_sliders()
+    
+    def update_parameter_sliders(self):
+        """Bring the parameter sliders in line with the selected plot's curves, keyed by curve and name"""
+        plotter = self.selected_plotter
+        wanted = [(curve, name) for curve in plotter.curves for name in curve.parameters] if plotter else []
+        keys = {(curve.key, name) for curve, name in wanted}
+        for key in [key for key in self.sliders if key not in keys]:
+            label, slider = self.sliders.pop(key)
+            label.destroy()
+            slider.destroy()
+        
+        for row, (curve, name) in enumerate(wanted):
+            value = curve.parameters[name]
+            if (curve.key, name) not in self.sliders:
+                label = tk.Label(self.parameters_frame, bg="#e8e8e8")
+                slider = tk.Scale(self.parameters_frame, from_=min(-10.0, value), to=max(10.0, value),
+                                  resolution=self.slider_resolution, orient=tk.HORIZONTAL, bg="#e8e8e8",
+                                  highlightthickness=0)
+                slider.set(value)
+                slider.config(command=lambda value, plotter=plotter, curve=curve, name=name:
+                              self.on_parameter_slider(plotter, curve, name, float(value)))
+                # Letting go triggers a full render, which brings the grid, legend and features up to date
+                slider.bind("<ButtonRelease-1>", lambda event, plotter=plotter: plotter.update_plot())
+                self.sliders[curve.key, name] = (label, slider)
+            label, slider = self.sliders[curve.key, name]
+            label.config(text=f"{curve.name}: {name}")
+            if abs(slider.get() - value) > self.slider_resolution / 2:
+                slider.set(value)
+            label.grid(row=row, column=0, sticky=tk.W)
+            slider.grid(row=row, column=1, sticky=tk.W+tk.E)
+        self.parameters_frame.columnconfigure(1, weight=1)
+    
+    def on_parameter_slider(self, plotter, curve, name, value):
+        # Tk also calls this after slider.set(); a value the curve already has is not a change
+        if abs(value - curve.parameters[name]) > self.slider_resolution / 2:
+            plotter.set_parameter(curve, name, value)
+    
+    def on_config_changed(self, plotters):
+        if self.selected_plotter in plotters:
+            self.update_config_fields(self.selected_plotter)
+    
+    def update_function_list(self):
+        curves = self.selected_plotter.curves if self.selected_plotter else []
+        self.function_list.set_curves(curves)
     
     def remove_function(self, index):
         """Remove a function from the selected plotter"""
         if self.selected_plotter:
-            if self.selected_plotter.remove_function(index):
-                self.update_function_list()
+            self.selected_plotter.remove_function(index)
+    
+    def remove_curve(self, curve):
+        """Remove the function shown in a function list row"""
+        if self.selected_plotter and curve in self.selected_plotter.curves:
+            self.remove_function(self.selected_plotter.curves.index(curve))
+    
+    def derive_curve(self, curve, kind):
+        """Add the derivative or integral of the function shown in a function list row"""
+        if self.selected_plotter and curve in self.selected_plotter.curves:
+            self.selected_plotter.derive_curve(curve, kind)
     
     def apply_config(self):
         """Apply configuration to selected plotter"""
@@ -569,20 +2769,34 @@ class MultiPlotterApp(tk.Tk):
             y_min = self.y_min_var.get()
             y_max = self.y_max_var.get()
             grid_spacing = self.grid_var.get()
+            autoscale = self.autoscale_var.get()
+            percentile = float(self.clip_var.get()) if self.clip_var.get().strip() else None
             
             # Validate ranges
             if x_min >= x_max:
                 raise ValueError("X minimum must be less than X maximum")
-            if y_min >= y_max:
+            if y_min >= y_max and not autoscale:
                 raise ValueError("Y minimum must be less than Y maximum")
             if grid_spacing <= 0:
                 raise ValueError("Grid spacing must be positive")
+            if percentile is not None and not 0 <= percentile < 50:
+                raise ValueError("Clip percentage must be between 0 and 50")
+            x_scale_type = self.x_scale_var.get()
+            y_scale_type = self.y_scale_var.get()
+            if x_scale_type == "log" and x_min <= 0:
+                raise ValueError("A log x axis needs a positive X minimum")
+            if y_scale_type == "log" and y_min <= 0 and not autoscale:
+                raise ValueError("A log y axis needs a positive Y minimum")
             
-            # Apply to plotter
+            # Apply to plotter; joining a link group first moves the whole group to these ranges
+            link = self.link_var.get()
+            self.link_plotter(self.selected_plotter, None if link == "none" else link, self.link_y_var.get())
             self.selected_plotter.set_title(title)
+            self.selected_plotter.set_scales(x_scale_type, y_scale_type)
+            self.selected_plotter.set_autoscale(autoscale, percentile)
             self.selected_plotter.set_ranges(
                 x_range=(x_min, x_max),
-                y_range=(y_min, y_max),
+                y_range=None if autoscale else (y_min, y_max),
                 grid_spacing=grid_spacing
             )
         except ValueError as e:
@@ -596,6 +2810,14 @@ class MultiPlotterApp(tk.Tk):
         self.y_min_var.set(plotter.y_range[0])
         self.y_max_var.set(plotter.y_range[1])
         self.grid_var.set(plotter.grid_spacing)
+        self.autoscale_var.set(plotter.autoscale)
+        self.x_scale_var.set(plotter.x_scale_type)
+        self.y_scale_var.set(plotter.y_scale_type)
+        self.clip_var.set("" if plotter.autoscale_percentile is None else plotter.autoscale_percentile)
+        self.features_var.set(plotter.show_features)
+        self.minimap_var.set(plotter.minimap is not None)
+        self.link_var.set(plotter.link.name if plotter.link is not None else "none")
+        self.link_y_var.set(plotter.link is not None and plotter.link.link_y)
     
     def toggle_config_buttons(self, enable):
         """Enable or disable configuration buttons"""
@@ -613,14 +2835,7 @@ class MultiPlotterApp(tk.Tk):
         func_str = self.func_var.get()
         name = self.func_name_var.get() or f"Function {len(self.selected_plotter.curves) + 1}"
         color = self.func_color_var.get()
-        try:
-            # Compile the function string into a lambda expression
-            code = compile(func_str, "<string>", "eval")
-            def func(x):
-                return eval(code, {"x": x, "math": math})
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"Failed to parse function: {e}")
-            return
+        curve_type = self.curve_type_var.get()
         
         # Handle domain restrictions and endpoint values
         try:
@@ -631,21 +2846,70 @@ class MultiPlotterApp(tk.Tk):
         except ValueError as e:
             tk.messagebox.showerror("Invalid Input", f"Invalid domain or endpoint values: {e}")
             return
-        self.select_plotter: FunctionPlotter
-        self.selected_plotter.add_function(func, name, color, start_time, end_time, start_value, end_value)
-        self.update_function_list()
+        
+        try:
+            if curve_type == "function":
+                # Names other than x become parameters with a slider each, starting at 1
+                expressions.check_functions(func_str)
+                parameters = dict.fromkeys(expressions.free_names(func_str), 1.0)
+                func = expressions.compile_expression(func_str, ("x", *parameters))
+                self.selected_plotter.add_function(func, name, color, start_time, end_time, start_value, end_value,
+                                                   expression=func_str, parameters=parameters)
+                return
+            
+            # For parametric and polar curves the domain restriction is the range of t
+            t_range = (start_time if start_time is not None else 0.0,
+                       end_time if end_time is not None else 2 * math.pi)
+            if curve_type == "parametric":
+                parts = func_str.split(";")
+                if len(parts) != 2:
+                    raise ValueError("enter x(t) and y(t) separated by ';'")
+                curve = ParametricCurve(parts[0].strip(), parts[1].strip(), name, color, t_range)
+            elif curve_type == "polar":
+                curve = PolarCurve(func_str, name, color, t_range)
+            elif curve_type == "family":
+                expression, parameter, values, count = parse_family(func_str)
+                curve = FamilyCurve(expression, name, color, parameter, values, count)
+            elif curve_type == "piecewise":
+                curve = PiecewiseCurve(parse_pieces(func_str), name, color)
+            elif curve_type == "implicit":
+                curve = ImplicitCurve(func_str, name, color)
+            else:
+                curve = HeatmapCurve(func_str, name, color, levels=10 if curve_type == "filled contour" else None)
+        except Exception as e:
+            tk.messagebox.showerror("Error", f"Failed to parse function: {e}")
+            return
+        self.selected_plotter.add_curve(curve)
     
     def clear_functions(self):
         """Clear all functions from the selected plotter"""
         if self.selected_plotter:
             self.selected_plotter.clear_all()
-            self.update_function_list()
 
 
-def main():
-    app = MultiPlotterApp()
+def main(fast_start=True, startup_report=False):
+    app = MultiPlotterApp(fast_start=fast_start)
+    
+    # The first idle callback runs once the initial layout and paint have been processed. The first
+    # plot is timed by the scheduler when it is drawn, and printed after the report as it comes in
+    shown_started = time.perf_counter()
+    def on_shown():
+        startup_timer.record("show window", time.perf_counter() - shown_started)
+        if startup_report:
+            startup_timer.report()
+    app.after_idle(on_shown)
+    
     app.mainloop()
 
 
+startup_timer.record("import modules", time.perf_counter() - _module_started)
+
+
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Multi-function plotter")
+    parser.add_argument("--no-fast-start", action="store_true",
+                        help="build every panel and import NumPy and the plotting modules before showing the window")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long imports, widget construction and the first render took")
+    args = parser.parse_args()
+    main(fast_start=not args.no_fast_start, startup_report=args.startup_report)
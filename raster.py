@@ -0,0 +1,93 @@
+import tkinter as tk
+import numpy as np
+
+
+def new_raster(width, height, background=(255, 255, 255)):
+    """Create an RGB pixel array filled with the background color"""
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    rgb[:] = background
+    return rgb
+
+
+def draw_polyline(rgb, coords, color, width=1, dash=None):
+    """Draw a polyline given as flat canvas coordinates into an RGB array"""
+    points = np.asarray(coords, dtype=float).reshape(-1, 2)
+    if len(points) < 2:
+        return
+
+    # Walk every segment one pixel at a time
+    start, end = points[:-1], points[1:]
+    steps = np.ceil(np.abs(end - start).max(axis=1)).astype(int) + 1
+    segment = np.repeat(np.arange(len(start)), steps)
+    offset = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = offset / np.maximum(steps[segment] - 1, 1)
+    pixels = start[segment] + (end[segment] - start[segment]) * t[:, None]
+
+    # Dash patterns are (on, off) lengths in pixels
+    if dash:
+        on, off = dash[0], dash[1] if len(dash) > 1 else dash[0]
+        pixels = pixels[offset % (on + off) < on]
+
+    xs = np.rint(pixels[:, 0]).astype(int)
+    ys = np.rint(pixels[:, 1]).astype(int)
+    height, width_px = rgb.shape[:2]
+
+    # Thicken lines by stamping neighbouring pixels
+    for dx in range(width):
+        for dy in range(width):
+            px, py = xs + dx - width // 2, ys + dy - width // 2
+            inside = (px >= 0) & (px < width_px) & (py >= 0) & (py < height)
+            rgb[py[inside], px[inside]] = color
+
+
+def fill_rectangle(rgb, x0, y0, x1, y1, color):
+    """Fill an axis-aligned rectangle, clipped to the array"""
+    height, width = rgb.shape[:2]
+    x0, x1 = sorted((max(int(x0), 0), min(int(x1), width)))
+    y0, y1 = sorted((max(int(y0), 0), min(int(y1), height)))
+    rgb[y0:y1, x0:x1] = color
+
+
+# Colormaps as evenly spaced anchor colors, interpolated into lookup tables
+COLORMAPS = {
+    "viridis": [(68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98), (253, 231, 37)],
+    "magma": [(0, 0, 4), (81, 18, 124), (183, 55, 121), (252, 137, 97), (252, 253, 191)],
+    "coolwarm": [(59, 76, 192), (141, 176, 254), (221, 221, 221), (244, 154, 123), (180, 4, 38)],
+    "gray": [(0, 0, 0), (255, 255, 255)],
+}
+
+
+def colormap_lut(name, size=256):
+    """Build a (size, 3) uint8 lookup table for a named colormap"""
+    anchors = np.asarray(COLORMAPS[name], dtype=float)
+    positions = np.linspace(0, 1, len(anchors))
+    steps = np.linspace(0, 1, size)
+    return np.stack([np.interp(steps, positions, anchors[:, i]) for i in range(3)], axis=1).round().astype(np.uint8)
+
+
+def apply_colormap(values, lut, low=None, high=None, levels=None, background=(255, 255, 255)):
+    """Color a 2D array through a lookup table over low..high, optionally in flat bands"""
+    finite = np.isfinite(values)
+    if low is None or high is None:
+        if not finite.any():
+            rgb = np.empty(values.shape + (3,), dtype=np.uint8)
+            rgb[:] = background
+            return rgb
+        low, high = values[finite].min(), values[finite].max()
+    scale = (len(lut) - 1) / (high - low) if high > low else 0.0
+    with np.errstate(invalid="ignore"):
+        index = np.clip((values - low) * scale, 0, len(lut) - 1)
+    if levels:
+        band = np.minimum(np.floor(index * (levels / (len(lut) - 1))), levels - 1)
+        index = band * ((len(lut) - 1) / max(levels - 1, 1))
+    index = np.where(finite, index, 0).astype(np.intp)
+    rgb = lut[index]
+    rgb[~finite] = background
+    return rgb
+
+
+def photo_image(rgb, master=None):
+    """Turn an RGB array into a PhotoImage with a single bulk PPM transfer"""
+    height, width = rgb.shape[:2]
+    header = f"P6 {width} {height} 255 ".encode("ascii")
+    return tk.PhotoImage(master=master, data=header + np.ascontiguousarray(rgb).tobytes(), format="PPM")
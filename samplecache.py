@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import zipfile
+import numpy as np
+
+
+def default_directory():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tkplot", "samples")
+
+
+def address(identity, key):
+    """Content address of a curve's samples: a hash of what the curve computes and the grid it is sampled on"""
+    text = json.dumps([identity, list(key)], sort_keys=True, default=float)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SampleCache:
+    """On-disk cache of sampled (xs, ys) arrays under a size cap, evicting least recently used files"""
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.entries = None  # Address -> [size, last use], read from the directory on first use
+        self.total_bytes = 0
+        self.lock = threading.Lock()  # Guards entries, total_bytes and pending against the writer thread
+        self.writes = queue.Queue()
+        self.pending = {}  # Address -> samples queued but not yet on disk
+        self.writer = None
+
+    def path(self, name):
+        return os.path.join(self.directory, name + ".npz")
+
+    def load_index(self):
+        self.entries = {}
+        self.total_bytes = 0
+        try:
+            with os.scandir(self.directory) as listing:
+                for entry in listing:
+                    if entry.name.endswith(".npz"):
+                        info = entry.stat()
+                        self.entries[entry.name[:-4]] = [info.st_size, info.st_mtime]
+                        self.total_bytes += info.st_size
+        except OSError:
+            pass
+
+    def get(self, name):
+        """Return the cached (xs, ys) for an address, or None"""
+        with self.lock:
+            if name in self.pending:
+                return self.pending[name]
+            if self.entries is None:
+                self.load_index()
+            if name not in self.entries:
+                return None
+            try:
+                with np.load(self.path(name)) as data:
+                    samples = (data["xs"], data["ys"])
+                os.utime(self.path(name))
+                self.entries[name][1] = os.path.getmtime(self.path(name))
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                # Unreadable entries are treated as misses and removed
+                self.discard(name)
+                return None
+        return samples
+
+    def put(self, name, samples):
+        """Queue (xs, ys) to be stored under an address by the writer thread"""
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_queued, daemon=True)
+            self.writer.start()
+        with self.lock:
+            self.pending[name] = samples
+        self.writes.put((name, samples))
+
+    def write_queued(self):
+        while True:
+            name, samples = self.writes.get()
+            try:
+                self.write(name, samples)
+            finally:
+                with self.lock:
+                    if self.pending.get(name) is samples:
+                        del self.pending[name]
+                self.writes.task_done()
+
+    def flush(self):
+        """Wait until every queued write has been stored"""
+        self.writes.join()
+
+    def write(self, name, samples):
+        """Store (xs, ys) under an address, then evict old entries until the cache fits its cap"""
+        with self.lock:
+            if self.entries is None:
+                self.load_index()
+        xs, ys = samples
+        path = self.path(name)
+        temporary = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as f:
+                np.savez_compressed(f, xs=xs, ys=ys)
+            os.replace(temporary, path)
+            size = os.path.getsize(path)
+            modified = os.path.getmtime(path)
+        except OSError:
+            return
+
+        with self.lock:
+            if name in self.entries:
+                self.total_bytes -= self.entries[name][0]
+            self.entries[name] = [size, modified]
+            self.total_bytes += size
+            self.evict()
+
+    def evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for name in sorted(self.entries, key=lambda name: self.entries[name][1]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.discard(name)
+
+    def discard(self, name):
+        size, _ = self.entries.pop(name, (0, 0))
+        self.total_bytes -= size
+        try:
+            os.remove(self.path(name))
+        except OSError:
+            pass
+
+
+_shared = None
+
+
+def shared():
+    """The sample cache shared by all plotters, created on first use"""
+    global _shared
+    if _shared is None:
+        _shared = SampleCache()
+    return _shared
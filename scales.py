@@ -0,0 +1,138 @@
+import math
+import numpy as np
+import ticks
+
+
+class LinearScale:
+    """Plain linear axis"""
+
+    name = "linear"
+
+    def forward(self, values):
+        return np.asarray(values, dtype=float)
+
+    def inverse(self, values):
+        return np.asarray(values, dtype=float)
+
+    def valid_range(self, low, high):
+        return low < high
+
+    def grid(self, start, end, num_points):
+        """Sample positions spaced evenly on screen between start and end"""
+        return self.inverse(np.linspace(self.forward(start), self.forward(end), num_points))
+
+    def tick_spacing(self, low, high, spacing):
+        """Distance between major ticks for a view, given the plot's grid spacing"""
+        return spacing
+
+    def ticks(self, low, high, spacing):
+        """Return (major, minor) tick values between low and high"""
+        count = int(math.floor((high - low) / spacing + 1e-9)) + 1
+        return [low + spacing * i for i in range(count)], []
+
+    def label(self, value, spacing):
+        return str(round(value, ticks.tick_decimals(spacing)))
+
+    def readout(self, value):
+        """Text for a single value, such as the crosshair position"""
+        return f"{value:.4g}"
+
+
+class LogScale(LinearScale):
+    """Base-10 logarithmic axis; only positive values can be shown"""
+
+    name = "log"
+
+    def forward(self, values):
+        values = np.asarray(values, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(values > 0, np.log10(values), np.nan)
+
+    def inverse(self, values):
+        return np.power(10.0, np.asarray(values, dtype=float))
+
+    def valid_range(self, low, high):
+        return 0 < low < high
+
+    def ticks(self, low, high, spacing):
+        if not self.valid_range(low, high):
+            return [], []
+        # Majors on whole decades, thinned out when the range spans many of them
+        first, last = math.ceil(math.log10(low) - 1e-9), math.floor(math.log10(high) + 1e-9)
+        stride = max(1, math.ceil((last - first + 1) / 10))
+        major = [10.0 ** k for k in range(first, last + 1, stride)]
+
+        # Minors at 2..9 times each decade, only when they are not too dense
+        minor = []
+        if stride == 1 and last - first < 6:
+            for k in range(first - 1, last + 1):
+                minor.extend(m * 10.0 ** k for m in range(2, 10) if low <= m * 10.0 ** k <= high)
+        return major, minor
+
+    def label(self, value, spacing):
+        return f"{value:g}"
+
+
+class SymlogScale(LinearScale):
+    """Symmetric log axis: linear within +-linthresh of zero, logarithmic outside"""
+
+    name = "symlog"
+
+    def __init__(self, linthresh=1.0):
+        self.linthresh = linthresh
+
+    def forward(self, values):
+        values = np.asarray(values, dtype=float)
+        return np.sign(values) * np.log10(1 + np.abs(values) / self.linthresh)
+
+    def inverse(self, values):
+        values = np.asarray(values, dtype=float)
+        return np.sign(values) * self.linthresh * (np.power(10.0, np.abs(values)) - 1)
+
+    def ticks(self, low, high, spacing):
+        major = [0.0] if low <= 0 <= high else []
+        limit = max(abs(low), abs(high))
+        k = 0
+        while self.linthresh * 10.0 ** k <= limit:
+            value = self.linthresh * 10.0 ** k
+            major.extend(v for v in (-value, value) if low <= v <= high)
+            k += 1
+        return sorted(major), []
+
+    def label(self, value, spacing):
+        return f"{value:g}"
+
+
+class TimeScale(LinearScale):
+    """Linear axis of float64 epoch seconds with calendar ticks in UTC and labels cached per step"""
+
+    name = "time"
+    max_labels = 4096
+
+    def __init__(self):
+        self.labels = {}  # (step length, tick value) -> label
+
+    def tick_spacing(self, low, high, spacing):
+        return ticks.time_step(high - low)[2]
+
+    def ticks(self, low, high, spacing):
+        return ticks.time_ticks(low, high, ticks.step_for_spacing(spacing)), []
+
+    def label(self, value, spacing):
+        key = (spacing, value)
+        if key not in self.labels:
+            if len(self.labels) >= self.max_labels:
+                self.labels = {}
+            self.labels[key] = ticks.time_label(value, ticks.step_for_spacing(spacing))
+        return self.labels[key]
+
+    def readout(self, value):
+        return f"{ticks.time_label(value, ('year', 1, 0))} {ticks.time_label(value, ('day', 1, 0))} " \
+               f"{ticks.time_label(value, ('millisecond', 1, 0))}"
+
+
+SCALES = {scale.name: scale for scale in (LinearScale(), LogScale(), SymlogScale(), TimeScale())}
+
+
+def get_scale(name):
+    return SCALES[name]
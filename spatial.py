@@ -0,0 +1,87 @@
+import math
+import numpy as np
+
+
+class SegmentGrid:
+    """Uniform grid of canvas cells holding each curve's drawn segments as a replaceable layer"""
+
+    def __init__(self, cell_size=16):
+        self.cell_size = cell_size
+        self.layers = {}  # Layer key -> (x0, y0, x1, y1, sample index, cells it occupies)
+        self.cells = {}  # (column, row) -> {layer key: positions of its segments in that layer}
+
+    def set_layer(self, key, xs, ys, visible):
+        """Index the segments between consecutive visible points, replacing the layer's old ones"""
+        self.remove_layer(key)
+        starts = np.flatnonzero(visible[:-1] & visible[1:])
+        if not starts.size:
+            return
+        x0, y0, x1, y1 = xs[starts], ys[starts], xs[starts + 1], ys[starts + 1]
+
+        # Cell ranges covered by each segment's bounding box, expanded into one entry per cell
+        size = self.cell_size
+        column0 = np.floor(np.minimum(x0, x1) / size).astype(int)
+        row0 = np.floor(np.minimum(y0, y1) / size).astype(int)
+        columns = np.floor(np.maximum(x0, x1) / size).astype(int) - column0 + 1
+        rows = np.floor(np.maximum(y0, y1) / size).astype(int) - row0 + 1
+        counts = columns * rows
+        segment = np.repeat(np.arange(len(starts)), counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_columns = column0[segment] + offset % columns[segment]
+        cell_rows = row0[segment] + offset // columns[segment]
+
+        # Group the segment positions by cell
+        order = np.lexsort((cell_rows, cell_columns))
+        cell_columns, cell_rows, segment = cell_columns[order], cell_rows[order], segment[order]
+        boundaries = np.flatnonzero((np.diff(cell_columns) != 0) | (np.diff(cell_rows) != 0)) + 1
+        cells = list(zip(cell_columns[np.r_[0, boundaries]].tolist(), cell_rows[np.r_[0, boundaries]].tolist()))
+        for cell, positions in zip(cells, np.split(segment, boundaries)):
+            self.cells.setdefault(cell, {})[key] = positions
+        self.layers[key] = (x0, y0, x1, y1, starts, cells)
+
+    def remove_layer(self, key):
+        layer = self.layers.pop(key, None)
+        if layer is None:
+            return
+        for cell in layer[5]:
+            entries = self.cells[cell]
+            del entries[key]
+            if not entries:
+                del self.cells[cell]
+
+    def retain(self, keys):
+        """Drop every layer whose key is not in keys"""
+        for key in [key for key in self.layers if key not in keys]:
+            self.remove_layer(key)
+
+    def clear(self):
+        self.layers = {}
+        self.cells = {}
+
+    def nearest(self, x, y, radius=6):
+        """Return (layer key, nearer sample index, distance) of the closest segment within radius of (x, y), or None"""
+        size = self.cell_size
+        reach = math.ceil(radius / size)
+        column, row = math.floor(x / size), math.floor(y / size)
+        candidates = {}
+        for cell_column in range(column - reach, column + reach + 1):
+            for cell_row in range(row - reach, row + reach + 1):
+                for key, positions in self.cells.get((cell_column, cell_row), {}).items():
+                    candidates.setdefault(key, []).append(positions)
+
+        best = None
+        for key, positions in candidates.items():
+            positions = np.unique(np.concatenate(positions))
+            x0, y0, x1, y1, starts, _ = self.layers[key]
+            x0, y0, x1, y1 = x0[positions], y0[positions], x1[positions], y1[positions]
+
+            # Distance to each segment through the closest point on it
+            dx, dy = x1 - x0, y1 - y0
+            length = dx * dx + dy * dy
+            with np.errstate(invalid="ignore", divide="ignore"):
+                t = np.clip(np.where(length > 0, ((x - x0) * dx + (y - y0) * dy) / length, 0.0), 0.0, 1.0)
+            distances = np.hypot(x0 + t * dx - x, y0 + t * dy - y)
+            i = int(np.argmin(distances))
+            if distances[i] <= radius and (best is None or distances[i] < best[2]):
+                best = (key, int(starts[positions[i]]) + (1 if t[i] > 0.5 else 0), float(distances[i]))
+        return best
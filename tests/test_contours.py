@@ -0,0 +1,30 @@
+import numpy as np
+import contours
+
+
+def pixels_to_units(scale=40.0, width=400, height=300):
+    return (lambda pixels: (np.asarray(pixels) - width / 2) / scale,
+            lambda pixels: (height / 2 - np.asarray(pixels)) / scale)
+
+
+def test_circle_is_traced_as_one_closed_loop():
+    x_of, y_of = pixels_to_units()
+    xs, ys = contours.implicit_polylines(lambda x, y: x ** 2 + y ** 2 - 4.0, 400, 300, x_of, y_of)
+    loops = np.split(np.arange(len(xs)), np.flatnonzero(np.isnan(xs)) + 1)
+    loops = [loop for loop in loops if len(loop) > 1]
+    assert len(loops) == 1
+    radius = np.hypot(xs, ys)
+    np.testing.assert_allclose(radius[np.isfinite(radius)], 2.0, atol=0.02)
+
+
+def test_contours_smaller_than_a_cell_are_found():
+    x_of, y_of = pixels_to_units()
+    xs, ys = contours.implicit_polylines(lambda x, y: x ** 2 + y ** 2 - 0.01, 400, 300, x_of, y_of)
+    assert np.isfinite(xs).sum() > 4
+    np.testing.assert_allclose(np.hypot(xs, ys)[np.isfinite(xs)], 0.1, atol=0.02)
+
+
+def test_no_zero_gives_no_lines():
+    x_of, y_of = pixels_to_units()
+    xs, ys = contours.implicit_polylines(lambda x, y: x ** 2 + y ** 2 + 1.0, 400, 300, x_of, y_of)
+    assert len(xs) == 0 and len(ys) == 0
@@ -0,0 +1,237 @@
+import math
+import numpy as np
+import pytest
+import plot_tk_v2
+import samplecache
+import watchdog
+
+
+class Plotter:
+    """Stands in for a FunctionPlotter, sampling curves over a fixed number of points"""
+
+    def __init__(self, x_range, num_points=401):
+        self.x_range = x_range
+        self.num_points = num_points
+
+    def sample_curve(self, curve):
+        return curve.sample(*self.x_range, self.num_points)
+
+
+def test_integral_is_anchored_at_zero_when_zero_is_offscreen():
+    integral = plot_tk_v2.DerivedCurve(plot_tk_v2.Curve(math.sin, "sin", "blue"), "integral")
+    xs, values = integral.sample_for(Plotter((1.0, 5.0)))
+    np.testing.assert_allclose(values, 1.0 - np.cos(xs), atol=1e-4)
+
+
+def test_panning_does_not_shift_the_integral():
+    parent = plot_tk_v2.Curve(math.sin, "sin", "blue")
+    integral = plot_tk_v2.DerivedCurve(parent, "integral")
+    seen = {}
+    for x_range in [(-2.0, 2.0), (1.0, 5.0), (3.0, 7.0), (-6.0, -1.0)]:
+        xs, values = integral.sample_for(Plotter(x_range))
+        for x, value in zip(xs, values):
+            seen.setdefault(round(x, 6), []).append(value)
+    shared = [values for values in seen.values() if len(values) > 1]
+    assert shared
+    for values in shared:
+        assert max(values) - min(values) < 1e-4
+
+
+def test_integral_of_a_restricted_domain_ignores_what_lies_outside_it():
+    parent = plot_tk_v2.Curve(lambda x: 1.0, "one", "blue", start_time=2.0)
+    integral = plot_tk_v2.DerivedCurve(parent, "integral")
+    xs, values = integral.sample_for(Plotter((3.0, 4.0)))
+    np.testing.assert_allclose(values, xs - 2.0, atol=1e-3)
+
+
+def test_derivative():
+    derivative = plot_tk_v2.DerivedCurve(plot_tk_v2.Curve(math.sin, "sin", "blue"), "derivative")
+    xs, values = derivative.sample_for(Plotter((1.0, 5.0)))
+    np.testing.assert_allclose(values[1:-1], np.cos(xs[1:-1]), atol=1e-3)
+
+
+class FeaturePlotter:
+    """Stands in for a FunctionPlotter when searching features, with a canvas that ignores drawing"""
+
+    draw_features = plot_tk_v2.FunctionPlotter.draw_features
+    mark_slow = plot_tk_v2.FunctionPlotter.mark_slow
+    mark_failed = plot_tk_v2.FunctionPlotter.mark_failed
+    feature_colors = plot_tk_v2.FunctionPlotter.feature_colors
+
+    def __init__(self, curves, x_range=(-1.0, 1.0), y_range=(-2.0, 2.0)):
+        self.curves = curves
+        self.x_range = x_range
+        self.y_range = y_range
+        self.feature_index = None
+        self.visible_features = []
+        self.canvas = self
+        self.events = []
+
+    def create_oval(self, *args, **kwargs):
+        pass
+
+    def to_canvas_x(self, values):
+        return np.asarray(values, dtype=float)
+
+    to_canvas_y = to_canvas_x
+
+    def notify(self, event):
+        self.events.append(event)
+
+    def after_idle(self, callback):
+        pass
+
+    def update_plot(self):
+        pass
+
+
+def expression_curve(text, x_range=(-1.0, 1.0)):
+    curve = plot_tk_v2.Curve(plot_tk_v2.expressions.compile_expression(text), text, "blue", expression=text)
+    xs = np.linspace(*x_range, 201)
+    curve.samples = (xs, curve.func.evaluate_array(x=xs))
+    return curve
+
+
+@pytest.fixture
+def short_watchdog(monkeypatch):
+    dog = watchdog.Watchdog(budget=0.3)
+    monkeypatch.setattr(watchdog, "_shared", dog)
+    yield dog
+    dog.kill()
+
+
+def test_scalar_overflow_is_a_gap():
+    curve = plot_tk_v2.Curve(lambda x: math.exp(x ** 2), "f", "blue")
+    assert math.isnan(curve.evaluate(100.0))
+
+
+def test_features_are_refined_in_the_worker(short_watchdog):
+    plotter = FeaturePlotter([expression_curve("x - 0.25"), expression_curve("0.5 - x")])
+    plotter.draw_features()
+    kinds = sorted((kind, round(x, 9)) for x, _, kind, _ in plotter.visible_features)
+    assert kinds == [("intersection", 0.375), ("root", 0.25), ("root", 0.5)]
+    assert short_watchdog.process is not None
+
+
+def test_a_hanging_scalar_evaluation_does_not_freeze_the_feature_search(short_watchdog):
+    # Over an array the loop is empty; at a single point it runs for minutes
+    hanging = expression_curve("x - 0.4037 + 0 * sum(range(10 ** 10 * (x.shape == ())))")
+    overflowing = expression_curve("math.exp(x ** 2 * 1000) - 2")
+    plotter = FeaturePlotter([hanging, overflowing])
+    plotter.draw_features()
+    assert hanging.too_slow and not hanging.skipped
+    assert not overflowing.too_slow and overflowing.error is None
+    assert [kind for _, _, kind, _ in plotter.visible_features] == ["root", "min", "root"]
+
+
+class SlowCurve(plot_tk_v2.Curve):
+    def sample_for(self, plotter):
+        self.calls += 1
+        raise watchdog.EvaluationTimeout("too slow")
+
+
+def test_a_timeout_is_retried_on_a_later_frame():
+    curve = SlowCurve(math.sin, "sin", "blue")
+    curve.calls = 0
+    plotter = FeaturePlotter([curve])
+    plotter.sample_curve = plot_tk_v2.FunctionPlotter.sample_curve.__get__(plotter)
+    scheduled = []
+    plotter.after_idle = scheduled.append
+
+    assert plotter.sample_curve(curve) is None
+    assert curve.calls == 1 and curve.too_slow and scheduled == [plotter.update_plot]
+    assert plotter.sample_curve(curve) is None
+    assert curve.calls == 2 and curve.skipped and scheduled == [plotter.update_plot]
+    assert plotter.sample_curve(curve) is None
+    assert curve.calls == 2
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    cache = samplecache.SampleCache(str(tmp_path))
+    monkeypatch.setattr(samplecache, "_shared", cache)
+    return cache
+
+
+def test_plain_functions_with_a_cache_key_are_kept_on_disk(disk_cache):
+    calls = []
+
+    def simulation(x):
+        calls.append(x)
+        return x * 2
+
+    curve = plot_tk_v2.Curve(simulation, "sim", "blue", cache_key=("simulation", 1))
+    curve.persist_seconds = 0.0
+    xs, ys = curve.sample(0.0, 1.0, 50)
+    disk_cache.flush()
+    assert len(calls) == 50
+
+    again = plot_tk_v2.Curve(simulation, "renamed", "red", cache_key=("simulation", 1))
+    np.testing.assert_array_equal(again.sample(0.0, 1.0, 50)[1], ys)
+    assert len(calls) == 50
+    changed = plot_tk_v2.Curve(simulation, "sim", "blue", cache_key=("simulation", 2))
+    changed.sample(0.0, 1.0, 50)
+    assert len(calls) == 100
+
+
+def test_plain_functions_without_a_cache_key_stay_off_disk(disk_cache):
+    curve = plot_tk_v2.Curve(math.sin, "sin", "blue")
+    curve.persist_seconds = 0.0
+    curve.sample(0.0, 1.0, 50)
+    disk_cache.flush()
+    assert curve.cache_identity() is None and disk_cache.entries in (None, {})
+
+
+def test_a_curve_found_too_slow_starts_thinned_out_next_time(disk_cache):
+    curve = expression_curve("math.sin(x)")
+    plotter = FeaturePlotter([curve])
+    plotter.mark_slow(curve)
+    disk_cache.flush()
+
+    # Its thinned-out samples are kept however quickly they were taken
+    curve.sample(0.0, 1.0, 10)
+    disk_cache.flush()
+    assert len(disk_cache.entries) == 2
+
+    reopened = expression_curve("math.sin(x)")
+    reopened.recall_slow()
+    assert reopened.too_slow and reopened.stride == plot_tk_v2.Curve.slow_stride
+    other = expression_curve("math.cos(x)")
+    other.recall_slow()
+    assert not other.too_slow
+
+
+class ViewPlotter:
+    """Stands in for a FunctionPlotter's view: ranges, canvas size and linear pixel mapping"""
+
+    x_scale_type = y_scale_type = "linear"
+
+    def __init__(self, x_range=(-2.0, 2.0), y_range=(-2.0, 2.0), size=(200, 100)):
+        self.x_range, self.y_range, self.size = x_range, y_range, size
+
+    def canvas_size(self):
+        return self.size
+
+    def to_canvas_x(self, values):
+        low, high = self.x_range
+        return (np.asarray(values, dtype=float) - low) * self.size[0] / (high - low)
+
+    def to_canvas_y(self, values):
+        low, high = self.y_range
+        return (high - np.asarray(values, dtype=float)) * self.size[1] / (high - low)
+
+
+def test_autoscale_keeps_parametric_samples_taken_before_the_fit(disk_cache, monkeypatch):
+    curve = plot_tk_v2.ParametricCurve("math.cos(t)", "math.sin(t)", "circle", "blue")
+    calls = []
+    monkeypatch.setattr(plot_tk_v2, "evaluate_array", lambda func, **arrays: calls.append(func) or
+                        func.evaluate_array(**arrays))
+    plotter = ViewPlotter()
+    samples = curve.sample_for(plotter)
+    evaluated = len(calls)
+
+    plotter.y_range = (-1.5, 1.5)
+    curve.follow_y_range(plotter)
+    assert curve.sample_for(plotter) is samples
+    assert len(calls) == evaluated
+    assert not plot_tk_v2.ParametricCurve.traced_in_view and plot_tk_v2.ImplicitCurve.traced_in_view
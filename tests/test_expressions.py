@@ -0,0 +1,107 @@
+import math
+import numpy as np
+import pytest
+import expressions
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    expressions.MEMO.clear()
+    yield
+    expressions.MEMO.clear()
+
+
+def test_split_results_match_plain_evaluation():
+    xs = np.linspace(-3.0, 3.0, 101)
+    for text in ["math.sin(x) * math.cos(x) + x ** 2", "-x / (1 + x * x)", "math.exp(-x) > 0.5", "math.log(x)"]:
+        expression = expressions.compile_expression(text)
+        assert expression.steps
+        with np.errstate(all="ignore"):
+            expected = eval(text, {"math": expressions.ARRAY_MATH, "x": xs})
+        np.testing.assert_array_equal(expression.evaluate_array(x=xs), expected)
+
+
+def test_shared_subexpressions_are_computed_once():
+    xs = np.linspace(0.0, 1.0, 50)
+    expressions.compile_expression("math.sin(x) * 2").evaluate_array(x=xs)
+    entries = len(expressions.MEMO.values)
+    expressions.compile_expression("math.sin(x) + 1").evaluate_array(x=xs)
+    # Only the new outer sum is added, math.sin(x) is reused
+    assert len(expressions.MEMO.values) == entries + 1
+
+
+def test_a_shared_subtree_is_evaluated_once(monkeypatch):
+    calls = []
+
+    def sin(x):
+        calls.append(x)
+        return np.sin(x)
+
+    monkeypatch.setattr(expressions.ARRAY_MATH, "sin", sin)
+    xs = np.linspace(0.0, 1.0, 50)
+    first = expressions.compile_expression("math.sin(x * 2) * 3").evaluate_array(x=xs)
+    second = expressions.compile_expression("1 - math.sin(x * 2)").evaluate_array(x=xs.copy())
+    assert len(calls) == 1
+    np.testing.assert_allclose(first, np.sin(xs * 2) * 3)
+    np.testing.assert_allclose(second, 1 - np.sin(xs * 2))
+
+
+def test_changed_inputs_do_not_hit_stale_values():
+    expression = expressions.compile_expression("x * 3")
+    first = expression.evaluate_array(x=np.arange(4.0))
+    second = expression.evaluate_array(x=np.arange(4.0) + 1)
+    np.testing.assert_array_equal(first, [0, 3, 6, 9])
+    np.testing.assert_array_equal(second, [3, 6, 9, 12])
+
+
+def test_subtrees_are_keyed_only_by_the_names_they_read():
+    expression = expressions.compile_expression("math.sin(x) + a", ("x", "a"))
+    xs = np.linspace(0.0, 1.0, 20)
+    expression.evaluate_array(x=xs, a=np.float64(1.0))
+    entries = len(expressions.MEMO.values)
+    result = expression.evaluate_array(x=xs, a=np.float64(2.0))
+    # Changing a only recomputes the sum, not math.sin(x)
+    assert len(expressions.MEMO.values) == entries + 1
+    np.testing.assert_allclose(result, np.sin(xs) + 2.0)
+
+
+def test_impure_expressions_are_not_split():
+    for text in ["x if x > 0 else -x", "abs(x)", "[x][0]", "math.sin(x=x)"]:
+        assert expressions.compile_expression(text).steps is None
+    xs = np.array([-1.0, 2.0])
+    np.testing.assert_array_equal(expressions.compile_expression("x if x > 0 else -x").evaluate_array(x=xs), [1, 2])
+
+
+def test_memo_evicts_least_recently_used_values():
+    memo = expressions.SubexpressionMemo(max_bytes=3 * 80)
+    for key in "abc":
+        memo.put(key, np.zeros(10))
+    memo.get("a")
+    memo.put("d", np.zeros(10))
+    assert set(memo.values) == {"a", "c", "d"}
+    memo.put("huge", np.zeros(1000))
+    assert "huge" not in memo.values
+    assert memo.total_bytes == 240
+
+
+def test_scalar_call_and_loop_fallback():
+    expression = expressions.compile_expression("math.sqrt(x)")
+    assert expression(4.0) == 2.0
+    values = expressions.compile_expression("math.factorial(int(x))").evaluate_array(x=np.array([3.0, -1.0]))
+    assert values[0] == 6.0 and math.isnan(values[1])
+
+
+def test_free_names():
+    assert expressions.free_names("a * math.sin(x) + b") == ["a", "b"]
+    assert expressions.free_names("sinn(x) + abs(k)") == ["k"]
+    assert expressions.free_names("sum(t * x for t in range(n))") == ["n"]
+    assert expressions.free_names("(lambda u: u * c)(x)") == ["c"]
+
+
+def test_check_functions():
+    expressions.check_functions("abs(math.sin(x)) + max(x, 1)")
+    expressions.check_functions("(lambda f: f(x))(abs)")
+    with pytest.raises(ValueError, match="sinn"):
+        expressions.check_functions("sinn(x)")
+    with pytest.raises(ValueError, match="math.sine"):
+        expressions.check_functions("math.sine(x)")
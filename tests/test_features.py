@@ -0,0 +1,55 @@
+import math
+import numpy as np
+import features
+
+
+def test_brent_finds_a_bracketed_root():
+    root = features.brent(lambda x: x * x - 2.0, 0.0, 2.0)
+    assert abs(root - math.sqrt(2.0)) < 1e-10
+
+
+def test_brent_needs_a_sign_change():
+    assert features.brent(lambda x: x * x + 1.0, -1.0, 1.0) is None
+
+
+def test_sign_changes_skip_gaps_and_keep_exact_zeros():
+    values = np.array([1.0, -1.0, np.nan, 1.0, 0.0, 2.0])
+    assert features.sign_changes(values).tolist() == [0, 4]
+    assert features.sign_changes(values, exact_zeros=False).tolist() == [0]
+
+
+def test_roots_and_extrema_of_sine():
+    xs = np.linspace(0.5, 6.0, 200)
+    found = features.roots_and_extrema(xs, np.sin(xs), math.sin, 0.5, 6.0)
+    kinds = {kind: x for x, _, kind in found}
+    assert abs(kinds["root"] - math.pi) < 1e-9
+    assert abs(kinds["max"] - math.pi / 2) < 1e-4
+    assert abs(kinds["min"] - 3 * math.pi / 2) < 1e-4
+
+
+def test_intersections_of_two_lines():
+    xs = np.linspace(-2.0, 2.0, 50)
+    found = features.intersections((xs, xs), (xs, 1.0 - xs), lambda x: x, lambda x: 1.0 - x, -2.0, 2.0)
+    assert len(found) == 1
+    assert abs(found[0][0] - 0.5) < 1e-10
+
+
+def test_index_only_misses_unsearched_or_coarser_ranges():
+    index = features.FeatureIndex()
+    index.add(("a",), 0.0, 10.0, 0.1, [(1.0, 0.0, "root")])
+    assert index.missing(("a",), 2.0, 8.0, 0.1) == []
+    assert index.missing(("a",), 2.0, 8.0, 0.5) == []
+    assert index.missing(("a",), 5.0, 12.0, 0.1) == [(10.0, 12.0)]
+    assert index.missing(("a",), 2.0, 8.0, 0.01) == [(2.0, 8.0)]
+
+
+def test_index_deduplicates_and_forgets():
+    index = features.FeatureIndex()
+    index.add(("a",), 0.0, 5.0, 0.1, [(1.0, 0.0, "root")])
+    index.add(("a",), 0.0, 5.0, 0.01, [(1.0, 0.0, "root"), (2.0, 0.0, "root")])
+    index.add(("a", "b"), 0.0, 5.0, 0.1, [(3.0, 1.0, "intersection")])
+    assert [x for x, _, _ in index.query(("a",), 0.0, 5.0)] == [1.0, 2.0]
+
+    index.forget("a")
+    assert index.query(("a",), 0.0, 5.0) == []
+    assert index.query(("a", "b"), 0.0, 5.0) == []
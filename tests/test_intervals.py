@@ -0,0 +1,35 @@
+import numpy as np
+from intervals import IntervalIndex
+
+
+def test_overlapping_returns_original_positions_in_start_order():
+    index = IntervalIndex([5.0, 0.0, 2.0], [6.0, 1.0, 3.0])
+    assert index.overlapping(0.5, 2.5).tolist() == [1, 2]
+    assert index.overlapping(3.5, 4.5).tolist() == []
+    assert index.overlapping(-10.0, 10.0).tolist() == [1, 2, 0]
+
+
+def test_touching_ends_count_as_overlap():
+    index = IntervalIndex([0.0, 1.0], [1.0, 2.0])
+    assert index.overlapping(1.0, 1.0).tolist() == [0, 1]
+
+
+def test_long_intervals_reach_past_later_starts():
+    index = IntervalIndex([0.0, 1.0, 2.0], [10.0, 1.5, 2.5])
+    assert index.overlapping(5.0, 6.0).tolist() == [0]
+
+
+def test_empty_index():
+    index = IntervalIndex([], [])
+    assert len(index) == 0
+    assert index.overlapping(0.0, 1.0).size == 0
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(1)
+    starts = rng.uniform(0, 100, 200)
+    ends = starts + rng.uniform(0, 5, 200)
+    index = IntervalIndex(starts, ends)
+    for low in np.linspace(-5, 105, 23):
+        expected = {i for i in range(200) if starts[i] <= low + 3 and ends[i] >= low}
+        assert set(index.overlapping(low, low + 3).tolist()) == expected
@@ -0,0 +1,72 @@
+import os
+import threading
+import numpy as np
+import samplecache
+
+
+def samples(n, offset=0.0):
+    xs = np.linspace(0.0, 1.0, n)
+    return xs, np.sin(xs) + offset
+
+
+def test_round_trip(tmp_path):
+    cache = samplecache.SampleCache(str(tmp_path))
+    name = samplecache.address({"expression": "sin(x)"}, (0.0, 1.0, 100, "linear"))
+    cache.put(name, samples(100))
+    cache.flush()
+    assert os.path.exists(cache.path(name))
+
+    # A new cache finds the entry through the directory
+    xs, ys = samplecache.SampleCache(str(tmp_path)).get(name)
+    np.testing.assert_array_equal(xs, samples(100)[0])
+    np.testing.assert_array_equal(ys, samples(100)[1])
+    assert cache.get("missing") is None
+
+
+def test_addresses_depend_on_identity_and_grid():
+    grid = (0.0, 1.0, 100, "linear")
+    assert samplecache.address({"a": 1}, grid) == samplecache.address({"a": 1}, grid)
+    assert samplecache.address({"a": 1}, grid) != samplecache.address({"a": 2}, grid)
+    assert samplecache.address({"a": 1}, grid) != samplecache.address({"a": 1}, (0.0, 1.0, 101, "linear"))
+
+
+def test_queued_writes_are_served_before_they_reach_disk(tmp_path):
+    cache = samplecache.SampleCache(str(tmp_path))
+    first, second = samples(10), samples(10, 1.0)
+    cache.writer = object()  # No writer thread yet, so writes stay queued
+    cache.put("a", first)
+    cache.put("a", second)
+    assert cache.get("a") is second
+    assert not os.path.exists(cache.path("a"))
+
+    # Writing the older value does not drop the newer one, which ends up on disk
+    cache.writer = threading.Thread(target=cache.write_queued, daemon=True)
+    cache.writer.start()
+    cache.flush()
+    assert cache.pending == {}
+    np.testing.assert_array_equal(cache.get("a")[1], second[1])
+
+
+def test_eviction_drops_least_recently_used_entries_down_to_the_cap(tmp_path):
+    cache = samplecache.SampleCache(str(tmp_path))
+    for i, name in enumerate("abcd"):
+        cache.write(name, samples(2000, i))
+        os.utime(cache.path(name), (1000 + i, 1000 + i))
+    size = os.path.getsize(cache.path("a"))
+
+    # Reading b makes it the most recently used entry
+    reopened = samplecache.SampleCache(str(tmp_path), max_bytes=int(size * 3.5))
+    assert reopened.get("b") is not None
+    reopened.write("e", samples(2000, 4))
+    assert sorted(reopened.entries) == ["b", "d", "e"]
+    assert sorted(name[:-4] for name in os.listdir(tmp_path)) == ["b", "d", "e"]
+    assert reopened.total_bytes <= reopened.max_bytes
+
+
+def test_unreadable_entries_are_misses(tmp_path):
+    cache = samplecache.SampleCache(str(tmp_path))
+    cache.write("a", samples(10))
+    with open(cache.path("a"), "wb") as f:
+        f.write(b"not an npz file")
+    assert cache.get("a") is None
+    assert not os.path.exists(cache.path("a"))
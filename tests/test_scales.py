@@ -0,0 +1,88 @@
+import datetime
+import numpy as np
+import scales
+import ticks
+
+
+def test_linear_ticks_and_labels():
+    scale = scales.get_scale("linear")
+    major, minor = scale.ticks(-1.0, 1.0, 0.5)
+    assert major == [-1.0, -0.5, 0.0, 0.5, 1.0]
+    assert minor == []
+    assert scale.label(0.5, 0.5) == "0.5"
+
+
+def test_log_ticks_on_decades():
+    scale = scales.get_scale("log")
+    major, minor = scale.ticks(0.1, 1000.0, 1.0)
+    assert major == [0.1, 1.0, 10.0, 100.0, 1000.0]
+    assert 2.0 in minor and 500.0 in minor
+
+
+def test_log_ticks_empty_for_ranges_it_cannot_show():
+    assert scales.get_scale("log").ticks(-10.0, 10.0, 1.0) == ([], [])
+
+
+def test_log_forward_hides_non_positive_values():
+    values = scales.get_scale("log").forward([-1.0, 0.0, 100.0])
+    assert np.isnan(values[0]) and np.isnan(values[1])
+    assert values[2] == 2.0
+
+
+def test_symlog_round_trips():
+    scale = scales.get_scale("symlog")
+    values = np.array([-100.0, -0.5, 0.0, 0.5, 100.0])
+    np.testing.assert_allclose(scale.inverse(scale.forward(values)), values)
+
+
+def test_grid_is_even_on_screen():
+    xs = scales.get_scale("log").grid(1.0, 1000.0, 4)
+    np.testing.assert_allclose(xs, [1.0, 10.0, 100.0, 1000.0])
+
+
+def test_nice_step_and_bounds():
+    assert ticks.nice_step(10.0) == 2.0
+    assert ticks.nice_step(0.0) == 1.0
+    assert ticks.nice_bounds(0.3, 9.1, 2.0) == (0.0, 10.0)
+    assert ticks.tick_decimals(0.05) == 2
+
+
+def utc(*fields):
+    return datetime.datetime(*fields, tzinfo=datetime.timezone.utc).timestamp()
+
+
+def test_month_ticks_cross_the_year_boundary():
+    values = ticks.time_ticks(utc(2023, 10, 15), utc(2024, 3, 10), ("month", 1, 0))
+    labels = [ticks.time_label(value, ("month", 1, 0)) for value in values]
+    assert labels == ["Nov 2023", "Dec 2023", "Jan 2024", "Feb 2024", "Mar 2024"]
+
+
+def test_multi_month_and_year_ticks_align_to_calendar_multiples():
+    assert ticks.time_ticks(utc(2023, 2, 1), utc(2024, 1, 1), ("month", 3, 0)) == \
+        [utc(2023, 4, 1), utc(2023, 7, 1), utc(2023, 10, 1), utc(2024, 1, 1)]
+    assert ticks.time_ticks(utc(1999, 6, 1), utc(2021, 1, 1), ("year", 10, 0)) == [utc(2000, 1, 1), utc(2010, 1, 1),
+                                                                                  utc(2020, 1, 1)]
+
+
+def test_week_ticks_fall_on_mondays():
+    values = ticks.time_ticks(utc(2024, 2, 20), utc(2024, 3, 20), ticks.step_for_spacing(7 * 86400))
+    moments = [datetime.datetime.fromtimestamp(value, datetime.timezone.utc) for value in values]
+    assert [moment.day for moment in moments] == [26, 4, 11, 18]
+    assert all(moment.weekday() == 0 and moment.hour == 0 for moment in moments)
+
+
+def test_time_step_and_millisecond_labels():
+    assert ticks.time_step(3600.0)[:2] == ("minute", 10)
+    assert ticks.time_step(0.05)[:2] == ("millisecond", 10)
+    assert ticks.time_label(utc(2024, 1, 1, 12, 30, 5, 250000), ("millisecond", 1, 0.001)) == "12:30:05.250"
+
+
+def test_time_scale_caches_labels_per_step():
+    scale = scales.TimeScale()
+    spacing = ticks.time_step(86400.0)[2]
+    major, minor = scale.ticks(utc(2024, 1, 1), utc(2024, 1, 2), spacing)
+    assert major[0] == utc(2024, 1, 1) and minor == []
+    assert scale.label(major[1], spacing) == "Jan 01 03:00"
+    assert (spacing, major[1]) in scale.labels
+    scale.labels[(spacing, major[1])] = "cached"
+    assert scale.label(major[1], spacing) == "cached"
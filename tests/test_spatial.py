@@ -0,0 +1,70 @@
+import numpy as np
+import spatial
+
+
+def layer(grid, key, xs, ys, visible=None):
+    xs, ys = np.asarray(xs, float), np.asarray(ys, float)
+    grid.set_layer(key, xs, ys, np.ones(len(xs), bool) if visible is None else np.asarray(visible))
+
+
+def test_nearest_picks_the_closer_end_of_the_closest_segment():
+    grid = spatial.SegmentGrid()
+    layer(grid, "a", [0, 100, 200], [50, 50, 50])
+    layer(grid, "b", [0, 200], [60, 60])
+    key, index, distance = grid.nearest(130, 52)
+    assert (key, index, distance) == ("a", 1, 2.0)
+    assert grid.nearest(180, 58)[:2] == ("b", 1)
+
+
+def test_nearest_misses_outside_the_radius():
+    grid = spatial.SegmentGrid()
+    layer(grid, "a", [0, 100], [0, 0])
+    assert grid.nearest(50, 10) is None
+    assert grid.nearest(50, 10, radius=12)[0] == "a"
+
+
+def test_gaps_are_not_indexed():
+    grid = spatial.SegmentGrid()
+    layer(grid, "a", [0, 50, 100, 150], [0, 0, 0, 0], [True, True, False, True])
+    assert grid.nearest(75, 0) is None
+    assert grid.nearest(25, 0)[0] == "a"
+
+
+def test_setting_a_layer_replaces_its_segments():
+    grid = spatial.SegmentGrid()
+    layer(grid, "a", [0, 100], [0, 0])
+    layer(grid, "a", [0, 100], [200, 200])
+    assert grid.nearest(50, 0) is None
+    assert grid.nearest(50, 200)[0] == "a"
+
+
+def test_retain_and_clear():
+    grid = spatial.SegmentGrid()
+    layer(grid, "a", [0, 100], [0, 0])
+    layer(grid, "b", [0, 100], [30, 30])
+    grid.retain({"b"})
+    assert grid.nearest(50, 0) is None
+    assert grid.nearest(50, 30)[0] == "b"
+    grid.clear()
+    assert grid.nearest(50, 30) is None
+    assert grid.cells == {}
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(3)
+    xs, ys = rng.uniform(0, 300, 40), rng.uniform(0, 300, 40)
+    grid = spatial.SegmentGrid()
+    layer(grid, "a", xs, ys)
+    for px, py in rng.uniform(0, 300, (50, 2)):
+        best = None
+        for i in range(len(xs) - 1):
+            dx, dy = xs[i + 1] - xs[i], ys[i + 1] - ys[i]
+            t = min(max(((px - xs[i]) * dx + (py - ys[i]) * dy) / (dx * dx + dy * dy), 0.0), 1.0)
+            d = np.hypot(xs[i] + t * dx - px, ys[i] + t * dy - py)
+            if best is None or d < best:
+                best = d
+        found = grid.nearest(px, py, radius=20)
+        if best <= 20:
+            assert abs(found[2] - best) < 1e-9
+        else:
+            assert found is None
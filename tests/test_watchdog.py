@@ -0,0 +1,76 @@
+import math
+import os
+import numpy as np
+import pytest
+import expressions
+import features
+import watchdog
+
+
+@pytest.fixture
+def dog():
+    dog = watchdog.Watchdog(budget=0.3)
+    yield dog
+    dog.kill()
+
+
+def test_small_results_come_back_through_the_pipe(dog):
+    xs = np.linspace(0.0, 1.0, 11)
+    np.testing.assert_allclose(dog.evaluate(expressions.compile_expression("x * 2"), x=xs), xs * 2)
+
+
+def test_large_arrays_go_through_shared_memory(dog, monkeypatch):
+    created = []
+    original = watchdog.shared_memory.SharedMemory
+
+    def counting(*args, **kwargs):
+        block = original(*args, **kwargs)
+        if kwargs.get("create"):
+            created.append(block.name)
+        return block
+
+    monkeypatch.setattr(watchdog.shared_memory, "SharedMemory", counting)
+    xs = np.linspace(0.0, 10.0, watchdog.SHARED_BYTES)
+    result = dog.evaluate(expressions.compile_expression("math.sin(x) + a", ("x", "a")), x=xs, a=np.float64(1.0))
+    np.testing.assert_allclose(result, np.sin(xs) + 1.0)
+    # One block for x and one for the result, both freed again
+    assert len(created) == 2
+    if os.path.isdir("/dev/shm"):
+        assert not any(name.lstrip("/") in os.listdir("/dev/shm") for name in created)
+
+
+def test_a_timeout_kills_the_worker_and_the_next_request_restarts_it(dog):
+    dog.evaluate(expressions.compile_expression("x + 1"), x=np.zeros(3))
+    first = dog.process
+    with pytest.raises(watchdog.EvaluationTimeout):
+        dog.evaluate(expressions.compile_expression("x + sum(range(10 ** 10))"), x=np.zeros(3))
+    assert dog.process is None and not first.is_alive()
+
+    np.testing.assert_array_equal(dog.evaluate(expressions.compile_expression("x + 1"), x=np.zeros(3)), [1, 1, 1])
+    assert dog.process is not first and dog.process.is_alive()
+
+
+def test_errors_are_raised_in_the_caller(dog):
+    with pytest.raises(NameError):
+        dog.evaluate(expressions.compile_expression("x + undefined"), x=np.zeros(3))
+    assert dog.process.is_alive()
+
+
+def test_call_runs_scalar_functions_in_the_worker(dog):
+    func = watchdog.ScalarFunction(expressions.compile_expression("x * x - a", ("x", "a")), [2.0])
+    xs = np.linspace(0.0, 3.0, 31)
+    found = dog.call(features.roots_and_extrema, xs, xs * xs - 2.0, func, 0.0, 3.0)
+    assert dog.process is not None
+    assert [kind for _, _, kind in found] == ["root"]
+    assert abs(found[0][0] - math.sqrt(2.0)) < 1e-10
+
+
+def test_call_runs_plain_functions_here(dog):
+    assert dog.call(features.brent, lambda x: x - 0.5, 0.0, 1.0) == 0.5
+    assert dog.process is None
+
+
+def test_scalar_functions_turn_errors_into_gaps():
+    func = watchdog.ScalarFunction(expressions.compile_expression("math.exp(x ** 2) + 1 / x"))
+    assert math.isnan(func(0.0)) and math.isnan(func(100.0))
+    assert func(1.0) == math.e + 1
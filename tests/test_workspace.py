@@ -0,0 +1,172 @@
+import types
+import numpy as np
+import pytest
+import plot_tk_v2
+import workspace
+
+
+def make_plotter(curves, **settings):
+    defaults = dict(title="Plot", x_range=(0.0, 1.0), y_range=(-1.0, 1.0), grid_spacing=0.5, autoscale=False,
+                    autoscale_percentile=None, x_scale_type="linear", y_scale_type="linear", link=None, minimap=None)
+    defaults.update(settings)
+    return types.SimpleNamespace(curves=curves, **defaults)
+
+
+def make_curve(kind="function", samples=None, sample_key=None, state=True):
+    entry = {"kind": kind, "expression": "x", "name": "f", "color": "red"}
+    return types.SimpleNamespace(key="k1", kind=kind, samples=samples, sample_key=sample_key,
+                                 state=lambda: dict(entry) if state else None)
+
+
+def test_round_trip_keeps_settings_and_samples(tmp_path):
+    xs = np.linspace(0.0, 1.0, 5)
+    curve = make_curve(samples=(xs, xs ** 2), sample_key=(0.0, 1.0, 5, "linear"))
+    path = tmp_path / "plots.tkplot"
+    assert workspace.save_workspace(path, [make_plotter([curve], title="Squares", autoscale=True)]) == 0
+
+    (state,) = workspace.load_workspace(path)
+    assert state["title"] == "Squares"
+    assert state["autoscale"] is True
+    assert state["link"] is None
+    (entry,) = state["curves"]
+    assert entry["key"] == "k1"
+    grid, (loaded_xs, loaded_ys) = entry["samples"]
+    assert grid == (0.0, 1.0, 5, "linear")
+    np.testing.assert_allclose(loaded_xs, xs)
+    np.testing.assert_allclose(loaded_ys, xs ** 2)
+
+
+def test_other_kinds_store_their_xs(tmp_path):
+    xs, ys = np.array([3.0, 1.0, 2.0]), np.array([0.0, np.nan, 1.0])
+    curve = make_curve(kind="parametric", samples=(xs, ys), sample_key=(1, 2, 3))
+    path = tmp_path / "plots.tkplot"
+    workspace.save_workspace(path, [make_plotter([curve])])
+
+    _, (loaded_xs, loaded_ys) = workspace.load_workspace(path)[0]["curves"][0]["samples"]
+    np.testing.assert_array_equal(loaded_xs, xs)
+    np.testing.assert_array_equal(loaded_ys, ys)
+
+
+def test_plain_functions_are_skipped(tmp_path):
+    path = tmp_path / "plots.tkplot"
+    assert workspace.save_workspace(path, [make_plotter([make_curve(state=False)])]) == 1
+    assert workspace.load_workspace(path)[0]["curves"] == []
+
+
+def test_damaged_files_raise_value_error(tmp_path):
+    xs = np.linspace(0.0, 1.0, 50)
+    path = tmp_path / "plots.tkplot"
+    workspace.save_workspace(path, [make_plotter([make_curve(samples=(xs, xs), sample_key=(0.0, 1.0, 50, "linear"))])])
+    data = path.read_bytes()
+
+    for damaged in (data[:12], data[:-5], b"something else"):
+        path.write_bytes(damaged)
+        with pytest.raises(ValueError):
+            workspace.load_workspace(path)
+
+
+def test_samples_that_do_not_fit_their_grid_are_dropped(tmp_path):
+    xs = np.linspace(0.0, 1.0, 5)
+    curve = make_curve(samples=(xs, xs), sample_key=(0.0, 1.0, 7, "linear"))
+    path = tmp_path / "plots.tkplot"
+    workspace.save_workspace(path, [make_plotter([curve])])
+    assert "samples" not in workspace.load_workspace(path)[0]["curves"][0]
+
+
+def test_newer_versions_are_refused(tmp_path, monkeypatch):
+    path = tmp_path / "plots.tkplot"
+    monkeypatch.setattr(workspace, "VERSION", workspace.VERSION + 1)
+    workspace.save_workspace(path, [make_plotter([])])
+    monkeypatch.setattr(workspace, "VERSION", workspace.VERSION - 1)
+    with pytest.raises(ValueError):
+        workspace.load_workspace(path)
+
+
+class FakePlotter:
+    """Stands in for a FunctionPlotter widget while a workspace is being opened"""
+
+    created = []
+
+    def __init__(self, master, app=None, title="", x_range=(-10, 10), y_range=(-10, 10)):
+        self.title, self.x_range, self.y_range = title, x_range, y_range
+        self.id = len(FakePlotter.created)
+        self.link = None
+        self.curves = []
+        self.destroyed = False
+        self.packed = False
+        FakePlotter.created.append(self)
+
+    def set_show_minimap(self, enabled):
+        if enabled not in (True, False):
+            raise TypeError("minimap must be true or false")
+
+    def pack(self, **kwargs):
+        self.packed = True
+
+    def destroy(self):
+        self.destroyed = True
+
+    def update_plot(self):
+        pass
+
+    def notify(self, event):
+        pass
+
+
+class FakeApp:
+    add_plotter_from_state = plot_tk_v2.MultiPlotterApp.add_plotter_from_state
+    build_pending_plotters = plot_tk_v2.MultiPlotterApp.build_pending_plotters
+    link_plotter = plot_tk_v2.MultiPlotterApp.link_plotter
+    max_reported_errors = plot_tk_v2.MultiPlotterApp.max_reported_errors
+
+    def __init__(self, states):
+        self.plot_frame = None
+        self.link_groups = {}
+        self.registered = []
+        self.registry = types.SimpleNamespace(add=self.registered.append)
+        self.selected_plotter = None
+        self.pending_states = list(reversed(states))
+        self.workspace_errors = []
+
+    def select_plotter(self, plotter):
+        self.selected_plotter = plotter
+
+    def after(self, delay, callback):
+        callback()
+
+
+def plot_state(title, curves, **settings):
+    state = {"title": title, "x_range": [0, 1], "y_range": [0, 1], "grid_spacing": 1.0, "curves": curves}
+    state.update(settings)
+    return state
+
+
+def function_entry(expression, key="k1"):
+    return {"kind": "function", "expression": expression, "name": "f", "color": "red", "start_time": None,
+            "end_time": None, "start_value": None, "end_value": None, "key": key}
+
+
+def test_failing_plots_leave_nothing_behind_and_are_reported_once(monkeypatch):
+    monkeypatch.setattr(plot_tk_v2, "FunctionPlotter", FakePlotter)
+    FakePlotter.created = []
+    reports = []
+    monkeypatch.setattr(plot_tk_v2.tk.messagebox, "showerror", lambda title, message: reports.append(message))
+    states = [plot_state("good", [function_entry("x * 2")]),
+              plot_state("bad expression", [function_entry("x +")]),
+              plot_state("missing parent", [{"kind": "integral", "parent": "gone", "name": "F", "color": "red"}]),
+              plot_state("bad scale", [function_entry("x")], x_scale="cubic"),
+              plot_state("bad minimap", [function_entry("x")], link="a", minimap="yes")]
+    app = FakeApp(states)
+    app.build_pending_plotters()
+    registered = app.registered
+
+    assert [plotter.title for plotter in registered] == ["good"]
+    assert registered[0].packed and len(registered[0].curves) == 1
+    assert app.selected_plotter is registered[0]
+    # Plotters that got as far as being created were torn down again and left their link group
+    assert [plotter.title for plotter in FakePlotter.created if plotter.destroyed] == ["bad scale", "bad minimap"]
+    assert not any(plotter.packed for plotter in FakePlotter.created if plotter.destroyed)
+    assert not app.link_groups["a"].members
+    assert len(reports) == 1
+    assert "Skipped 4 plot(s)" in reports[0]
+    assert "bad expression: SyntaxError" in reports[0] and "missing parent: KeyError" in reports[0]
@@ -0,0 +1,95 @@
+import datetime
+import math
+
+
+def nice_step(span, target_ticks=8):
+    """Round span / target_ticks to the nearest 1, 2 or 5 times a power of ten"""
+    if span <= 0 or not math.isfinite(span):
+        return 1.0
+    raw = span / target_ticks
+    power = 10 ** math.floor(math.log10(raw))
+    for multiple in (1, 2, 5, 10):
+        if raw <= multiple * power:
+            return multiple * power
+    return 10 * power
+
+
+def nice_bounds(low, high, step):
+    """Widen (low, high) outwards to whole multiples of step"""
+    return math.floor(low / step) * step, math.ceil(high / step) * step
+
+
+def tick_decimals(step):
+    """Number of decimals needed to tell ticks step apart, at least one"""
+    return max(1, -math.floor(math.log10(step))) if step > 0 else 1
+
+
+# Calendar tick steps from milliseconds to centuries as (unit, count, nominal length in seconds)
+_UNIT_SECONDS = {"millisecond": 0.001, "second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 7 * 86400,
+                 "month": 30.436875 * 86400, "year": 365.2425 * 86400}
+_UNIT_COUNTS = {"millisecond": (1, 2, 5, 10, 20, 50, 100, 200, 500), "second": (1, 2, 5, 10, 15, 30),
+                "minute": (1, 2, 5, 10, 15, 30), "hour": (1, 2, 3, 6, 12), "day": (1, 2), "week": (1,),
+                "month": (1, 2, 3, 6), "year": (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)}
+TIME_STEPS = [(unit, count, count * seconds) for unit, seconds in _UNIT_SECONDS.items() for count in _UNIT_COUNTS[unit]]
+
+_MONDAY = 4 * 86400  # The epoch fell on a Thursday
+
+
+def time_step(span, target_ticks=8):
+    """Smallest calendar step giving at most about target_ticks ticks over span seconds"""
+    raw = span / target_ticks
+    for step in TIME_STEPS:
+        if step[2] >= raw:
+            return step
+    return TIME_STEPS[-1]
+
+
+def step_for_spacing(spacing):
+    """The calendar step whose nominal length is spacing"""
+    return min(TIME_STEPS, key=lambda step: abs(step[2] - spacing))
+
+
+def time_ticks(low, high, step):
+    """Epoch seconds of the calendar step boundaries between low and high, in UTC"""
+    unit, count, seconds = step
+    if unit not in ("month", "year"):
+        offset = _MONDAY if unit == "week" else 0.0
+        first = math.ceil((low - offset) / seconds - 1e-9)
+        last = math.floor((high - offset) / seconds + 1e-9)
+        return [offset + seconds * i for i in range(first, last + 1)]
+
+    try:
+        start = datetime.datetime.fromtimestamp(low, datetime.timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return []
+    months = count * (12 if unit == "year" else 1)
+    index = start.year * 12 + start.month - 1
+    index -= index % months
+    values = []
+    while True:
+        year, month = divmod(index, 12)
+        if not 1 <= year <= 9999:
+            break
+        value = datetime.datetime(year, month + 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+        if value > high:
+            break
+        if value >= low:
+            values.append(value)
+        index += months
+    return values
+
+
+_TIME_FORMATS = {"millisecond": "%H:%M:%S", "second": "%H:%M:%S", "minute": "%H:%M", "hour": "%b %d %H:%M",
+                 "day": "%b %d", "week": "%b %d", "month": "%b %Y", "year": "%Y"}
+
+
+def time_label(value, step):
+    """Label for a calendar tick, as precise as the step needs"""
+    try:
+        moment = datetime.datetime.fromtimestamp(value, datetime.timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return f"{value:g}"
+    label = moment.strftime(_TIME_FORMATS[step[0]])
+    if step[0] == "millisecond":
+        label += f".{moment.microsecond // 1000:03d}"
+    return label
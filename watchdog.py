@@ -0,0 +1,180 @@
+import math
+import multiprocessing
+import sys
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import expressions
+
+SHARED_BYTES = 64 * 1024  # Arrays at least this big cross over in shared memory instead of the pipe
+
+
+class EvaluationTimeout(Exception):
+    """An evaluation ran over its time budget and its worker was killed"""
+
+
+def _read_shared(array):
+    """An input array, copied out of its shared memory block if it was passed as (name, shape, dtype)"""
+    if not isinstance(array, tuple):
+        return array
+    name, shape, dtype = array
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype, buffer=block.buf).copy()
+    finally:
+        block.close()
+
+
+_compiled = {}  # (text, variables) -> Expression, in the worker
+
+
+def _compile(text, variables):
+    if (text, variables) not in _compiled:
+        _compiled[text, variables] = expressions.compile_expression(text, variables)
+    return _compiled[text, variables]
+
+
+class ScalarFunction:
+    """A compiled expression with fixed parameter values, called on one x at a time and sent to the worker as text"""
+
+    def __init__(self, func, parameters=()):
+        self.func = func
+        self.parameters = tuple(parameters)
+
+    def __call__(self, x):
+        try:
+            return float(self.func(x, *self.parameters))
+        except (ValueError, ZeroDivisionError, OverflowError):
+            # Discontinuities become gaps, as in Expression.evaluate_loop
+            return math.nan
+
+    def __getstate__(self):
+        return self.func.text, self.func.variables, self.parameters
+
+    def __setstate__(self, state):
+        text, variables, self.parameters = state
+        self.func = _compile(text, variables)
+
+
+def _serve(connection):
+    """Worker loop: answer evaluate and call requests until the pipe closes"""
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        try:
+            if request[0] == "call":
+                _, function, args = request
+                connection.send((True, function(*args)))
+                continue
+            _, text, variables, arrays, output = request
+            result = _compile(text, variables).evaluate_array(**{name: _read_shared(array)
+                                                                 for name, array in arrays.items()})
+            if output is None:
+                connection.send((True, result))
+                continue
+            # Large results are written straight into the block the caller set aside
+            block = shared_memory.SharedMemory(name=output)
+            np.copyto(np.ndarray(result.shape, float, buffer=block.buf), result)
+            block.close()
+            connection.send((True, None))
+        except Exception as e:
+            try:
+                connection.send((False, e))
+            except Exception:
+                # The exception itself could not be pickled
+                connection.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class Watchdog:
+    """Evaluates expressions in a worker process that is killed and restarted when it runs over budget"""
+
+    def __init__(self, budget=1.0):
+        self.budget = budget
+        self.process = None
+        self.connection = None
+
+        # Forking is much quicker to start, but only safe on Linux once Tk is running
+        self.context = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else "spawn")
+
+    def start(self):
+        # The worker must share our tracker, so blocks it attaches to are not reported as leaked
+        if sys.platform != "win32":
+            resource_tracker.ensure_running()
+        self.connection, child = self.context.Pipe()
+        self.process = self.context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        if self.process is None:
+            return
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+        self.process = None
+        self.connection = None
+
+    def evaluate(self, func, **arrays):
+        """Return func.evaluate_array(**arrays), or raise EvaluationTimeout after the budget"""
+        if not isinstance(func, expressions.Expression):
+            return func.evaluate_array(**arrays)
+
+        # Large inputs and the result go through shared memory blocks that only this side creates and frees
+        blocks = []
+        try:
+            sent = {}
+            for name, array in arrays.items():
+                array = np.asarray(array)
+                if array.nbytes < SHARED_BYTES:
+                    sent[name] = array
+                    continue
+                block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+                blocks.append(block)
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+                sent[name] = (block.name, array.shape, array.dtype.str)
+            shape = np.broadcast_shapes(*(np.shape(array) for array in arrays.values()))
+            output = None
+            if math.prod(shape) * 8 >= SHARED_BYTES:
+                output = shared_memory.SharedMemory(create=True, size=math.prod(shape) * 8)
+                blocks.append(output)
+
+            result = self.request(("evaluate", func.text, func.variables, sent, output and output.name), func.text)
+            if result is None:
+                result = np.ndarray(shape, float, buffer=output.buf).copy()
+            return result
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def call(self, function, *args):
+        """Return function(*args), in the worker under the budget if every callable argument is a ScalarFunction"""
+        functions = [arg for arg in args if callable(arg)]
+        if not functions or not all(isinstance(arg, ScalarFunction) for arg in functions):
+            return function(*args)
+        return self.request(("call", function, args), ", ".join(arg.func.text for arg in functions))
+
+    def request(self, message, text):
+        """Send one request to the worker and return its result, killing the worker if it runs over budget"""
+        if self.process is None or not self.process.is_alive():
+            self.start()
+        self.connection.send(message)
+        if not self.connection.poll(self.budget):
+            self.kill()
+            raise EvaluationTimeout(f"'{text}' took longer than {self.budget:g} s")
+        ok, result = self.connection.recv()
+        if not ok:
+            raise result
+        return result
+
+
+_shared = None
+
+
+def shared():
+    """The watchdog shared by all plotters, created on first use"""
+    global _shared
+    if _shared is None:
+        _shared = Watchdog()
+    return _shared
@@ -0,0 +1,113 @@
+import json
+import struct
+import zlib
+import numpy as np
+import scales
+
+# A workspace file is the magic line, the byte length of a JSON header, the header
+# itself and then an optional binary section of zlib-compressed float64 sample
+# arrays. Curves in the header point into that section by offset and size.
+MAGIC = b"TKPLOTWS1\n"
+
+# Bumped with every change to what the header holds: 2 added autoscale and axis scales,
+# 3 curve kinds with stored xs, 4 curve keys and parameters, 5 link groups and the minimap.
+# Older files still load, with defaults for what they lack.
+VERSION = 5
+
+
+def _append_array(blobs, values):
+    """Compress a float array onto the binary section and return its (offset, size)"""
+    data = zlib.compress(np.asarray(values, dtype="<f8").tobytes(), 1)
+    offset = len(blobs)
+    blobs += data
+    return [offset, len(data)]
+
+
+def _read_array(blobs, location):
+    offset, size = location
+    return np.frombuffer(zlib.decompress(blobs[offset:offset + size]), dtype="<f8").astype(float)
+
+
+def save_workspace(path, plotters, include_samples=True):
+    """Write plotters to a workspace file and return how many curves could not be stored"""
+    blobs = bytearray()
+    skipped = 0
+    header = {"version": VERSION, "plotters": []}
+
+    for plotter in plotters:
+        curves = []
+        for curve in plotter.curves:
+            entry = curve.state()
+            if entry is None:
+                skipped += 1
+                continue
+            entry["key"] = curve.key  # Lets derived curves find their parent again
+
+            # For plain functions only ys are stored, as xs follow from the
+            # (x_start, x_end, num_points, x scale, ...) grid key; other kinds store both
+            if include_samples and curve.samples is not None:
+                xs, ys = curve.samples
+                entry["samples"] = {"grid": list(curve.sample_key), "ys": _append_array(blobs, ys)}
+                if curve.kind != "function":
+                    entry["samples"]["xs"] = _append_array(blobs, xs)
+            curves.append(entry)
+
+        header["plotters"].append({
+            "title": plotter.title,
+            "x_range": list(plotter.x_range),
+            "y_range": list(plotter.y_range),
+            "grid_spacing": plotter.grid_spacing,
+            "autoscale": plotter.autoscale,
+            "autoscale_percentile": plotter.autoscale_percentile,
+            "x_scale": plotter.x_scale_type,
+            "y_scale": plotter.y_scale_type,
+            "link": plotter.link.name if plotter.link is not None else None,
+            "link_y": plotter.link is not None and plotter.link.link_y,
+            "minimap": plotter.minimap is not None,
+            "curves": curves,
+        })
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(blobs)
+    return skipped
+
+
+def load_workspace(path):
+    """Read a workspace file into a list of plotter dicts"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a plot workspace file")
+    try:
+        start = len(MAGIC) + 8
+        (header_length,) = struct.unpack("<Q", data[len(MAGIC):start])
+        header = json.loads(data[start:start + header_length].decode("utf-8"))
+        if header.get("version", 1) > VERSION:
+            raise ValueError(f"Workspace version {header['version']} is newer than this program supports")
+        blobs = memoryview(data)[start + header_length:]
+
+        for plotter in header["plotters"]:
+            for entry in plotter["curves"]:
+                stored = entry.pop("samples", None)
+                if stored is None:
+                    continue
+                grid = tuple(stored["grid"])
+                ys = _read_array(blobs, stored["ys"])
+                if "xs" in stored:
+                    xs = _read_array(blobs, stored["xs"])
+                else:
+                    x_start, x_end, num_points, scale_type = grid[:4]
+                    if len(ys) != num_points:
+                        continue  # Damaged samples are dropped; the curve is evaluated again
+                    xs = scales.get_scale(scale_type).grid(x_start, x_end, num_points)
+                if len(xs) != len(ys):
+                    continue
+                entry["samples"] = (grid, (xs, ys))
+    except (struct.error, zlib.error, UnicodeDecodeError, TypeError, AttributeError) as e:
+        raise ValueError(f"Damaged workspace file: {e}") from e
+    return header["plotters"]